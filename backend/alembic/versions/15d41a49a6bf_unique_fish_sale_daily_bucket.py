@@ -0,0 +1,60 @@
+"""unique_fish_sale_daily_bucket
+
+Revision ID: 15d41a49a6bf
+Revises: b1d7e0c43a92
+Create Date: 2026-10-17 09:41:52.307165
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '15d41a49a6bf'
+down_revision: Union[str, Sequence[str], None] = 'b1d7e0c43a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# pond_id and fish_id are optional; NULLs never collide in a unique index, so they are folded to 0
+BUCKET_COLUMNS = ['user_id', 'day', sa.text('coalesce(pond_id, 0)'), sa.text('coalesce(fish_id, 0)'), 'unit_id']
+
+
+def local_day(column: str) -> str:
+    """SQL for the Asia/Dhaka calendar day of a naive UTC timestamp"""
+    if op.get_bind().dialect.name == 'postgresql':
+        return f"CAST(({column} AT TIME ZONE 'UTC') AT TIME ZONE 'Asia/Dhaka' AS DATE)"
+    # Dhaka has kept UTC+6 without daylight saving since 2009
+    return f"date({column}, '+6 hours')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'fishsaledaily' not in tables:
+        return
+
+    # Concurrent sale creates could insert the same bucket twice; rebuild the
+    # rollup from sale items so every bucket is one correct row
+    day = local_day('fishsale.date')
+    op.execute('DELETE FROM fishsaledaily')
+    op.execute(f"""
+        INSERT INTO fishsaledaily (user_id, day, pond_id, fish_id, unit_id, quantity, amount, sale_count, item_count)
+        SELECT fishsale.user_id, {day}, fishsaleitem.pond_id, fishsaleitem.fish_id, fishsaleitem.unit_id,
+               COALESCE(SUM(fishsaleitem.quantity), 0), COALESCE(SUM(fishsaleitem.amount), 0),
+               COUNT(DISTINCT fishsale.id), COUNT(fishsaleitem.id)
+        FROM fishsale
+        JOIN fishsaleitem ON fishsaleitem.sale_id = fishsale.id
+        GROUP BY fishsale.user_id, {day}, fishsaleitem.pond_id, fishsaleitem.fish_id, fishsaleitem.unit_id
+    """)
+    op.create_index('ux_fishsaledaily_bucket', 'fishsaledaily', BUCKET_COLUMNS, unique=True)
+    # Its (user_id, day) prefix covers the per-user day range index
+    op.drop_index('ix_fishsaledaily_user_id_day', table_name='fishsaledaily', if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_fishsaledaily_user_id_day', 'fishsaledaily', ['user_id', 'day'], if_not_exists=True)
+    op.drop_index('ux_fishsaledaily_bucket', table_name='fishsaledaily', if_exists=True)
@@ -0,0 +1,73 @@
+"""add_fish_sale_daily_rollup
+
+Revision ID: 4eb4140e89a8
+Revises: ffd3d2dcc6fe
+Create Date: 2026-10-16 10:12:41.218304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4eb4140e89a8'
+down_revision: Union[str, Sequence[str], None] = 'ffd3d2dcc6fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def local_day(column: str) -> str:
+    """SQL for the Asia/Dhaka calendar day of a naive UTC timestamp"""
+    if op.get_bind().dialect.name == 'postgresql':
+        return f"CAST(({column} AT TIME ZONE 'UTC') AT TIME ZONE 'Asia/Dhaka' AS DATE)"
+    # Dhaka has kept UTC+6 without daylight saving since 2009
+    return f"date({column}, '+6 hours')"
+
+
+def backfill() -> None:
+    """Fill the rollup from sale items, with plain SQL so later model changes cannot affect it"""
+    day = local_day('fishsale.date')
+    op.execute(f"""
+        INSERT INTO fishsaledaily (user_id, day, pond_id, fish_id, unit_id, quantity, amount, sale_count, item_count)
+        SELECT fishsale.user_id, {day}, fishsaleitem.pond_id, fishsaleitem.fish_id, fishsaleitem.unit_id,
+               COALESCE(SUM(fishsaleitem.quantity), 0), COALESCE(SUM(fishsaleitem.amount), 0),
+               COUNT(DISTINCT fishsale.id), COUNT(fishsaleitem.id)
+        FROM fishsale
+        JOIN fishsaleitem ON fishsaleitem.sale_id = fishsale.id
+        GROUP BY fishsale.user_id, {day}, fishsaleitem.pond_id, fishsaleitem.fish_id, fishsaleitem.unit_id
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'fishsaledaily' not in tables:
+        op.create_table('fishsaledaily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('pond_id', sa.Integer(), nullable=True),
+        sa.Column('fish_id', sa.Integer(), nullable=True),
+        sa.Column('unit_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('sale_count', sa.Integer(), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['fish_id'], ['fish.id'], ),
+        sa.ForeignKeyConstraint(['pond_id'], ['pond.id'], ),
+        sa.ForeignKeyConstraint(['unit_id'], ['unit.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    # Backfill from existing sales so dashboards are correct right away
+    if 'fishsale' in tables and 'fishsaleitem' in tables:
+        op.execute('DELETE FROM fishsaledaily')
+        backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('fishsaledaily')
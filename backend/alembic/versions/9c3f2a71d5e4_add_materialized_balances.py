@@ -0,0 +1,89 @@
+"""add_materialized_balances
+
+Revision ID: 9c3f2a71d5e4
+Revises: 4eb4140e89a8
+Create Date: 2026-10-16 13:04:27.551920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3f2a71d5e4'
+down_revision: Union[str, Sequence[str], None] = '4eb4140e89a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BALANCE_COLUMNS = {
+    'creditor': ('total_borrowed', 'total_repaid', 'balance'),
+    'debtor': ('total_lent', 'total_received', 'balance'),
+    'contributor': ('total_contributed', 'total_returned', 'balance'),
+    'supplier': ('total_credit', 'total_paid', 'balance'),
+    'fishbuyer': ('total_bought', 'total_paid', 'balance'),
+}
+
+# (counterparty, entry table, foreign key, type column, increase type, decrease type)
+LEDGERS = [
+    ('creditor', '"transaction"', 'creditor_id', 'type', 'BORROW', 'REPAY'),
+    ('debtor', 'debtortransaction', 'debtor_id', 'type', 'LEND', 'RECEIVE'),
+    ('contributor', 'contributortransaction', 'contributor_id', 'type', 'CONTRIBUTE', 'RETURN'),
+    ('supplier', 'suppliertransaction', 'supplier_id', 'transaction_type', 'purchase_credit', 'payment'),
+]
+
+
+def entry_total(table: str, entries: str, fk: str, type_column: str, entry_type: str) -> str:
+    return (f"COALESCE((SELECT SUM(amount) FROM {entries} "
+            f"WHERE {entries}.{fk} = {table}.id AND {entries}.{type_column} = '{entry_type}'), 0)")
+
+
+def backfill() -> None:
+    """Compute the totals from transaction history, with plain SQL so later model changes cannot affect it"""
+    for table, entries, fk, type_column, increase, decrease in LEDGERS:
+        increase_total, decrease_total, _ = BALANCE_COLUMNS[table]
+        op.execute(f"""
+            UPDATE {table} SET
+                {increase_total} = {entry_total(table, entries, fk, type_column, increase)},
+                {decrease_total} = {entry_total(table, entries, fk, type_column, decrease)}
+        """)
+        op.execute(f"UPDATE {table} SET balance = {increase_total} - {decrease_total}")
+
+    # Buyers: sales raise the balance; money paid on sales and payments lower it
+    op.execute("""
+        UPDATE fishbuyer SET
+            total_bought = COALESCE((SELECT SUM(total_amount) FROM fishsale WHERE fishsale.buyer_id = fishbuyer.id), 0),
+            total_paid = COALESCE((SELECT SUM(paid_amount) FROM fishsale WHERE fishsale.buyer_id = fishbuyer.id), 0)
+                + COALESCE((SELECT SUM(amount) FROM fishbuyertransaction
+                            WHERE fishbuyertransaction.buyer_id = fishbuyer.id
+                              AND fishbuyertransaction.transaction_type = 'payment'), 0)
+    """)
+    op.execute("UPDATE fishbuyer SET balance = total_bought - total_paid")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    for table, columns in BALANCE_COLUMNS.items():
+        if table not in tables:
+            continue
+        existing = {c['name'] for c in inspector.get_columns(table)}
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                if column not in existing:
+                    batch_op.add_column(sa.Column(column, sa.Float(), nullable=False, server_default='0'))
+
+    # Backfill from transaction history so balances are correct right away
+    if all(table in tables for table in BALANCE_COLUMNS):
+        backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in BALANCE_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.drop_column(column)
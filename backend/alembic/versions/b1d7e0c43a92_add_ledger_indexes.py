@@ -0,0 +1,104 @@
+"""add_ledger_indexes
+
+Revision ID: b1d7e0c43a92
+Revises: 9c3f2a71d5e4
+Create Date: 2026-10-16 15:22:08.114730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1d7e0c43a92'
+down_revision: Union[str, Sequence[str], None] = '9c3f2a71d5e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, columns); index names follow SQLModel's ix_<table>_<columns> convention
+INDEXES = [
+    # Per-user date range scans behind every list and dashboard query
+    ('fishsale', ['user_id', 'date']),
+    ('pondfeedpurchase', ['user_id', 'date']),
+    ('pondfeedusage', ['user_id', 'date']),
+    ('laborcost', ['user_id', 'date']),
+    ('expense', ['user_id', 'date']),
+    ('income', ['user_id', 'date']),
+    ('fishbuyertransaction', ['user_id', 'date']),
+    ('fishsaledaily', ['user_id', 'day']),
+
+    # Foreign keys (user_id is covered by the composites above where present)
+    ('unit', ['user_id']),
+    ('pond', ['user_id']),
+    ('supplier', ['user_id']),
+    ('suppliertransaction', ['supplier_id']),
+    ('fishfeed', ['user_id']),
+    ('pondfeedpurchase', ['pond_id']),
+    ('pondfeedpurchase', ['supplier_id']),
+    ('pondfeedpurchase', ['feed_id']),
+    ('pondfeedpurchase', ['unit_id']),
+    ('pondfeedusage', ['pond_id']),
+    ('pondfeedusage', ['feed_id']),
+    ('pondfeedusage', ['unit_id']),
+    ('laborcost', ['pond_id']),
+    ('fishcategory', ['user_id']),
+    ('fish', ['category_id']),
+    ('fish', ['user_id']),
+    ('fishbuyer', ['user_id']),
+    ('fishbuyertransaction', ['buyer_id']),
+    ('fishsale', ['buyer_id']),
+    ('fishsaleitem', ['sale_id']),
+    ('fishsaleitem', ['pond_id']),
+    ('fishsaleitem', ['fish_id']),
+    ('fishsaleitem', ['unit_id']),
+    ('fishsaledaily', ['pond_id']),
+    ('fishsaledaily', ['fish_id']),
+    ('fishsaledaily', ['unit_id']),
+    ('creditor', ['user_id']),
+    ('transaction', ['creditor_id']),
+    ('debtor', ['user_id']),
+    ('debtortransaction', ['debtor_id']),
+    ('contributor', ['user_id']),
+    ('contributortransaction', ['contributor_id']),
+    ('expense_type', ['user_id']),
+    ('expense', ['expense_type_id']),
+    ('person', ['user_id']),
+    ('organization', ['user_id']),
+    ('income', ['person_id']),
+    ('income', ['organization_id']),
+]
+
+
+def index_name(table: str, columns) -> str:
+    return f"ix_{table}_{'_'.join(columns)}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and it
+    # keeps production tables writable while the index builds
+    with op.get_context().autocommit_block():
+        for table, columns in INDEXES:
+            if table not in tables:
+                continue
+            op.create_index(
+                index_name(table, columns), table, columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, columns in reversed(INDEXES):
+            op.drop_index(
+                index_name(table, columns), table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True
+            )
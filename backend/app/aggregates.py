@@ -0,0 +1,92 @@
+"""
+Dialect-aware date bucketing helpers for grouped aggregate queries.
+
+Postgres and SQLite spell date formatting differently, so the bucket
+expressions are compiled per dialect. Every bucket is a sortable string
+('YYYY-MM' or 'YYYY-MM-DD') that can be grouped on and matched back to
+Python-side month/day keys.
+"""
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class month_key(FunctionElement):
+    """'YYYY-MM' bucket of a datetime column"""
+    type = String()
+    inherit_cache = True
+    name = "month_key"
+
+
+class day_key(FunctionElement):
+    """'YYYY-MM-DD' bucket of a datetime column"""
+    type = String()
+    inherit_cache = True
+    name = "day_key"
+
+
+@compiles(month_key)
+def _month_key_default(element, compiler, **kw):
+    return "to_char(%s, 'YYYY-MM')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(month_key, "sqlite")
+def _month_key_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m', %s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_key)
+def _day_key_default(element, compiler, **kw):
+    return "to_char(%s, 'YYYY-MM-DD')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(day_key, "sqlite")
+def _day_key_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m-%%d', %s)" % compiler.process(element.clauses, **kw)
+
+
+def next_month(dt: datetime) -> datetime:
+    """First day of the month after dt"""
+    if dt.month == 12:
+        return datetime(dt.year + 1, 1, 1)
+    return datetime(dt.year, dt.month + 1, 1)
+
+
+def month_starts(start: datetime, end: datetime) -> List[datetime]:
+    """First day of every month from start's month to end's month, inclusive"""
+    months = []
+    curr = datetime(start.year, start.month, 1)
+    last = datetime(end.year, end.month, 1)
+    while curr <= last:
+        months.append(curr)
+        curr = next_month(curr)
+    return months
+
+
+def last_months(end: datetime, count: int) -> List[datetime]:
+    """First day of the `count` calendar months ending with end's month"""
+    year, month = end.year, end.month - (count - 1)
+    while month < 1:
+        month += 12
+        year -= 1
+    return month_starts(datetime(year, month, 1), end)
+
+
+def month_series(
+    totals: Dict[str, float],
+    months: List[datetime],
+    label_format: str = "%b %Y",
+    value_key: str = "amount"
+) -> List[Dict]:
+    """Gap-filled trend series from {'YYYY-MM': amount} totals"""
+    return [
+        {
+            "month": m.strftime(label_format),
+            value_key: float(totals.get(m.strftime("%Y-%m"), 0) or 0)
+        }
+        for m in months
+    ]
+
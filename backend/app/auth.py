@@ -1,26 +1,73 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
 from sqlmodel import Session, select
 from app.database import get_session
+from app.cache import TTLCache
+from app.models.user import User
+import os
 
 SECRET_KEY = "supersecretkey" # TODO: Move to env var
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor; existing hashes are upgraded or downgraded on the next login
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+# Hashing runs on its own small pool so login bursts cannot occupy every request thread
+BCRYPT_WORKERS = int(os.environ.get("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+_hash_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Authenticated users by token subject (email), so most requests skip the user lookup
+user_cache = TTLCache(
+    maxsize=int(os.environ.get("AUTH_CACHE_SIZE", "1024")),
+    ttl=float(os.environ.get("AUTH_CACHE_TTL", "60")),
+    name="auth_users"
+)
+
+def invalidate_user(email: str):
+    """Drop a cached user; the next request reloads it from the database"""
+    user_cache.pop(email)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _drop_cached_user(mapper, connection, target):
+    invalidate_user(target.email)
+
+@event.listens_for(User.email, "set", active_history=True)
+def _drop_cached_old_email(target, value, old_value, initiator):
+    # An email change must also retire the entry under the old address
+    if isinstance(old_value, str) and old_value != value:
+        invalidate_user(old_value)
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def hash_password(password: str) -> str:
+    """get_password_hash on the bcrypt executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
+
+async def verify_and_update_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify on the bcrypt executor. Also returns a new hash when the stored
+    one was made with a different cost (or scheme), else None.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.verify_and_update, password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -52,9 +99,11 @@ def verify_token(token: str, token_type: str = "access"):
         return None
 
 def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
-    # Import User here to avoid circular import if User model imports auth
-    from app.models.user import User
-    
+    # Operations of a POST /batch reuse the user the batch authenticated
+    batch_user = session.info.get("batch_user")
+    if batch_user is not None:
+        return batch_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -69,8 +118,17 @@ def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Dep
     if email is None:
         raise credentials_exception
         
-    statement = select(User).where(User.email == email)
-    user = session.exec(statement).first()
+    user = user_cache.get(email)
     if user is None:
-        raise credentials_exception
+        statement = select(User).where(User.email == email)
+        user = session.exec(statement).first()
+        if user is None:
+            raise credentials_exception
+        
+        # Detached, so the one cached instance can be shared by concurrent requests
+        session.expunge(user)
+        user_cache.set(email, user)
+    
+    # Writes committed on this request's session invalidate this user's cached responses
+    session.info["user_id"] = user.id
     return user
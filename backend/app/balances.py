@@ -0,0 +1,244 @@
+"""
+Materialized counterparty balances
+
+Creditor, Debtor, Contributor, Supplier and FishBuyer carry running totals
+and a balance. Routers apply every ledger change through this module inside
+their own transaction, using in-SQL increments so concurrent writes never
+lose an update.
+
+Detect drift: python -m app.balances
+Repair drift: python -m app.balances --repair
+"""
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlmodel import Session, select, func, case, update
+
+from app.models.creditor import Creditor, Transaction
+from app.models.debtor import Debtor, DebtorTransaction
+from app.models.contributor import Contributor, ContributorTransaction
+from app.models.fish_farming import Supplier, SupplierTransaction, FishBuyer, FishSale, FishBuyerTransaction
+
+TOLERANCE = 0.005
+
+
+@dataclass
+class Ledger:
+    """A counterparty model and the transaction table that moves its balance"""
+    model: type
+    entry: type
+    counterparty_fk: str
+    type_field: str
+    increase_type: str   # Entry type that raises the balance
+    decrease_type: str   # Entry type that lowers it
+    increase_total: str
+    decrease_total: str
+
+
+LEDGERS: Dict[str, Ledger] = {
+    "creditor": Ledger(Creditor, Transaction, "creditor_id", "type",
+                       "BORROW", "REPAY", "total_borrowed", "total_repaid"),
+    "debtor": Ledger(Debtor, DebtorTransaction, "debtor_id", "type",
+                     "LEND", "RECEIVE", "total_lent", "total_received"),
+    "contributor": Ledger(Contributor, ContributorTransaction, "contributor_id", "type",
+                          "CONTRIBUTE", "RETURN", "total_contributed", "total_returned"),
+    "supplier": Ledger(Supplier, SupplierTransaction, "supplier_id", "transaction_type",
+                       "purchase_credit", "payment", "total_credit", "total_paid"),
+}
+
+BUYER_FIELDS = ("total_bought", "total_paid", "balance")
+
+
+def balance_fields(model) -> List[str]:
+    """Columns owned by this module; routers must not take them from request bodies"""
+    if model is FishBuyer:
+        return list(BUYER_FIELDS)
+    for ledger in LEDGERS.values():
+        if ledger.model is model:
+            return [ledger.increase_total, ledger.decrease_total, "balance"]
+    return []
+
+
+def reset_totals(obj):
+    """Zero the running totals of a counterparty that is about to be created"""
+    for field in balance_fields(type(obj)):
+        setattr(obj, field, 0.0)
+
+
+def _entry_type(value) -> str:
+    return getattr(value, "value", value)
+
+
+def apply_entry(session: Session, ledger_name: str, counterparty_id: Optional[int], entry_type, amount: float, sign: int = 1):
+    """Apply (sign=1) or revert (sign=-1) one ledger transaction"""
+    ledger = LEDGERS[ledger_name]
+    if counterparty_id is None or not amount:
+        return
+    model = ledger.model
+    entry_type = _entry_type(entry_type)
+    delta = sign * amount
+
+    if entry_type == ledger.increase_type:
+        values = {
+            ledger.increase_total: getattr(model, ledger.increase_total) + delta,
+            "balance": model.balance + delta
+        }
+    elif entry_type == ledger.decrease_type:
+        values = {
+            ledger.decrease_total: getattr(model, ledger.decrease_total) + delta,
+            "balance": model.balance - delta
+        }
+    else:
+        return  # e.g. cash purchases do not move a supplier's dues
+
+    session.exec(update(model).where(model.id == counterparty_id).values(**values))
+
+
+def apply_buyer_sale(session: Session, buyer_id: Optional[int], total_amount: float, paid_amount: float, sign: int = 1):
+    """Apply (sign=1) or revert (sign=-1) a fish sale on its buyer"""
+    if buyer_id is None:
+        return
+    bought = sign * (total_amount or 0)
+    paid = sign * (paid_amount or 0)
+    session.exec(
+        update(FishBuyer)
+        .where(FishBuyer.id == buyer_id)
+        .values(
+            total_bought=FishBuyer.total_bought + bought,
+            total_paid=FishBuyer.total_paid + paid,
+            balance=FishBuyer.balance + bought - paid
+        )
+    )
+
+
+def apply_buyer_payment(session: Session, buyer_id: Optional[int], amount: float, sign: int = 1):
+    """Record money received from a buyer, either directly or settled onto a sale"""
+    if buyer_id is None or not amount:
+        return
+    paid = sign * amount
+    session.exec(
+        update(FishBuyer)
+        .where(FishBuyer.id == buyer_id)
+        .values(
+            total_paid=FishBuyer.total_paid + paid,
+            balance=FishBuyer.balance - paid
+        )
+    )
+
+
+# --- Reconciliation ---
+
+def _expected_ledger_totals(session: Session, ledger: Ledger, user_id: Optional[int]):
+    entry = ledger.entry
+    fk = getattr(entry, ledger.counterparty_fk)
+    type_col = getattr(entry, ledger.type_field)
+    totals = (
+        select(
+            fk.label("counterparty_id"),
+            func.sum(case((type_col == ledger.increase_type, entry.amount), else_=0.0)).label("increase"),
+            func.sum(case((type_col == ledger.decrease_type, entry.amount), else_=0.0)).label("decrease")
+        )
+        .group_by(fk)
+        .subquery()
+    )
+    increase = func.coalesce(totals.c.increase, 0.0)
+    decrease = func.coalesce(totals.c.decrease, 0.0)
+    query = (
+        select(ledger.model, increase, decrease, increase - decrease)
+        .outerjoin(totals, totals.c.counterparty_id == ledger.model.id)
+    )
+    if user_id is not None:
+        query = query.where(ledger.model.user_id == user_id)
+    return session.exec(query).all()
+
+
+def expected_buyer_totals_query(user_id: Optional[int] = None):
+    """Select (FishBuyer, total_bought, total_paid, balance) recomputed from sales and payments"""
+    sales_totals = (
+        select(
+            FishSale.buyer_id,
+            func.sum(FishSale.total_amount).label("total_bought"),
+            func.sum(FishSale.paid_amount).label("paid_on_sales")
+        )
+        .where(FishSale.buyer_id.is_not(None))
+        .group_by(FishSale.buyer_id)
+        .subquery()
+    )
+    payment_totals = (
+        select(
+            FishBuyerTransaction.buyer_id,
+            func.sum(FishBuyerTransaction.amount).label("paid_via_transactions")
+        )
+        .where(FishBuyerTransaction.transaction_type == 'payment')
+        .group_by(FishBuyerTransaction.buyer_id)
+        .subquery()
+    )
+    total_bought = func.coalesce(sales_totals.c.total_bought, 0.0)
+    total_paid = func.coalesce(sales_totals.c.paid_on_sales, 0.0) + func.coalesce(payment_totals.c.paid_via_transactions, 0.0)
+    query = (
+        select(FishBuyer, total_bought, total_paid, total_bought - total_paid)
+        .outerjoin(sales_totals, sales_totals.c.buyer_id == FishBuyer.id)
+        .outerjoin(payment_totals, payment_totals.c.buyer_id == FishBuyer.id)
+    )
+    if user_id is not None:
+        query = query.where(FishBuyer.user_id == user_id)
+    return query
+
+
+def reconcile(session: Session, repair: bool = False, user_id: Optional[int] = None) -> List[dict]:
+    """
+    Compare stored totals with totals recomputed from the full history.
+    Returns one entry per drifted counterparty; with repair=True the stored
+    values are overwritten and committed.
+    """
+    drift = []
+
+    def check(kind, obj, fields, expected):
+        stored = [getattr(obj, f) or 0.0 for f in fields]
+        if any(abs(s - e) > TOLERANCE for s, e in zip(stored, expected)):
+            drift.append({
+                "kind": kind,
+                "id": obj.id,
+                "name": obj.name,
+                "stored": dict(zip(fields, stored)),
+                "expected": dict(zip(fields, expected))
+            })
+            if repair:
+                for field, value in zip(fields, expected):
+                    setattr(obj, field, value)
+                session.add(obj)
+
+    for kind, ledger in LEDGERS.items():
+        fields = [ledger.increase_total, ledger.decrease_total, "balance"]
+        for obj, increase, decrease, balance in _expected_ledger_totals(session, ledger, user_id):
+            check(kind, obj, fields, [increase, decrease, balance])
+
+    for buyer, bought, paid, balance in session.exec(expected_buyer_totals_query(user_id)).all():
+        check("fish_buyer", buyer, list(BUYER_FIELDS), [bought, paid, balance])
+
+    if repair:
+        session.commit()
+    return drift
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description="Check materialized counterparty balances against history")
+    parser.add_argument("--repair", action="store_true", help="Overwrite drifted totals with recomputed values")
+    parser.add_argument("--user-id", type=int, default=None, help="Only check this user's counterparties")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        drifted = reconcile(session, repair=args.repair, user_id=args.user_id)
+
+    for entry in drifted:
+        print(f"{entry['kind']} {entry['id']} ({entry['name']}): stored={entry['stored']} expected={entry['expected']}")
+    if not drifted:
+        print("✅ All balances match their transaction history")
+    elif args.repair:
+        print(f"✅ Repaired {len(drifted)} balances")
+    else:
+        print(f"⚠️  {len(drifted)} balances drifted; rerun with --repair to fix")
+        raise SystemExit(1)
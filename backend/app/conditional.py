@@ -0,0 +1,80 @@
+"""
+Conditional GET (ETag / If-None-Match) for read endpoints
+
+A router opts in with a dependency naming the tables its responses are
+built from:
+
+    router = APIRouter(dependencies=[Depends(conditional_get(Pond, Unit))])
+
+For GET requests the dependency derives a weak ETag from the request URL,
+the user and that user's change version of each listed table (kept by
+app.response_cache on every commit). When the client's If-None-Match
+already holds that tag it answers 304 before the endpoint runs, so neither
+the queries nor the serialization happen; otherwise the tag is added to
+the response. Other methods pass straight through.
+
+ETags need a version store shared by every worker (RESPONSE_CACHE_URL=
+redis://...); otherwise one worker could answer 304 after a write made on
+another. They are off while the response cache is off or per-worker
+(memory://).
+"""
+import hashlib
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from app import response_cache
+from app.auth import get_current_user
+from app.models.user import User
+
+ETAG_HEADER = "ETag"
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(request: Request, user_id: int, tables: List[str]) -> Optional[str]:
+    backend = response_cache.backend
+    if backend is None or backend.in_process:
+        return None
+    scopes = [response_cache.GLOBAL_SCOPE] + [response_cache.table_scope(user_id, table) for table in tables]
+    versions = ".".join(str(version) for version in backend.versions(scopes))
+    # "Today" and "this month" move with the clock, as in the response cache keys
+    clock = f"{date.today()}/{datetime.utcnow().date()}"
+    source = f"{user_id}:{request.url.path}?{request.url.query}:{versions}:{clock}"
+    return f'W/"{hashlib.sha1(source.encode()).hexdigest()}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def conditional_get(*models):
+    """Router dependency adding ETags and 304 responses for GETs that read `models`"""
+    tables = sorted(model.__table__.name for model in models)
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user)
+    ):
+        if request.method not in ("GET", "HEAD"):
+            return
+        backend = response_cache.backend
+        if backend is None or backend.in_process:
+            return
+        etag = await run_in_threadpool(_etag, request, current_user.id, tables)
+        if etag is None:
+            return
+        headers = {ETAG_HEADER: etag, "Cache-Control": CACHE_CONTROL}
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
@@ -1,14 +1,70 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from sqlmodel import SQLModel, create_engine, Session
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 load_dotenv()
 import os
 
+from app import metrics
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.environ.get(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
 # Get the database URL from environment variable
 database_url = os.environ.get("DATABASE_URL", "sqlite:///./database.db")
 
+# Full SQL statement logging (DB_ECHO=1). Per-request query counts, timings
+# and the slow-query log come from app.instrumentation instead
+DB_ECHO = _env_flag("DB_ECHO")
+
+# Opt-in async engine (DB_ASYNC=1). Needs asyncpg for PostgreSQL or aiosqlite for
+# SQLite; requirements-async.txt installs both.
+DB_ASYNC = _env_flag("DB_ASYNC")
+
+pool_wait_seconds = metrics.Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection (includes opening a new one)",
+    (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+    ("engine",)
+)
+pool_timeouts = metrics.Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout seconds",
+    ("engine",)
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection"""
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(self.metrics_label)
+            raise
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - started, self.metrics_label)
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
 # Configure connection pooling to prevent "max clients reached" errors
 # Supabase free tier has limited connections (typically 15-20)
 pool_config = {}
+async_pool_config = {}
 if database_url.startswith("postgresql"):
     pool_config = {
         "pool_size": 3,              # Maximum number of permanent connections (reduced to 3)
@@ -17,18 +73,81 @@ if database_url.startswith("postgresql"):
         "pool_recycle": 1800,        # Recycle connections after 30 minutes
         "pool_pre_ping": True,       # Verify connections before using them
     }
+    # The sync engine stays up for auth, writes and migrations, so the async
+    # pool is kept small enough that both together stay under the limit
+    async_pool_config = {**pool_config, "pool_size": 3, "max_overflow": 2, "poolclass": TimedAsyncQueuePool}
+    pool_config["poolclass"] = TimedQueuePool
+
+engine = create_engine(database_url, echo=DB_ECHO, **pool_config)
 
-engine = create_engine(database_url, echo=True, **pool_config)
+
+def async_database_url(url: str) -> str:
+    """Swap a sync driver URL for its asyncio driver"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+async_engine = None
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine
+    async_engine = create_async_engine(async_database_url(database_url), echo=DB_ECHO, **async_pool_config)
+
+# Upper bound on connections one request may hold while gathering queries
+GATHER_LIMIT = 3
 
 
 def create_db_and_tables():
     # This remains the same; SQLModel handles the differences!
     SQLModel.metadata.create_all(engine)
 
+# Set by POST /batch: every operation of the batch runs on its one session
+shared_session: ContextVar[Optional[Session]] = ContextVar("shared_session", default=None)
+
+
 def get_session():
+    session = shared_session.get()
+    if session is not None:
+        yield session
+        return
     with Session(engine) as session:
         yield session
 
-# Important: You will need to run create_db_and_tables() 
-# on the server (usually in main.py) after deployment 
-# to create the tables in the new PostgreSQL database.
\ No newline at end of file
+async def get_async_session():
+    """AsyncSession dependency for async handlers; requires DB_ASYNC=1"""
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    if async_engine is None:
+        raise RuntimeError("get_async_session requires DB_ASYNC=1")
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+async def run_queries(statements: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    Run independent read-only statements and return {name: rows}.
+    On the async engine they run concurrently, each on its own pooled
+    connection (at most GATHER_LIMIT at a time). Otherwise they run one
+    after another in a single sync session on the threadpool.
+    """
+    if async_engine is not None:
+        semaphore = asyncio.Semaphore(GATHER_LIMIT)
+
+        async def run(statement):
+            async with semaphore:
+                async with async_engine.connect() as connection:
+                    return (await connection.execute(statement)).all()
+
+        results = await asyncio.gather(*(run(statement) for statement in statements.values()))
+        return dict(zip(statements, results))
+
+    def run_all():
+        with Session(engine) as session:
+            return {name: session.execute(statement).all() for name, statement in statements.items()}
+
+    return await run_in_threadpool(run_all)
+
+# Important: You will need to run create_db_and_tables()
+# on the server (usually in main.py) after deployment
+# to create the tables in the new PostgreSQL database.
@@ -7,36 +7,44 @@ from alembic import command
 import os
 from .database import engine
 
-def apply_migrations():
+def _alembic_config() -> Config:
     """
-    Apply Alembic migrations programmatically.
+    Alembic config for the app's database.
     Bypasses alembic.ini ConfigParser to avoid issues with special characters
     (e.g., '%') in DATABASE_URL passwords (common with Supabase).
     """
-    try:
-        # Get the path to backend directory (parent of app/)
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        ini_path = os.path.join(base_dir, "alembic.ini")
+    # Get the path to backend directory (parent of app/)
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ini_path = os.path.join(base_dir, "alembic.ini")
 
-        # Load config from alembic.ini but do NOT let it parse the URL
-        # (ConfigParser chokes on '%' in passwords)
-        alembic_cfg = Config()
-        alembic_cfg.set_main_option("script_location", os.path.join(base_dir, "alembic"))
+    # Load config from alembic.ini but do NOT let it parse the URL
+    # (ConfigParser chokes on '%' in passwords)
+    alembic_cfg = Config()
+    alembic_cfg.set_main_option("script_location", os.path.join(base_dir, "alembic"))
 
-        # Inject the DATABASE_URL directly, bypassing alembic.ini interpolation
-        db_url = os.environ.get("DATABASE_URL", "")
-        if db_url:
-            alembic_cfg.set_main_option("sqlalchemy.url", db_url)
-        else:
-            # Fallback: read from ini directly if no env var
-            alembic_cfg = Config(ini_path)
+    # Inject the DATABASE_URL directly, bypassing alembic.ini interpolation
+    db_url = os.environ.get("DATABASE_URL", "")
+    if db_url:
+        alembic_cfg.set_main_option("sqlalchemy.url", db_url)
+    else:
+        # Fallback: read from ini directly if no env var
+        alembic_cfg = Config(ini_path)
+    return alembic_cfg
 
+def apply_migrations():
+    """Apply Alembic migrations programmatically."""
+    try:
+        alembic_cfg = _alembic_config()
         print("🚀 Applying database migrations...")
         command.upgrade(alembic_cfg, "head")
         print("✅ Database migrations applied successfully")
     except Exception as e:
         print(f"⚠️  Database migration failed: {e}")
 
+def stamp_head():
+    """Mark the database as fully migrated, e.g. after creating a fresh schema from the models"""
+    command.stamp(_alembic_config(), "head")
+
 def fix_sequences():
     """
     Fix PostgreSQL sequences for all tables.
@@ -0,0 +1,244 @@
+"""
+Streaming CSV / NDJSON exports of the ledgers
+
+Every ledger is one flat SELECT of plain columns (names of the referenced
+rows included), filtered to one user and an optional date range and ordered
+by (date, id). Rows are fetched `EXPORT_BATCH_SIZE` at a time through
+yield_per, which uses a server-side cursor on PostgreSQL, and each batch is
+encoded and handed to the response before the next one is read. No ORM
+objects are built and nothing is accumulated, so memory stays flat however
+many rows a ledger has.
+
+The stream runs after the endpoint has returned, so it opens its own
+Session instead of borrowing the request's.
+"""
+import csv
+import io
+import itertools
+import json
+import os
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import Select
+from sqlmodel import Session, select, func
+
+from app.database import engine
+from app.models import (
+    Transaction, Creditor, DebtorTransaction, Debtor, ContributorTransaction, Contributor,
+    Expense, ExpenseType, Income, Person, Organization,
+    FishSale, FishSaleItem, FishBuyer, FishBuyerTransaction, Fish, Pond, Unit,
+    PondFeedPurchase, PondFeedUsage, FishFeed, Supplier, SupplierTransaction, LaborCost,
+)
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Ledger(NamedTuple):
+    query: Callable[[int], Select]  # one user's rows, labelled plain columns
+    date: Any  # column filtered by the date range and ordered on
+    order: tuple  # tie-breakers after the date
+
+
+def _fish_sales(user_id: int) -> Select:
+    # One row per item; sales without items (simple sales) get one row with empty item columns
+    return (
+        select(
+            FishSale.id.label("sale_id"), FishSale.date,
+            func.coalesce(FishBuyer.name, FishSale.buyer_name).label("buyer"),
+            FishSale.sale_type, FishSale.payment_status, FishSale.total_amount,
+            FishSale.paid_amount, FishSale.due_amount, FishSale.total_weight,
+            FishSaleItem.id.label("item_id"), Pond.name.label("pond"), Fish.name.label("fish"),
+            FishSaleItem.quantity, Unit.name.label("unit"), FishSaleItem.rate_per_unit, FishSaleItem.amount,
+        )
+        .select_from(FishSale)
+        .outerjoin(FishBuyer, FishBuyer.id == FishSale.buyer_id)
+        .outerjoin(FishSaleItem, FishSaleItem.sale_id == FishSale.id)
+        .outerjoin(Pond, Pond.id == FishSaleItem.pond_id)
+        .outerjoin(Fish, Fish.id == FishSaleItem.fish_id)
+        .outerjoin(Unit, Unit.id == FishSaleItem.unit_id)
+        .where(FishSale.user_id == user_id)
+    )
+
+
+def _feed_purchases(user_id: int) -> Select:
+    return (
+        select(
+            PondFeedPurchase.id, PondFeedPurchase.date, Pond.name.label("pond"), Supplier.name.label("supplier"),
+            FishFeed.name.label("feed"), PondFeedPurchase.quantity, Unit.name.label("unit"),
+            PondFeedPurchase.price_per_unit, PondFeedPurchase.total_amount, PondFeedPurchase.description,
+        )
+        .outerjoin(Pond, Pond.id == PondFeedPurchase.pond_id)
+        .outerjoin(Supplier, Supplier.id == PondFeedPurchase.supplier_id)
+        .outerjoin(FishFeed, FishFeed.id == PondFeedPurchase.feed_id)
+        .outerjoin(Unit, Unit.id == PondFeedPurchase.unit_id)
+        .where(PondFeedPurchase.user_id == user_id)
+    )
+
+
+def _feed_usage(user_id: int) -> Select:
+    return (
+        select(
+            PondFeedUsage.id, PondFeedUsage.date, Pond.name.label("pond"), FishFeed.name.label("feed"),
+            PondFeedUsage.quantity, Unit.name.label("unit"), PondFeedUsage.price_per_unit, PondFeedUsage.total_cost,
+        )
+        .outerjoin(Pond, Pond.id == PondFeedUsage.pond_id)
+        .outerjoin(FishFeed, FishFeed.id == PondFeedUsage.feed_id)
+        .outerjoin(Unit, Unit.id == PondFeedUsage.unit_id)
+        .where(PondFeedUsage.user_id == user_id)
+    )
+
+
+def _labor_costs(user_id: int) -> Select:
+    return (
+        select(
+            LaborCost.id, LaborCost.date, Pond.name.label("pond"), LaborCost.amount,
+            LaborCost.worker_count, LaborCost.description,
+        )
+        .outerjoin(Pond, Pond.id == LaborCost.pond_id)
+        .where(LaborCost.user_id == user_id)
+    )
+
+
+def _expenses(user_id: int) -> Select:
+    return (
+        select(
+            Expense.id, Expense.date, ExpenseType.name.label("expense_type"), Expense.amount, Expense.description,
+        )
+        .outerjoin(ExpenseType, ExpenseType.id == Expense.expense_type_id)
+        .where(Expense.user_id == user_id)
+    )
+
+
+def _incomes(user_id: int) -> Select:
+    return (
+        select(
+            Income.id, Income.date, Person.name.label("person"), Organization.name.label("organization"),
+            Income.income_type, Income.amount, Income.note,
+        )
+        .outerjoin(Person, Person.id == Income.person_id)
+        .outerjoin(Organization, Organization.id == Income.organization_id)
+        .where(Income.user_id == user_id)
+    )
+
+
+def _party_transactions(model, party, party_id, label: str) -> Callable[[int], Select]:
+    """Transactions owned through their party (creditor, debtor, ...), which carries the user"""
+    def query(user_id: int) -> Select:
+        return (
+            select(model.id, model.date, party.name.label(label), model.type, model.amount, model.note)
+            .join(party, party.id == party_id)
+            .where(party.user_id == user_id)
+        )
+    return query
+
+
+def _fish_buyer_transactions(user_id: int) -> Select:
+    return (
+        select(
+            FishBuyerTransaction.id, FishBuyerTransaction.date, FishBuyer.name.label("buyer"),
+            FishBuyerTransaction.transaction_type, FishBuyerTransaction.amount, FishBuyerTransaction.note,
+        )
+        .join(FishBuyer, FishBuyer.id == FishBuyerTransaction.buyer_id)
+        .where(FishBuyerTransaction.user_id == user_id)
+    )
+
+
+def _supplier_transactions(user_id: int) -> Select:
+    return (
+        select(
+            SupplierTransaction.id, SupplierTransaction.date, Supplier.name.label("supplier"),
+            SupplierTransaction.transaction_type, SupplierTransaction.amount, SupplierTransaction.description,
+        )
+        .join(Supplier, Supplier.id == SupplierTransaction.supplier_id)
+        .where(Supplier.user_id == user_id)
+    )
+
+
+LEDGERS = {
+    "fish-sales": Ledger(_fish_sales, FishSale.date, (FishSale.id, FishSaleItem.id)),
+    "feed-purchases": Ledger(_feed_purchases, PondFeedPurchase.date, (PondFeedPurchase.id,)),
+    "feed-usage": Ledger(_feed_usage, PondFeedUsage.date, (PondFeedUsage.id,)),
+    "labor-costs": Ledger(_labor_costs, LaborCost.date, (LaborCost.id,)),
+    "expenses": Ledger(_expenses, Expense.date, (Expense.id,)),
+    "incomes": Ledger(_incomes, Income.date, (Income.id,)),
+    "creditor-transactions": Ledger(
+        _party_transactions(Transaction, Creditor, Transaction.creditor_id, "creditor"),
+        Transaction.date, (Transaction.id,)
+    ),
+    "debtor-transactions": Ledger(
+        _party_transactions(DebtorTransaction, Debtor, DebtorTransaction.debtor_id, "debtor"),
+        DebtorTransaction.date, (DebtorTransaction.id,)
+    ),
+    "contributor-transactions": Ledger(
+        _party_transactions(ContributorTransaction, Contributor, ContributorTransaction.contributor_id, "contributor"),
+        ContributorTransaction.date, (ContributorTransaction.id,)
+    ),
+    "fish-buyer-transactions": Ledger(_fish_buyer_transactions, FishBuyerTransaction.date, (FishBuyerTransaction.id,)),
+    "supplier-transactions": Ledger(_supplier_transactions, SupplierTransaction.date, (SupplierTransaction.id,)),
+}
+
+
+def ledger_query(name: str, user_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Select:
+    ledger = LEDGERS[name]
+    query = ledger.query(user_id)
+    if start:
+        query = query.where(ledger.date >= start)
+    if end:
+        query = query.where(ledger.date <= end)
+    return query.order_by(ledger.date, *ledger.order)
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def iter_batches(query: Select, batch_size: int = None) -> Iterator[List[tuple]]:
+    """Column names first, then lists of at most batch_size rows, from a server-side cursor"""
+    with Session(engine) as session:
+        result = session.execute(query.execution_options(yield_per=batch_size or EXPORT_BATCH_SIZE))
+        yield list(result.keys())
+        for rows in result.partitions():
+            yield rows
+
+
+def encode_csv(batches: Iterator) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(next(batches))
+    for rows in itertools.chain([()], batches):
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def encode_ndjson(batches: Iterator) -> Iterator[bytes]:
+    columns = next(batches)
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, map(_plain, row))), ensure_ascii=False) + "\n" for row in rows
+        ).encode()
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson}
+
+
+def gzipped(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
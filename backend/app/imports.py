@@ -0,0 +1,501 @@
+"""
+Bulk CSV import of historical ledgers
+
+Each ledger takes the CSV layout that app.exports writes (extra columns such
+as ids are ignored), so an export can be edited in a spreadsheet and
+imported again. Related rows are referenced by name: ponds, fish, units,
+buyers, suppliers, feeds and counterparties are loaded once per import into
+case-insensitive lookups. Dates are ISO 8601 or dd/mm/yyyy.
+
+Every row is validated before anything is written. Invalid rows are
+reported with their line number and left out; the valid ones are inserted
+in batches (COPY on PostgreSQL, executemany elsewhere) and committed in a
+single transaction, together with the aggregated balance changes and, for
+sales, a rebuild of the daily rollup.
+
+Historical buyer payments only move the buyer's balance; unlike
+POST /fish-buyers/{id}/transactions they are not spread over open sales,
+whose paid amounts come from the file.
+
+    python -m app.imports fish-sales sales.csv --email owner@example.com [--dry-run]
+"""
+import argparse
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pytz
+from sqlalchemy import insert, text
+from sqlmodel import Session, select, or_
+
+from app import balances, rollups, response_cache
+from app.models import (
+    Expense, ExpenseType, Income, Person, Organization,
+    FishSale, FishSaleItem, FishBuyer, FishBuyerTransaction, Fish, Pond, Unit,
+    PondFeedPurchase, PondFeedUsage, FishFeed, Supplier, SupplierTransaction, LaborCost,
+)
+from app.models.fish_farming import TransactionType
+
+IMPORT_BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+INCOME_TYPES = ("SALARY", "BONUS", "COMMISSION", "ALLOWANCE", "OTHER")
+
+
+class ImportFileError(ValueError):
+    """The file as a whole cannot be imported (e.g. required columns are missing)"""
+
+
+# --- Row parsing ---
+
+class Lookups:
+    """Name -> id per referenced model, loaded on first use"""
+
+    def __init__(self, session: Session, user_id: int):
+        self.session = session
+        self.user_id = user_id
+        self._names: Dict[type, Dict[str, int]] = {}
+
+    def resolve(self, model, name: str) -> Optional[int]:
+        if model not in self._names:
+            owner = model.user_id == self.user_id
+            if model is Unit:
+                owner = or_(owner, Unit.is_default == True)
+            names = {}
+            for row_id, row_name in self.session.exec(select(model.id, model.name).where(owner).order_by(model.id)):
+                names.setdefault(row_name.strip().casefold(), row_id)
+            self._names[model] = names
+        return self._names[model].get(name.strip().casefold())
+
+
+class RowReader:
+    """Typed access to one CSV row; problems are collected instead of raised"""
+
+    def __init__(self, row: Dict[str, str], lookups: Lookups):
+        self.row = row
+        self.lookups = lookups
+        self.errors: List[str] = []
+
+    def raw(self, column: str) -> str:
+        return (self.row.get(column) or "").strip()
+
+    def _missing(self, column: str, required: bool):
+        if required:
+            self.errors.append(f"{column} is required")
+        return None
+
+    def text(self, column: str) -> Optional[str]:
+        return self.raw(column) or None
+
+    def date(self, column: str = "date", required: bool = True) -> Optional[datetime]:
+        value = self.raw(column)
+        if not value:
+            return self._missing(column, required)
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            try:
+                parsed = datetime.strptime(value, "%d/%m/%Y")
+            except ValueError:
+                self.errors.append(f"{column} '{value}' is not a date (YYYY-MM-DD or DD/MM/YYYY)")
+                return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(pytz.utc).replace(tzinfo=None)
+        return parsed
+
+    def number(self, column: str, required: bool = True, default: Optional[float] = None) -> Optional[float]:
+        value = self.raw(column).replace(",", "")
+        if not value:
+            return default if default is not None else self._missing(column, required)
+        try:
+            parsed = float(value)
+        except ValueError:
+            self.errors.append(f"{column} '{value}' is not a number")
+            return None
+        if parsed < 0:
+            self.errors.append(f"{column} must not be negative")
+            return None
+        return parsed
+
+    def integer(self, column: str, required: bool = True) -> Optional[int]:
+        value = self.number(column, required)
+        if value is not None and value != int(value):
+            self.errors.append(f"{column} must be a whole number")
+            return None
+        return int(value) if value is not None else None
+
+    def choice(self, column: str, options: Iterable[str], default: Optional[str] = None) -> Optional[str]:
+        value = self.raw(column)
+        if not value:
+            return default if default is not None else self._missing(column, True)
+        for option in options:
+            if option.casefold() == value.casefold():
+                return option
+        self.errors.append(f"{column} '{value}' must be one of: {', '.join(options)}")
+        return None
+
+    def ref(self, column: str, model, required: bool = True) -> Optional[int]:
+        value = self.raw(column)
+        if not value:
+            return self._missing(column, required)
+        row_id = self.lookups.resolve(model, value)
+        if row_id is None:
+            self.errors.append(f"Unknown {column} '{value}'")
+        return row_id
+
+
+# --- Bulk writes ---
+
+def _copy_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _copy(session: Session, table, rows: List[dict]):
+    """COPY rows into a PostgreSQL table through the session's connection"""
+    columns = list(rows[0])
+    preparer = session.get_bind().dialect.identifier_preparer
+    statement = (
+        f"COPY {preparer.format_table(table)} ({', '.join(preparer.quote(c) for c in columns)}) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in columns])
+    buffer.seek(0)
+    cursor = session.connection().connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
+    # COPY bypasses the session events that record writes
+    response_cache.mark_written(session, table.name)
+
+
+def bulk_insert(session: Session, model, rows: List[dict], returning: bool = False) -> List[int]:
+    """Insert rows in batches; with returning=True, return the new ids in row order"""
+    table = model.__table__
+    postgres = session.get_bind().dialect.name == "postgresql"
+    ids = []
+    for i in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[i:i + IMPORT_BATCH_SIZE]
+        if postgres:
+            if returning:
+                # Take the ids from the sequence up front, so COPY can write them
+                batch_ids = session.execute(
+                    text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+                    {"table": table.name, "count": len(batch)}
+                ).scalars().all()
+                batch = [{**row, "id": row_id} for row, row_id in zip(batch, batch_ids)]
+                ids.extend(batch_ids)
+            _copy(session, table, batch)
+        elif returning:
+            statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+            ids.extend(session.execute(statement, batch).scalars().all())
+        else:
+            session.execute(insert(table), batch)
+    return ids
+
+
+# --- Ledgers ---
+
+class Importer(NamedTuple):
+    model: type
+    required: Tuple[str, ...]  # columns the header must have
+    build: Callable[[RowReader], dict]
+    apply: Optional[Callable[[Session, List[dict]], None]] = None  # balance changes of the inserted rows
+
+
+def _feed_purchase(r: RowReader) -> dict:
+    quantity, price = r.number("quantity"), r.number("price_per_unit")
+    return {
+        "date": r.date(), "pond_id": r.ref("pond", Pond, required=False), "supplier_id": r.ref("supplier", Supplier),
+        "feed_id": r.ref("feed", FishFeed, required=False), "quantity": quantity, "unit_id": r.ref("unit", Unit),
+        "price_per_unit": price,
+        "total_amount": r.number("total_amount", default=(quantity or 0) * (price or 0)),
+        "description": r.text("description"),
+    }
+
+
+def _feed_usage(r: RowReader) -> dict:
+    quantity, price = r.number("quantity"), r.number("price_per_unit")
+    return {
+        "date": r.date(), "pond_id": r.ref("pond", Pond), "feed_id": r.ref("feed", FishFeed),
+        "quantity": quantity, "unit_id": r.ref("unit", Unit), "price_per_unit": price,
+        "total_cost": r.number("total_cost", default=(quantity or 0) * (price or 0)),
+    }
+
+
+def _labor_cost(r: RowReader) -> dict:
+    return {
+        "date": r.date(), "pond_id": r.ref("pond", Pond, required=False), "amount": r.number("amount"),
+        "worker_count": r.integer("worker_count"), "description": r.text("description"),
+    }
+
+
+def _expense(r: RowReader) -> dict:
+    return {
+        "date": r.date(), "expense_type_id": r.ref("expense_type", ExpenseType, required=False),
+        "amount": r.number("amount"), "description": r.text("description"),
+    }
+
+
+def _income(r: RowReader) -> dict:
+    return {
+        "date": r.date(), "person_id": r.ref("person", Person), "organization_id": r.ref("organization", Organization),
+        "income_type": r.choice("income_type", INCOME_TYPES, default="SALARY"),
+        "amount": r.number("amount"), "note": r.text("note"),
+    }
+
+
+def _party_importer(ledger_name: str, column: str) -> Importer:
+    """Creditor, debtor and contributor transactions"""
+    ledger = balances.LEDGERS[ledger_name]
+    fk = ledger.counterparty_fk
+
+    def build(r: RowReader) -> dict:
+        return {
+            "date": r.date(), fk: r.ref(column, ledger.model),
+            "type": r.choice("type", (ledger.increase_type, ledger.decrease_type)),
+            "amount": r.number("amount"), "note": r.text("note"),
+        }
+
+    def apply(session: Session, rows: List[dict]):
+        _apply_ledger_totals(session, ledger_name, rows, fk, "type")
+
+    return Importer(ledger.entry, ("date", column, "type", "amount"), build, apply)
+
+
+def _apply_ledger_totals(session: Session, ledger_name: str, rows: List[dict], fk: str, type_field: str):
+    totals = defaultdict(float)
+    for row in rows:
+        totals[(row[fk], _copy_value(row[type_field]))] += row["amount"]
+    for (counterparty_id, entry_type), amount in totals.items():
+        balances.apply_entry(session, ledger_name, counterparty_id, entry_type, amount)
+
+
+def _buyer_transaction(r: RowReader) -> dict:
+    return {
+        "date": r.date(), "buyer_id": r.ref("buyer", FishBuyer),
+        "transaction_type": r.choice("transaction_type", ("payment", "due")),
+        "amount": r.number("amount"), "note": r.text("note"),
+    }
+
+
+def _apply_buyer_payments(session: Session, rows: List[dict]):
+    paid = defaultdict(float)
+    for row in rows:
+        if row["transaction_type"] == "payment":
+            paid[row["buyer_id"]] += row["amount"]
+    for buyer_id, amount in paid.items():
+        balances.apply_buyer_payment(session, buyer_id, amount)
+
+
+def _supplier_transaction(r: RowReader) -> dict:
+    transaction_type = r.choice("transaction_type", [t.value for t in TransactionType])
+    return {
+        "date": r.date(), "supplier_id": r.ref("supplier", Supplier),
+        "transaction_type": TransactionType(transaction_type) if transaction_type else None,
+        "amount": r.number("amount"), "description": r.text("description"),
+    }
+
+
+IMPORTERS: Dict[str, Importer] = {
+    "feed-purchases": Importer(PondFeedPurchase, ("date", "supplier", "quantity", "unit", "price_per_unit"), _feed_purchase),
+    "feed-usage": Importer(PondFeedUsage, ("date", "pond", "feed", "quantity", "unit", "price_per_unit"), _feed_usage),
+    "labor-costs": Importer(LaborCost, ("date", "amount", "worker_count"), _labor_cost),
+    "expenses": Importer(Expense, ("date", "amount"), _expense),
+    "incomes": Importer(Income, ("date", "person", "organization", "amount"), _income),
+    "creditor-transactions": _party_importer("creditor", "creditor"),
+    "debtor-transactions": _party_importer("debtor", "debtor"),
+    "contributor-transactions": _party_importer("contributor", "contributor"),
+    "fish-buyer-transactions": Importer(
+        FishBuyerTransaction, ("date", "buyer", "transaction_type", "amount"), _buyer_transaction, _apply_buyer_payments
+    ),
+    "supplier-transactions": Importer(
+        SupplierTransaction, ("date", "supplier", "transaction_type", "amount"), _supplier_transaction,
+        lambda session, rows: _apply_ledger_totals(session, "supplier", rows, "supplier_id", "transaction_type")
+    ),
+}
+
+SALE_COLUMNS = ("date",)
+LEDGER_NAMES = ["fish-sales", *IMPORTERS]
+
+
+# --- Fish sales: several item rows per sale ---
+
+def _sale_items(rows: List[Tuple[int, RowReader]]) -> List[dict]:
+    items = []
+    for _, r in rows:
+        if not any(r.raw(column) for column in ("pond", "fish", "quantity", "unit", "rate_per_unit", "amount")):
+            continue  # a simple sale's row carries no item
+        quantity, rate = r.number("quantity"), r.number("rate_per_unit")
+        items.append({
+            "pond_id": r.ref("pond", Pond, required=False), "fish_id": r.ref("fish", Fish, required=False),
+            "quantity": quantity, "unit_id": r.ref("unit", Unit), "rate_per_unit": rate,
+            "amount": r.number("amount", default=(quantity or 0) * (rate or 0)),
+        })
+    return items
+
+
+def _sale(r: RowReader, items: List[dict], user_id: int) -> dict:
+    """The sale of a group of rows, read from its first row; amounts and status as the API derives them"""
+    buyer = r.text("buyer")
+    buyer_id = r.lookups.resolve(FishBuyer, buyer) if buyer else None
+    total = r.number("total_amount", required=not items, default=sum(item["amount"] or 0 for item in items) if items else None)
+    status = r.choice("payment_status", ("paid", "due", "partial"), default="due")
+    paid = r.number("paid_amount", required=False)
+    if paid is None:
+        paid = total if status == "paid" else 0.0
+    due = max((total or 0) - paid, 0.0)
+    return {
+        "date": r.date(), "buyer_id": buyer_id, "buyer_name": None if buyer_id else buyer,
+        "sale_type": r.choice("sale_type", ("detailed", "simple"), default="detailed" if items else "simple"),
+        "payment_status": "paid" if due <= 0 else ("partial" if paid > 0 else "due"),
+        "total_amount": total, "paid_amount": paid, "due_amount": due,
+        "total_weight": r.number("total_weight", required=False), "user_id": user_id,
+    }
+
+
+def _import_fish_sales(session: Session, user_id: int, lines, lookups: Lookups, report, dry_run: bool) -> int:
+    # Rows sharing a sale_id form one sale; rows without one are sales of their own
+    groups: Dict[str, List[Tuple[int, RowReader]]] = {}
+    for line, row in lines:
+        key = (row.get("sale_id") or "").strip() or f"line {line}"
+        groups.setdefault(key, []).append((line, RowReader(row, lookups)))
+
+    sales, sale_items = [], []
+    for key, rows in groups.items():
+        items = _sale_items(rows)
+        sale = _sale(rows[0][1], items, user_id)
+        failed = [(line, r.errors) for line, r in rows if r.errors]
+        if failed:
+            for line, errors in failed:
+                report(line, errors + ([f"sale {key} skipped"] if len(rows) > 1 else []))
+            continue
+        sales.append(sale)
+        sale_items.append(items)
+
+    if dry_run or not sales:
+        return len(sales)
+    sale_ids = bulk_insert(session, FishSale, sales, returning=True)
+    bulk_insert(session, FishSaleItem, [
+        {**item, "sale_id": sale_id} for sale_id, items in zip(sale_ids, sale_items) for item in items
+    ])
+    bought = defaultdict(lambda: [0.0, 0.0])
+    for sale in sales:
+        if sale["buyer_id"] is not None:
+            bought[sale["buyer_id"]][0] += sale["total_amount"]
+            bought[sale["buyer_id"]][1] += sale["paid_amount"]
+    for buyer_id, (total, paid) in bought.items():
+        balances.apply_buyer_sale(session, buyer_id, total, paid)
+    rollups.rebuild(session, user_id, commit=False)
+    return len(sales)
+
+
+# --- Entry point ---
+
+def _normalized_header(fieldnames) -> List[str]:
+    return [(name or "").strip().lower() for name in fieldnames or []]
+
+
+def import_csv(session: Session, ledger: str, user_id: int, stream: Iterable[str], dry_run: bool = False) -> dict:
+    """
+    Import one ledger's CSV for user_id. Returns counts and row-level errors;
+    raises ImportFileError when the file itself is unusable. Commits unless
+    dry_run, in which case nothing is written.
+    """
+    if ledger not in LEDGER_NAMES:
+        raise ImportFileError(f"Unknown ledger; one of: {', '.join(LEDGER_NAMES)}")
+    reader = csv.DictReader(stream)
+    header = _normalized_header(reader.fieldnames)
+    importer = IMPORTERS.get(ledger)
+    required = importer.required if importer else SALE_COLUMNS
+    missing = [column for column in required if column not in header]
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(missing)}")
+    reader.fieldnames = header
+
+    errors, failed = [], 0
+
+    def report(line: int, messages: List[str]):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"row": line, "errors": messages})
+
+    lines = []
+    for row in reader:
+        if any((value or "").strip() for value in row.values() if isinstance(value, str)):
+            lines.append((reader.line_num, row))
+
+    lookups = Lookups(session, user_id)
+    if importer is None:
+        imported = _import_fish_sales(session, user_id, lines, lookups, report, dry_run)
+    else:
+        owned = "user_id" in importer.model.__table__.c
+        rows = []
+        for line, row in lines:
+            r = RowReader(row, lookups)
+            values = importer.build(r)
+            if r.errors:
+                report(line, r.errors)
+                continue
+            if owned:
+                values["user_id"] = user_id
+            rows.append(values)
+        imported = len(rows)
+        if rows and not dry_run:
+            bulk_insert(session, importer.model, rows)
+            if importer.apply:
+                importer.apply(session, rows)
+
+    if dry_run:
+        session.rollback()
+    else:
+        session.commit()
+    return {
+        "ledger": ledger,
+        "rows": len(lines),
+        "imported": imported,
+        "failed": failed,
+        "dry_run": dry_run,
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    from app.database import engine
+    from app.models import User
+
+    parser = argparse.ArgumentParser(description="Import historical ledger rows from a CSV file")
+    parser.add_argument("ledger", choices=LEDGER_NAMES)
+    parser.add_argument("file", help="CSV file with a header row, e.g. an edited export")
+    parser.add_argument("--email", required=True, help="Owner of the imported rows")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and report without writing")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == args.email)).first()
+        if user is None:
+            raise SystemExit(f"No user with email {args.email}")
+        session.info["user_id"] = user.id  # Commits then invalidate this user's cached responses
+        with open(args.file, newline="", encoding="utf-8-sig") as f:
+            try:
+                result = import_csv(session, args.ledger, user.id, f, dry_run=args.dry_run)
+            except ImportFileError as e:
+                raise SystemExit(f"❌ {e}")
+
+    for error in result["errors"]:
+        print(f"line {error['row']}: {'; '.join(error['errors'])}")
+    if result["failed"] > len(result["errors"]):
+        print(f"... and {result['failed'] - len(result['errors'])} more invalid rows")
+    verb = "Would import" if args.dry_run else "Imported"
+    print(f"{'✅' if not result['failed'] else '⚠️'} {verb} {result['imported']} {args.ledger} "
+          f"from {result['rows']} rows ({result['failed']} invalid)")
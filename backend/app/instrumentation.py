@@ -0,0 +1,182 @@
+"""
+Per-request SQL and latency instrumentation
+
+SQLAlchemy cursor events count the statements a request issues and the time
+they spend in the database. The request is tracked through a context
+variable, so statements run on the threadpool or gathered on the async
+engine are attributed to the request that started them. Every response
+carries the totals:
+
+    Server-Timing: db;dur=12.3;desc="4 queries", app;dur=20.1
+    X-Query-Count: 4
+
+and they feed per-route histograms exported at /metrics, next to request
+latency, in-flight requests, connection pool usage, threadpool saturation
+and cache hit rates.
+
+Statements slower than SLOW_QUERY_MS milliseconds (default 500, 0 turns it
+off) are logged on the "app.sql.slow" logger with their parameters.
+"""
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+import anyio.to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app import metrics, database
+from app.cache import CACHES
+
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "500"))
+QUERY_COUNT_HEADER = "X-Query-Count"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+db_request_queries = metrics.Histogram(
+    "db_request_queries",
+    "SQL statements issued per request",
+    (0, 1, 2, 5, 10, 20, 50, 100, 250),
+    ("method", "route")
+)
+db_request_seconds = metrics.Histogram(
+    "db_request_seconds",
+    "Time per request spent executing SQL statements",
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    ("method", "route")
+)
+
+http_request_seconds = metrics.Histogram(
+    "http_request_duration_seconds",
+    "Request latency from the first to the last byte handled by the app",
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ("method", "route", "status")
+)
+http_requests_in_flight = metrics.Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served"
+)
+
+
+def _pool_samples(attribute):
+    def samples():
+        for label, engine in (("sync", database.engine), ("async", database.async_engine)):
+            pool = getattr(getattr(engine, "sync_engine", engine), "pool", None)
+            if pool is not None and hasattr(pool, attribute):
+                # QueuePool counts overflow from -pool_size while the pool fills
+                yield (label,), max(getattr(pool, attribute)(), 0)
+    return samples
+
+
+def _threadpool_samples():
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:  # Only readable from the event loop
+        return []
+    return [(("borrowed",), limiter.borrowed_tokens), (("total",), limiter.total_tokens)]
+
+
+def _cache_samples(field):
+    def samples():
+        return [((name,), cache.stats()[field]) for name, cache in CACHES.items()]
+    return samples
+
+
+metrics.Collector("db_pool_size", "Permanent connections the pool keeps", "gauge", ("engine",), _pool_samples("size"))
+metrics.Collector("db_pool_checked_out", "Connections currently in use", "gauge", ("engine",), _pool_samples("checkedout"))
+metrics.Collector("db_pool_overflow", "Temporary connections open beyond pool_size", "gauge", ("engine",), _pool_samples("overflow"))
+metrics.Collector("threadpool_tokens", "Threadpool slots for sync endpoints and dependencies", "gauge", ("state",), _threadpool_samples)
+metrics.Collector("cache_hits_total", "Cache lookups that found a live entry", "counter", ("cache",), _cache_samples("hits"))
+metrics.Collector("cache_misses_total", "Cache lookups that found nothing or an expired entry", "counter", ("cache",), _cache_samples("misses"))
+metrics.Collector("cache_entries", "Entries currently held", "gauge", ("cache",), _cache_samples("size"))
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Stats of the request being served, or None outside a request"""
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms): %s | parameters: %.1000r", elapsed * 1000, statement, parameters
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestStatsMiddleware:
+    """Pure ASGI middleware that reports each request's SQL totals and latency"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+        http_requests_in_flight.inc()
+
+        async def send_with_stats(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(SERVER_TIMING_HEADER, (
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}"
+                ))
+                headers[QUERY_COUNT_HEADER] = str(stats.queries)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            http_requests_in_flight.dec()
+            route = _route_label(scope)
+            http_request_seconds.observe(time.perf_counter() - started, scope["method"], route, status)
+            db_request_queries.observe(stats.queries, scope["method"], route)
+            db_request_seconds.observe(stats.db_seconds, scope["method"], route)
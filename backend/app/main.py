@@ -2,7 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .database import create_db_and_tables
 from .db_utils import apply_migrations
-from .routers import auth, creditors, transactions, debtors, debtor_transactions, contributors, contributor_transactions, expenses, ponds, suppliers, labor, fish_sales, units, pond_feeds, dashboard, persons, organizations, incomes, income_dashboard, fish_categories, fishes, fish_buyers, fish_feeds, feed_usage
+from .instrumentation import RequestStatsMiddleware, QUERY_COUNT_HEADER, SERVER_TIMING_HEADER
+from .conditional import ETAG_HEADER
+from .routers import auth, creditors, transactions, debtors, debtor_transactions, contributors, contributor_transactions, expenses, ponds, suppliers, labor, fish_sales, units, pond_feeds, dashboard, persons, organizations, incomes, income_dashboard, fish_categories, fishes, fish_buyers, fish_feeds, feed_usage, exports, imports, batch, metrics
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -20,8 +22,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", ETAG_HEADER, QUERY_COUNT_HEADER, SERVER_TIMING_HEADER],
 )
 
+# Query count, DB time and latency per request (response headers and /metrics)
+app.add_middleware(RequestStatsMiddleware)
+
 app.include_router(auth.router)
 app.include_router(creditors.router)
 app.include_router(transactions.router)
@@ -46,6 +52,10 @@ app.include_router(income_dashboard.router)
 app.include_router(fish_categories.router)
 app.include_router(fishes.router)
 app.include_router(fish_buyers.router)
+app.include_router(exports.router)
+app.include_router(imports.router)
+app.include_router(batch.router)
+app.include_router(metrics.router)
 
 @app.on_event("startup")
 def on_startup():
@@ -2,6 +2,6 @@ from .user import User
 from .expense import Expense, ExpenseType
 from .creditor import Creditor, Transaction
 from .debtor import Debtor, DebtorTransaction
-from .fish_farming import Pond, Supplier, SupplierTransaction, LaborCost, FishSale, FishSaleItem, Unit, PondFeedPurchase, FishFeed, PondFeedUsage, FishCategory, Fish, FishBuyer, FishBuyerTransaction
+from .fish_farming import Pond, Supplier, SupplierTransaction, LaborCost, FishSale, FishSaleItem, Unit, PondFeedPurchase, FishFeed, PondFeedUsage, FishCategory, Fish, FishBuyer, FishBuyerTransaction, FishSaleDaily
 from .contributor import Contributor, ContributorTransaction
 from .income import Person, Organization, Income
@@ -11,14 +11,19 @@ class Contributor(SQLModel, table=True):
     phone: Optional[str] = Field(default=None)
     contributor_type: Optional[str] = Field(default=None)
     is_active: bool = Field(default=True)
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
+    
+    # Running totals, maintained by app.balances
+    total_contributed: float = Field(default=0.0)
+    total_returned: float = Field(default=0.0)
+    balance: float = Field(default=0.0)
     
     user: Optional["User"] = Relationship(back_populates="contributors")
     transactions: List["ContributorTransaction"] = Relationship(back_populates="contributor")
 
 class ContributorTransaction(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    contributor_id: Optional[int] = Field(default=None, foreign_key="contributor.id")
+    contributor_id: Optional[int] = Field(default=None, foreign_key="contributor.id", index=True)
     amount: float
     type: str # "CONTRIBUTE" or "RETURN"
     date: datetime = Field(default_factory=datetime.utcnow)
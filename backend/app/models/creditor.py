@@ -11,14 +11,19 @@ class Creditor(SQLModel, table=True):
     phone: Optional[str] = Field(default=None)
     creditor_type: Optional[str] = Field(default=None)
     is_active: bool = Field(default=True)
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
+    
+    # Running totals, maintained by app.balances
+    total_borrowed: float = Field(default=0.0)
+    total_repaid: float = Field(default=0.0)
+    balance: float = Field(default=0.0)
     
     user: Optional["User"] = Relationship(back_populates="creditors")
     transactions: List["Transaction"] = Relationship(back_populates="creditor")
 
 class Transaction(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    creditor_id: Optional[int] = Field(default=None, foreign_key="creditor.id")
+    creditor_id: Optional[int] = Field(default=None, foreign_key="creditor.id", index=True)
     amount: float
     type: str # "BORROW" or "REPAY"
     date: datetime = Field(default_factory=datetime.utcnow)
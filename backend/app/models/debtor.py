@@ -11,14 +11,19 @@ class Debtor(SQLModel, table=True):
     phone: Optional[str] = Field(default=None)
     debtor_type: Optional[str] = Field(default=None)
     is_active: bool = Field(default=True)
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
+    
+    # Running totals, maintained by app.balances
+    total_lent: float = Field(default=0.0)
+    total_received: float = Field(default=0.0)
+    balance: float = Field(default=0.0)
     
     user: Optional["User"] = Relationship(back_populates="debtors")
     transactions: List["DebtorTransaction"] = Relationship(back_populates="debtor")
 
 class DebtorTransaction(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    debtor_id: Optional[int] = Field(default=None, foreign_key="debtor.id")
+    debtor_id: Optional[int] = Field(default=None, foreign_key="debtor.id", index=True)
     amount: float
     type: str # "LEND" or "RECEIVE"
     date: datetime = Field(default_factory=datetime.utcnow)
@@ -1,6 +1,6 @@
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, SQLModel, Relationship, Index
 
 if TYPE_CHECKING:
     from .user import User
@@ -10,17 +10,19 @@ class ExpenseType(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
     is_active: bool = Field(default=True)
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
     
     user: Optional["User"] = Relationship(back_populates="expense_types")
     expenses: List["Expense"] = Relationship(back_populates="expense_type")
 
 class Expense(SQLModel, table=True):
+    __table_args__ = (Index("ix_expense_user_id_date", "user_id", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     amount: float
     description: Optional[str] = Field(default=None)
     date: datetime = Field(default_factory=datetime.utcnow)
-    expense_type_id: Optional[int] = Field(default=None, foreign_key="expense_type.id")
+    expense_type_id: Optional[int] = Field(default=None, foreign_key="expense_type.id", index=True)
     user_id: Optional[int] = Field(default=None, foreign_key="user.id")
     
     user: Optional["User"] = Relationship(back_populates="expenses")
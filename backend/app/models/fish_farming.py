@@ -1,6 +1,7 @@
 from typing import Optional, List
-from datetime import datetime
-from sqlmodel import SQLModel, Field, Relationship
+from datetime import datetime, date
+from sqlalchemy import text
+from sqlmodel import SQLModel, Field, Relationship, Index
 from enum import Enum
 
 # --- Enums ---
@@ -17,7 +18,7 @@ class Unit(SQLModel, table=True):
     name: str  # e.g., "kg", "mon", "pcs", "ton"
     name_bn: Optional[str] = None  # Bengali name, e.g., "কেজি", "মণ", "পিস", "টন"
     is_default: bool = False  # True for system defaults
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")  # Null for defaults
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)  # Null for defaults
     
     # Relationships
     sale_items: List["FishSaleItem"] = Relationship(back_populates="unit")
@@ -30,7 +31,7 @@ class Pond(SQLModel, table=True):
     name: str
     location: str
     size: Optional[str] = None
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     
     # Relationships
     labor_costs: List["LaborCost"] = Relationship(back_populates="pond", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
@@ -43,7 +44,12 @@ class Supplier(SQLModel, table=True):
     name: str
     phone: Optional[str] = None
     address: Optional[str] = None
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
+    
+    # Running dues from credit purchases and payments, maintained by app.balances
+    total_credit: float = 0.0
+    total_paid: float = 0.0
+    balance: float = 0.0
     
     # Relationships
     transactions: List["SupplierTransaction"] = Relationship(back_populates="supplier")
@@ -51,7 +57,7 @@ class Supplier(SQLModel, table=True):
 
 class SupplierTransaction(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    supplier_id: int = Field(foreign_key="supplier.id")
+    supplier_id: int = Field(foreign_key="supplier.id", index=True)
     date: datetime
     transaction_type: TransactionType
     amount: float
@@ -65,20 +71,22 @@ class FishFeed(SQLModel, table=True):
     name: str
     brand: Optional[str] = None
     description: Optional[str] = None
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     
     # Relationships
     purchases: List["PondFeedPurchase"] = Relationship(back_populates="feed")
     usages: List["PondFeedUsage"] = Relationship(back_populates="feed")
 
 class PondFeedPurchase(SQLModel, table=True):
+    __table_args__ = (Index("ix_pondfeedpurchase_user_id_date", "user_id", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    pond_id: Optional[int] = Field(default=None, foreign_key="pond.id", nullable=True)
-    supplier_id: int = Field(foreign_key="supplier.id")
-    feed_id: Optional[int] = Field(default=None, foreign_key="fishfeed.id", nullable=True) # Link to FishFeed
+    pond_id: Optional[int] = Field(default=None, foreign_key="pond.id", index=True, nullable=True)
+    supplier_id: int = Field(foreign_key="supplier.id", index=True)
+    feed_id: Optional[int] = Field(default=None, foreign_key="fishfeed.id", index=True, nullable=True) # Link to FishFeed
     date: datetime
     quantity: float
-    unit_id: int = Field(foreign_key="unit.id")
+    unit_id: int = Field(foreign_key="unit.id", index=True)
     price_per_unit: float
     total_amount: float
     description: Optional[str] = None # Legacy/Notes
@@ -91,12 +99,14 @@ class PondFeedPurchase(SQLModel, table=True):
     feed: Optional[FishFeed] = Relationship(back_populates="purchases")
 
 class PondFeedUsage(SQLModel, table=True):
+    __table_args__ = (Index("ix_pondfeedusage_user_id_date", "user_id", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    pond_id: int = Field(foreign_key="pond.id")
-    feed_id: int = Field(foreign_key="fishfeed.id")
+    pond_id: int = Field(foreign_key="pond.id", index=True)
+    feed_id: int = Field(foreign_key="fishfeed.id", index=True)
     date: datetime
     quantity: float
-    unit_id: int = Field(foreign_key="unit.id")
+    unit_id: int = Field(foreign_key="unit.id", index=True)
     price_per_unit: float
     total_cost: float
     user_id: int = Field(foreign_key="user.id")
@@ -107,12 +117,14 @@ class PondFeedUsage(SQLModel, table=True):
     unit: Optional[Unit] = Relationship(back_populates="feed_usages")
 
 class LaborCost(SQLModel, table=True):
+    __table_args__ = (Index("ix_laborcost_user_id_date", "user_id", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     date: datetime
     amount: float
     worker_count: int
     description: Optional[str] = None
-    pond_id: Optional[int] = Field(default=None, foreign_key="pond.id")
+    pond_id: Optional[int] = Field(default=None, foreign_key="pond.id", index=True)
     user_id: int = Field(foreign_key="user.id")
     
     # Relationships
@@ -121,7 +133,7 @@ class LaborCost(SQLModel, table=True):
 class FishCategory(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     
     # Relationships
     fish: List["Fish"] = Relationship(back_populates="category")
@@ -129,8 +141,8 @@ class FishCategory(SQLModel, table=True):
 class Fish(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
-    category_id: Optional[int] = Field(default=None, foreign_key="fishcategory.id", nullable=True) # Optional category
-    user_id: int = Field(foreign_key="user.id")
+    category_id: Optional[int] = Field(default=None, foreign_key="fishcategory.id", index=True, nullable=True) # Optional category
+    user_id: int = Field(foreign_key="user.id", index=True)
     
     # Relationships
     category: Optional[FishCategory] = Relationship(back_populates="fish")
@@ -141,7 +153,12 @@ class FishBuyer(SQLModel, table=True):
     name: str
     phone: Optional[str] = None
     address: Optional[str] = None
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
+    
+    # Running totals, maintained by app.balances
+    total_bought: float = 0.0
+    total_paid: float = 0.0
+    balance: float = 0.0
     
     # Relationships
     sales: List["FishSale"] = Relationship(back_populates="buyer")
@@ -149,8 +166,10 @@ class FishBuyer(SQLModel, table=True):
 
 
 class FishBuyerTransaction(SQLModel, table=True):
+    __table_args__ = (Index("ix_fishbuyertransaction_user_id_date", "user_id", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    buyer_id: int = Field(foreign_key="fishbuyer.id")
+    buyer_id: int = Field(foreign_key="fishbuyer.id", index=True)
     date: datetime
     amount: float
     transaction_type: str = Field(description="payment (buyer pays money), due (buyer buys on credit)")
@@ -161,10 +180,12 @@ class FishBuyerTransaction(SQLModel, table=True):
     buyer: Optional[FishBuyer] = Relationship(back_populates="transactions")
 
 class FishSale(SQLModel, table=True):
+    __table_args__ = (Index("ix_fishsale_user_id_date", "user_id", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     date: datetime
     buyer_name: Optional[str] = None # Legacy/Fallback
-    buyer_id: Optional[int] = Field(default=None, foreign_key="fishbuyer.id", nullable=True)
+    buyer_id: Optional[int] = Field(default=None, foreign_key="fishbuyer.id", index=True, nullable=True)
     sale_type: str = Field(default="detailed")  # 'simple' or 'detailed'
     payment_status: str = Field(default="paid") # 'paid', 'due', 'partial'
     total_amount: float
@@ -179,11 +200,11 @@ class FishSale(SQLModel, table=True):
 
 class FishSaleItem(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    sale_id: int = Field(foreign_key="fishsale.id")
-    pond_id: Optional[int] = Field(default=None, foreign_key="pond.id", nullable=True) # Optional pond
-    fish_id: Optional[int] = Field(default=None, foreign_key="fish.id", nullable=True) # Link to Fish
+    sale_id: int = Field(foreign_key="fishsale.id", index=True)
+    pond_id: Optional[int] = Field(default=None, foreign_key="pond.id", index=True, nullable=True) # Optional pond
+    fish_id: Optional[int] = Field(default=None, foreign_key="fish.id", index=True, nullable=True) # Link to Fish
     quantity: float  # Changed from weight_kg to quantity
-    unit_id: int = Field(foreign_key="unit.id")  # Reference to Unit
+    unit_id: int = Field(foreign_key="unit.id", index=True)  # Reference to Unit
     rate_per_unit: float  # Changed from rate_per_kg
     amount: float
     
@@ -192,3 +213,23 @@ class FishSaleItem(SQLModel, table=True):
     pond: Optional[Pond] = Relationship(back_populates="sale_items")
     unit: Optional[Unit] = Relationship(back_populates="sale_items")
     fish: Optional[Fish] = Relationship(back_populates="sale_items")
+
+class FishSaleDaily(SQLModel, table=True):
+    """Daily rollup of sale items per pond/fish/unit, maintained by app.rollups"""
+    __table_args__ = (
+        # One row per bucket; pond and fish are optional, and NULLs never collide in a unique index.
+        # Its (user_id, day) prefix also serves the per-user day range scans
+        Index("ux_fishsaledaily_bucket", "user_id", "day", text("coalesce(pond_id, 0)"),
+              text("coalesce(fish_id, 0)"), "unit_id", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    day: date  # Local (Asia/Dhaka) calendar day of the sale
+    pond_id: Optional[int] = Field(default=None, foreign_key="pond.id", index=True, nullable=True)
+    fish_id: Optional[int] = Field(default=None, foreign_key="fish.id", index=True, nullable=True)
+    unit_id: int = Field(foreign_key="unit.id", index=True)
+    quantity: float = 0.0
+    amount: float = 0.0
+    sale_count: int = 0  # Distinct sales contributing to this bucket
+    item_count: int = 0
@@ -1,6 +1,6 @@
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, SQLModel, Relationship, Index
 
 if TYPE_CHECKING:
     from .user import User
@@ -11,7 +11,7 @@ class Person(SQLModel, table=True):
     phone: Optional[str] = Field(default=None)
     designation: Optional[str] = Field(default=None)
     is_active: bool = Field(default=True)
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
     
     user: Optional["User"] = Relationship(back_populates="persons")
     incomes: List["Income"] = Relationship(back_populates="person")
@@ -23,15 +23,17 @@ class Organization(SQLModel, table=True):
     contact_person: Optional[str] = Field(default=None)
     phone: Optional[str] = Field(default=None)
     is_active: bool = Field(default=True)
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
     
     user: Optional["User"] = Relationship(back_populates="organizations")
     incomes: List["Income"] = Relationship(back_populates="organization")
 
 class Income(SQLModel, table=True):
+    __table_args__ = (Index("ix_income_user_id_date", "user_id", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    person_id: int = Field(foreign_key="person.id")
-    organization_id: int = Field(foreign_key="organization.id")
+    person_id: int = Field(foreign_key="person.id", index=True)
+    organization_id: int = Field(foreign_key="organization.id", index=True)
     amount: float
     date: datetime = Field(default_factory=datetime.utcnow)
     income_type: str = Field(default="SALARY")  # SALARY, BONUS, COMMISSION, ALLOWANCE, OTHER
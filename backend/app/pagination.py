@@ -0,0 +1,78 @@
+"""
+Keyset (cursor) pagination for list endpoints
+
+Lists are ordered newest first by (date, id). A page ends with the last
+row's (date, id) encoded as an opaque cursor; the next page continues
+strictly after it, so every page costs one index range scan no matter how
+deep into the history it is, unlike OFFSET which reads and discards every
+earlier row.
+
+List bodies stay plain JSON arrays. The cursor of the next page travels in
+the X-Next-Cursor response header and is omitted on the last page.
+Without `limit` an endpoint returns the whole filtered list as before.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Query, Response
+from sqlmodel import Session, or_, and_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(date: datetime, row_id: int) -> str:
+    raw = f"{date.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_str, row_id = base64.urlsafe_b64decode(padded.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(date_str), int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class PageParams:
+    """Query parameters shared by every paginated list endpoint"""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full list"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def paginate(session: Session, query, model, page: PageParams, response: Response):
+    """
+    Order `query` newest first by (model.date, model.id), apply the page's
+    cursor and limit, and set X-Next-Cursor when more rows follow.
+    `query` may select extra columns after the model (e.g. joined names).
+    Returns the rows of this page.
+    """
+    query = query.order_by(model.date.desc(), model.id.desc())
+
+    if page.cursor:
+        cursor_date, cursor_id = decode_cursor(page.cursor)
+        query = query.where(or_(
+            model.date < cursor_date,
+            and_(model.date == cursor_date, model.id < cursor_id)
+        ))
+
+    if page.limit is None:
+        return session.exec(query).all()
+
+    rows = session.exec(query.limit(page.limit + 1)).all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        if not isinstance(last, model):
+            last = last[0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.date, last.id)
+    return rows
@@ -0,0 +1,260 @@
+"""
+Versioned response cache for the dashboard and stats endpoints
+
+Responses are cached under (user, endpoint, normalized params, data version).
+Every user has a data version counter that is bumped after each committed
+write made on their behalf, so a response is never served once the data
+behind it has changed; superseded entries are simply never looked up again
+and age out of the store.
+
+Writes are detected on the session rather than in each router: every flush
+and ORM bulk insert/update/delete records the tables it touched, and the
+commit bumps the version of the user that get_current_user recorded in
+session.info, plus that user's version of each written table (used for
+ETags, see app.conditional). Commits without a user (CLI repairs, imports)
+bump a global version that is part of every key.
+
+Backends, chosen by RESPONSE_CACHE_URL:
+- MemoryBackend (the default, or memory://): an LRU TTLCache with version
+  counters in the worker's own memory. A write on one worker would not
+  invalidate the others, so it is only used with a single worker
+  (WEB_CONCURRENCY unset or 1). With more workers and no shared store,
+  caching is off; asking for memory:// explicitly is an error.
+- KeyValueBackend: any shared store with get/set(ex=)/incr, e.g. Redis via
+  RESPONSE_CACHE_URL=redis://... (needs the redis package). Versions are
+  shared, so invalidation is exact across workers.
+
+RESPONSE_CACHE_TTL=0 turns caching off as well.
+"""
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.cache import TTLCache
+
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "2048"))
+RESPONSE_CACHE_URL = os.environ.get("RESPONSE_CACHE_URL")
+MEMORY_URL = "memory://"
+# Worker count as uvicorn and gunicorn read it
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+GLOBAL_SCOPE = "all"
+_MISSING = object()
+
+
+class MemoryBackend:
+    """Per-worker LRU of responses plus per-worker version counters"""
+    in_process = True
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl, name="responses")
+        # Never evicted: a version that went back to 0 could revive old entries
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        return self.entries.get(key, _MISSING)
+
+    def set(self, key: str, value: Any):
+        self.entries.set(key, value)
+
+    def version(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    def versions(self, scopes: List[str]) -> List[int]:
+        return [self._versions.get(scope, 0) for scope in scopes]
+
+    def bump(self, scope: str):
+        with self._lock:
+            self._versions[scope] = self._versions.get(scope, 0) + 1
+
+
+class KeyValueBackend:
+    """Shared-store adapter; `client` needs get(key), set(key, value, ex=seconds) and incr(key)"""
+    in_process = False
+
+    def __init__(self, client, ttl: float = RESPONSE_CACHE_TTL, prefix: str = "response-cache:"):
+        self.client = client
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.prefix + key)
+        return _MISSING if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any):
+        self.client.set(self.prefix + key, json.dumps(jsonable_encoder(value)), ex=self.ttl)
+
+    def version(self, scope: str) -> int:
+        return int(self.client.get(f"{self.prefix}version:{scope}") or 0)
+
+    def versions(self, scopes: List[str]) -> List[int]:
+        keys = [f"{self.prefix}version:{scope}" for scope in scopes]
+        if hasattr(self.client, "mget"):
+            values = self.client.mget(keys)
+        else:
+            values = [self.client.get(key) for key in keys]
+        return [int(value or 0) for value in values]
+
+    def bump(self, scope: str):
+        self.client.incr(f"{self.prefix}version:{scope}")
+
+
+def _default_backend():
+    if RESPONSE_CACHE_TTL <= 0:
+        return None
+    if RESPONSE_CACHE_URL and RESPONSE_CACHE_URL != MEMORY_URL:
+        import redis
+        return KeyValueBackend(redis.Redis.from_url(RESPONSE_CACHE_URL))
+    if WEB_CONCURRENCY > 1:
+        if RESPONSE_CACHE_URL == MEMORY_URL:
+            raise RuntimeError(
+                f"RESPONSE_CACHE_URL={MEMORY_URL} keeps versions per worker and would serve stale "
+                f"responses with WEB_CONCURRENCY={WEB_CONCURRENCY}; configure a shared store (redis://...)"
+            )
+        # Per-worker caches would go stale; cache only once a shared store is configured
+        return None
+    return MemoryBackend()
+
+
+backend = _default_backend()
+
+
+def set_backend(new_backend):
+    """Swap the backend (None disables caching); used by tests and custom deployments"""
+    global backend
+    backend = new_backend
+
+
+def bump_version(user_id: Optional[int] = None, tables: Iterable[str] = ()):
+    """Invalidate one user's cached responses and table versions, or everyone's without a user"""
+    if backend is None:
+        return
+    if user_id is None:
+        backend.bump(GLOBAL_SCOPE)
+        return
+    backend.bump(str(user_id))
+    for table in tables:
+        backend.bump(table_scope(user_id, table))
+
+
+def table_scope(user_id: int, table: str) -> str:
+    return f"{user_id}:{table}"
+
+
+# --- Write detection ---
+
+def _written_tables(session) -> set:
+    return session.info.setdefault("written_tables", set())
+
+
+def mark_written(session, *tables: str):
+    """Record writes the session cannot see itself, e.g. a COPY on the raw connection"""
+    _written_tables(session).update(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session, flush_context):
+    # Still the pre-flush collections at this point
+    tables = _written_tables(session)
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        tables.add(type(obj).__table__.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _written_tables(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+
+def bump_written(session):
+    """Bump the versions of everything the session wrote since the last bump"""
+    tables = session.info.pop("written_tables", None)
+    if tables:
+        bump_version(session.info.get("user_id"), tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session):
+    # Rolled back writes keep their tables; an extra bump only costs a cache miss.
+    # A session inside an outer transaction (POST /batch) only released a
+    # savepoint; its owner calls bump_written once the real commit is done.
+    if not session.info.get("outer_transaction"):
+        bump_written(session)
+
+
+# --- Endpoint decorator ---
+
+def _normalized_params(kwargs: Dict[str, Any]) -> str:
+    params = {}
+    for name, value in kwargs.items():
+        if isinstance(value, (datetime, date)):
+            params[name] = value.isoformat()
+        elif value is None or isinstance(value, (str, int, float, bool)):
+            params[name] = value
+    return json.dumps(params, sort_keys=True)
+
+
+def _cache_key(endpoint: str, kwargs: Dict[str, Any]) -> Optional[str]:
+    user = kwargs.get("current_user")
+    if backend is None or user is None:
+        return None
+    user_id = str(user.id)
+    # "Today" and "this month" move with the clock, so the date is part of the key
+    clock = f"{date.today()}/{datetime.utcnow().date()}"
+    digest = hashlib.sha1(_normalized_params(kwargs).encode()).hexdigest()
+    return f"{user_id}:{endpoint}:{backend.version(GLOBAL_SCOPE)}.{backend.version(user_id)}:{clock}:{digest}"
+
+
+def _lookup(endpoint: str, kwargs: Dict[str, Any]):
+    key = _cache_key(endpoint, kwargs)
+    return key, (backend.get(key) if key is not None else _MISSING)
+
+
+def cached_response(endpoint: str):
+    """
+    Serve the decorated endpoint from the response cache. The endpoint must
+    take `current_user` and return plain JSON-compatible data.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(**kwargs):
+                if backend is not None and not backend.in_process:
+                    key, value = await run_in_threadpool(_lookup, endpoint, kwargs)
+                else:
+                    key, value = _lookup(endpoint, kwargs)
+                if value is not _MISSING:
+                    return value
+                value = await func(**kwargs)
+                if key is not None:
+                    if backend.in_process:
+                        backend.set(key, value)
+                    else:
+                        await run_in_threadpool(backend.set, key, value)
+                return value
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            key, value = _lookup(endpoint, kwargs)
+            if value is not _MISSING:
+                return value
+            value = func(**kwargs)
+            if key is not None:
+                backend.set(key, value)
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,268 @@
+"""
+Daily fish sales rollup (FishSaleDaily)
+
+The fish sale routers apply every change to the rollup inside the same
+transaction as the sale itself, so dashboards can aggregate over days
+instead of individual sale items.
+
+Rebuild after imports or to repair drift: python -m app.rollups [--user-id N]
+"""
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Iterable, Optional
+
+import pytz
+from sqlalchemy import insert, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select, func, delete, update
+
+from app.timezone_config import TIMEZONE
+from app.models.fish_farming import FishSale, FishSaleItem, FishSaleDaily
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def local_day(dt: datetime) -> date:
+    """Local calendar day of a stored sale date (naive values are UTC)"""
+    if dt.tzinfo is None:
+        dt = pytz.utc.localize(dt)
+    return dt.astimezone(TIMEZONE).date()
+
+
+def _bucket_key():
+    """The expressions of the unique bucket index, usable as an ON CONFLICT target"""
+    zero = literal_column("0")  # Inlined so the expressions match the index definition
+    return [
+        FishSaleDaily.user_id,
+        FishSaleDaily.day,
+        func.coalesce(FishSaleDaily.pond_id, zero),
+        func.coalesce(FishSaleDaily.fish_id, zero),
+        FishSaleDaily.unit_id,
+    ]
+
+
+def _upsert(session: Session):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(FishSaleDaily)
+    if dialect == "sqlite":
+        return sqlite.insert(FishSaleDaily)
+    raise NotImplementedError(f"No upsert for {dialect}")
+
+
+def apply_sale(session: Session, user_id: int, sale_date: datetime, items: Iterable, sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) one sale's items from the rollup.
+    Items only need pond_id, fish_id, unit_id, quantity and amount.
+    Does not commit; the caller's transaction covers the rollup too.
+    """
+    buckets = defaultdict(lambda: [0.0, 0.0, 0])
+    for item in items:
+        bucket = buckets[(item.pond_id, item.fish_id, item.unit_id)]
+        bucket[0] += item.quantity or 0
+        bucket[1] += item.amount or 0
+        bucket[2] += 1
+    if not buckets:
+        return
+
+    day = local_day(sale_date)
+    key = _bucket_key()
+    for (pond_id, fish_id, unit_id), (quantity, amount, item_count) in buckets.items():
+        if sign > 0:
+            # Insert or increment in one statement, so concurrent sales on a
+            # new bucket can neither duplicate it nor lose an update
+            stmt = _upsert(session).values(
+                user_id=user_id,
+                day=day,
+                pond_id=pond_id,
+                fish_id=fish_id,
+                unit_id=unit_id,
+                quantity=quantity,
+                amount=amount,
+                sale_count=1,
+                item_count=item_count
+            )
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=key,
+                set_={
+                    "quantity": FishSaleDaily.quantity + stmt.excluded.quantity,
+                    "amount": FishSaleDaily.amount + stmt.excluded.amount,
+                    "sale_count": FishSaleDaily.sale_count + stmt.excluded.sale_count,
+                    "item_count": FishSaleDaily.item_count + stmt.excluded.item_count
+                }
+            ))
+            continue
+
+        # A missing bucket matches nothing; a rebuild will reconcile
+        bucket = [
+            column == value
+            for column, value in zip(key, (user_id, day, pond_id or 0, fish_id or 0, unit_id))
+        ]
+        session.exec(
+            update(FishSaleDaily)
+            .where(*bucket)
+            .values(
+                quantity=FishSaleDaily.quantity - quantity,
+                amount=FishSaleDaily.amount - amount,
+                sale_count=FishSaleDaily.sale_count - 1,
+                item_count=FishSaleDaily.item_count - item_count
+            )
+        )
+        session.exec(delete(FishSaleDaily).where(*bucket).where(FishSaleDaily.sale_count <= 0))
+    session.flush()
+
+
+def remove_pond(session: Session, pond_id: int):
+    """Drop rollup rows of a pond whose sale items are being deleted with it"""
+    session.exec(delete(FishSaleDaily).where(FishSaleDaily.pond_id == pond_id))
+
+
+def remove_fish(session: Session, user_id: int, fish_id: int):
+    """
+    Fold the rollup rows of a fish that is being deleted into the no-fish
+    buckets, as its sale items stay behind without a fish. Does not commit.
+    """
+    session.exec(update(FishSaleItem).where(FishSaleItem.fish_id == fish_id).values(fish_id=None))
+    # Merged buckets may share sales, so they are recounted rather than added up
+    rebuild(session, user_id, commit=False)
+
+
+def _as_local(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        dt = pytz.utc.localize(dt)
+    return dt.astimezone(TIMEZONE).replace(tzinfo=None)
+
+
+def day_window(start: Optional[datetime], end: Optional[datetime]):
+    """
+    Translate a datetime filter into a whole-day window, or None when a bound
+    falls inside a day and only the raw sale items can answer it exactly.
+    """
+    first_day = last_day = None
+    if start is not None:
+        local_start = _as_local(start)
+        if local_start.time() != time.min:
+            return None
+        first_day = local_start.date()
+    if end is not None:
+        local_end = _as_local(end)
+        # Raw filters include `end` itself, so only an end-of-day bound maps to whole days
+        if local_end.time() < time(23, 59, 59):
+            return None
+        last_day = local_end.date()
+    return first_day, last_day
+
+
+def sales_facts(user_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    Subquery of sales facts (pond_id, fish_id, unit_id, quantity, amount,
+    sale_count, item_count) for a user and date filter. Served from the
+    daily rollup when the filter covers whole local days, otherwise
+    aggregated from the raw sale items.
+    """
+    window = day_window(start, end)
+    if window is not None:
+        first_day, last_day = window
+        query = select(
+            FishSaleDaily.pond_id,
+            FishSaleDaily.fish_id,
+            FishSaleDaily.unit_id,
+            FishSaleDaily.quantity,
+            FishSaleDaily.amount,
+            FishSaleDaily.sale_count,
+            FishSaleDaily.item_count
+        ).where(FishSaleDaily.user_id == user_id)
+        if first_day:
+            query = query.where(FishSaleDaily.day >= first_day)
+        if last_day:
+            query = query.where(FishSaleDaily.day <= last_day)
+        return query.subquery("sales_facts")
+
+    query = (
+        select(
+            FishSaleItem.pond_id,
+            FishSaleItem.fish_id,
+            FishSaleItem.unit_id,
+            func.sum(FishSaleItem.quantity).label("quantity"),
+            func.sum(FishSaleItem.amount).label("amount"),
+            func.count(func.distinct(FishSaleItem.sale_id)).label("sale_count"),
+            func.count(FishSaleItem.id).label("item_count")
+        )
+        .join(FishSale, FishSale.id == FishSaleItem.sale_id)
+        .where(FishSale.user_id == user_id)
+    )
+    if start is not None:
+        query = query.where(FishSale.date >= start)
+    if end is not None:
+        query = query.where(FishSale.date <= end)
+    query = query.group_by(FishSaleItem.pond_id, FishSaleItem.fish_id, FishSaleItem.unit_id)
+    return query.subquery("sales_facts")
+
+
+def rebuild(session: Session, user_id: Optional[int] = None, commit: bool = True) -> int:
+    """
+    Recompute the rollup from raw sale items. Returns the number of rows
+    written. With commit=False it joins the caller's transaction instead.
+    """
+    clear = delete(FishSaleDaily)
+    if user_id is not None:
+        clear = clear.where(FishSaleDaily.user_id == user_id)
+    session.exec(clear)
+
+    raw = (
+        select(
+            FishSale.user_id,
+            FishSale.id,
+            FishSale.date,
+            FishSaleItem.pond_id,
+            FishSaleItem.fish_id,
+            FishSaleItem.unit_id,
+            FishSaleItem.quantity,
+            FishSaleItem.amount
+        )
+        .join(FishSaleItem, FishSaleItem.sale_id == FishSale.id)
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    if user_id is not None:
+        raw = raw.where(FishSale.user_id == user_id)
+
+    buckets = defaultdict(lambda: [0.0, 0.0, set(), 0])
+    for owner_id, sale_id, sale_date, pond_id, fish_id, unit_id, quantity, amount in session.exec(raw):
+        bucket = buckets[(owner_id, local_day(sale_date), pond_id, fish_id, unit_id)]
+        bucket[0] += quantity or 0
+        bucket[1] += amount or 0
+        bucket[2].add(sale_id)
+        bucket[3] += 1
+
+    rows = [
+        {
+            "user_id": owner_id,
+            "day": day,
+            "pond_id": pond_id,
+            "fish_id": fish_id,
+            "unit_id": unit_id,
+            "quantity": quantity,
+            "amount": amount,
+            "sale_count": len(sale_ids),
+            "item_count": item_count
+        }
+        for (owner_id, day, pond_id, fish_id, unit_id), (quantity, amount, sale_ids, item_count) in buckets.items()
+    ]
+    for i in range(0, len(rows), REBUILD_BATCH_SIZE):
+        session.execute(insert(FishSaleDaily), rows[i:i + REBUILD_BATCH_SIZE])
+    if commit:
+        session.commit()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description="Rebuild the daily fish sales rollup")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rows")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        count = rebuild(session, args.user_id)
+    print(f"✅ Rebuilt fish sales rollup ({count} rows)")
@@ -1,44 +1,60 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 from app.database import get_session
 from app.models import User
-from app.auth import get_password_hash, verify_password, create_access_token, create_refresh_token, verify_token
+from app.auth import hash_password, verify_and_update_password, create_access_token, create_refresh_token, verify_token, invalidate_user
 from datetime import timedelta
 from pydantic import BaseModel
 
 router = APIRouter(tags=["auth"])
 
+# These handlers are async so that while bcrypt runs on its executor no
+# request thread is held; their database calls go through the threadpool.
+
+def _find_user(session: Session, email: str):
+    return session.exec(select(User).where(User.email == email)).first()
+
+def _save_user(session: Session, user: User):
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
 
 
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 @router.post("/register", response_model=User)
-def register(user: User, session: Session = Depends(get_session)):
-    statement = select(User).where(User.email == user.email)
-    existing_user = session.exec(statement).first()
+async def register(user: User, session: Session = Depends(get_session)):
+    existing_user = await run_in_threadpool(_find_user, session, user.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    user.password_hash = get_password_hash(user.password_hash)
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    user.password_hash = await hash_password(user.password_hash)
+    await run_in_threadpool(_save_user, session, user)
     return user
 
 @router.post("/token")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
-    statement = select(User).where(User.email == form_data.username)
-    user = session.exec(statement).first()
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
+    user = await run_in_threadpool(_find_user, session, form_data.username)
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await verify_and_update_password(form_data.password, user.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Stored hash used a different bcrypt cost; replace it while we have the password
+    if new_hash:
+        user.password_hash = new_hash
+        await run_in_threadpool(_save_user, session, user)
+    
     access_token = create_access_token(data={"sub": user.email})
     refresh_token = create_refresh_token(data={"sub": user.email})
     
@@ -87,21 +103,20 @@ class ForgotPasswordRequest(BaseModel):
     confirm_password: str
 
 @router.post("/forgot-password")
-def forgot_password(request: ForgotPasswordRequest, session: Session = Depends(get_session)):
+async def forgot_password(request: ForgotPasswordRequest, session: Session = Depends(get_session)):
     # Validate passwords match
     if request.new_password != request.confirm_password:
         raise HTTPException(status_code=400, detail="Passwords do not match")
     
     # Find user by email (username field contains email)
-    statement = select(User).where(User.email == request.username)
-    user = session.exec(statement).first()
+    user = await run_in_threadpool(_find_user, session, request.username)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Update password
-    user.password_hash = get_password_hash(request.new_password)
-    session.add(user)
-    session.commit()
+    user.password_hash = await hash_password(request.new_password)
+    await run_in_threadpool(_save_user, session, user)
+    invalidate_user(user.email)
     
     return {"message": "Password has been reset successfully"}
@@ -0,0 +1,161 @@
+"""
+POST /batch: several writes in one round trip and one transaction
+
+Each operation is dispatched through the app as an ordinary request to the
+existing routers, so validation, balances and rollups behave exactly as for
+a standalone call. All operations share one session whose commits only
+release a savepoint of an outer transaction; the batch commits that
+transaction once the last operation succeeds. The first failing operation
+rolls back the whole batch, and its status becomes the batch's status.
+
+The token is verified once for the batch; operations reuse that user.
+"""
+import json
+import logging
+from typing import Any, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import response_cache
+from app.auth import get_current_user
+from app.database import engine, shared_session
+from app.models.user import User
+
+router = APIRouter(tags=["batch"])
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_OPERATIONS = 50
+
+
+class BatchOperation(BaseModel):
+    method: Literal["POST", "PUT", "PATCH", "DELETE"]
+    path: str = Field(pattern="^/")  # e.g. "/fish-sales" or "/fish-buyers/3/transactions?x=1"
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+async def _dispatch(request: Request, operation: BatchOperation):
+    """Run one operation through the app in-process; returns (status, parsed body)"""
+    path, _, query = operation.path.partition("?")
+    body = json.dumps(operation.body).encode() if operation.body is not None else b""
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    authorization = request.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode()))
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": operation.method,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": dict(request.scope.get("state", {})),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status, chunks = 500, []
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # The app has already answered 500; the batch rolls back and carries on reporting
+        logger.exception("Batch operation %s %s failed", operation.method, operation.path)
+        return 500, {"detail": "Internal Server Error"}
+    raw = b"".join(chunks)
+    try:
+        return status, json.loads(raw) if raw else None
+    except ValueError:
+        return status, raw.decode(errors="replace")
+
+
+def _begin(user: User):
+    connection = engine.connect()
+    transaction = connection.begin()
+    if connection.dialect.name == "sqlite":
+        # pysqlite defers BEGIN to the first write, which would turn the
+        # first SAVEPOINT into the outer transaction and RELEASE into COMMIT
+        connection.exec_driver_sql("BEGIN")
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    session.info.update(user_id=user.id, batch_user=user, outer_transaction=True)
+    return connection, transaction, session
+
+
+def _finish(connection, transaction, session, commit: bool):
+    try:
+        if commit:
+            session.commit()  # anything an operation flushed without committing
+            transaction.commit()
+            response_cache.bump_written(session)
+        else:
+            session.rollback()
+            transaction.rollback()
+    finally:
+        session.close()
+        connection.close()
+
+
+@router.post("/batch")
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Run create/update/delete operations against the other endpoints in
+    order, in one transaction. Returns each operation's status and body;
+    on the first failure nothing is kept.
+    """
+    for index, operation in enumerate(batch.operations):
+        if operation.path.partition("?")[0].rstrip("/") == "/batch":
+            return JSONResponse(status_code=422, content={"detail": f"Operation {index}: batches cannot be nested"})
+
+    connection, transaction, session = await run_in_threadpool(_begin, current_user)
+    token = shared_session.set(session)
+    results, failed = [], None
+    try:
+        for index, operation in enumerate(batch.operations):
+            status, body = await _dispatch(request, operation)
+            results.append({"status": status, "body": body})
+            if status >= 400:
+                failed = index
+                break
+    except BaseException:
+        shared_session.reset(token)
+        await run_in_threadpool(_finish, connection, transaction, session, False)
+        raise
+    shared_session.reset(token)
+    await run_in_threadpool(_finish, connection, transaction, session, failed is None)
+
+    if failed is not None:
+        return JSONResponse(
+            status_code=results[failed]["status"],
+            content={"committed": False, "failed_operation": failed, "results": results}
+        )
+    return {"committed": True, "results": results}
@@ -1,9 +1,11 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel import Session, select
 from app.database import get_session
 from app.models import ContributorTransaction, Contributor, User
 from app.auth import get_current_user
+from app import balances
+from app.pagination import PageParams, paginate
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -47,6 +49,7 @@ def create_contributor_transaction(
     )
     
     session.add(transaction)
+    balances.apply_entry(session, "contributor", transaction.contributor_id, transaction.type, transaction.amount)
     session.commit()
     session.refresh(transaction)
     return transaction
@@ -67,6 +70,10 @@ def update_contributor_transaction(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
+    # Swap the old entry for the new one on the running balance
+    balances.apply_entry(session, "contributor", transaction.contributor_id, transaction.type, transaction.amount, sign=-1)
+    balances.apply_entry(session, "contributor", transaction.contributor_id, transaction_data.type, transaction_data.amount)
+    
     transaction.amount = transaction_data.amount
     transaction.type = transaction_data.type
     transaction.note = transaction_data.note
@@ -94,16 +101,29 @@ def delete_contributor_transaction(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
+    balances.apply_entry(session, "contributor", transaction.contributor_id, transaction.type, transaction.amount, sign=-1)
     session.delete(transaction)
     session.commit()
     return {"ok": True}
 
 @router.get("/contributor-transactions", response_model=List[ContributorTransaction])
 def read_contributor_transactions(
+    response: Response,
+    contributor_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    page: PageParams = Depends(),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Join with Contributor to ensure we only get transactions for the current user's contributors
     statement = select(ContributorTransaction).join(Contributor).where(Contributor.user_id == current_user.id)
-    transactions = session.exec(statement).all()
-    return transactions
+    
+    if contributor_id:
+        statement = statement.where(ContributorTransaction.contributor_id == contributor_id)
+    if start_date:
+        statement = statement.where(ContributorTransaction.date >= start_date)
+    if end_date:
+        statement = statement.where(ContributorTransaction.date <= end_date)
+    
+    return paginate(session, statement, ContributorTransaction, page, response)
@@ -4,6 +4,7 @@ from sqlmodel import Session, select
 from app.database import get_session
 from app.models import Contributor, User
 from app.auth import get_current_user
+from app import balances
 
 router = APIRouter(tags=["contributors"])
 
@@ -14,6 +15,7 @@ def create_contributor(
     current_user: User = Depends(get_current_user)
 ):
     contributor.user_id = current_user.id
+    balances.reset_totals(contributor)
     session.add(contributor)
     session.commit()
     session.refresh(contributor)
@@ -4,6 +4,7 @@ from sqlmodel import Session, select
 from app.database import get_session
 from app.models import Creditor, User
 from app.auth import get_current_user
+from app import balances
 
 router = APIRouter(tags=["creditors"])
 
@@ -14,6 +15,7 @@ def create_creditor(
     current_user: User = Depends(get_current_user)
 ):
     creditor.user_id = current_user.id
+    balances.reset_totals(creditor)
     session.add(creditor)
     session.commit()
     session.refresh(creditor)
@@ -1,20 +1,51 @@
 from fastapi import APIRouter, Depends
-from sqlmodel import Session, select, func
-from app.database import get_session
+from sqlmodel import select, func, case, and_
+from app.database import run_queries
 from app.auth import get_current_user
+from app.conditional import conditional_get
+from app.response_cache import cached_response
 from app.models import User
-from app.models.fish_farming import Pond, FishSale, PondFeedPurchase
-from datetime import datetime, timedelta
+from app.models.fish_farming import Pond, FishSale, FishSaleItem, FishSaleDaily, PondFeedPurchase, Unit
+from app import rollups
+from app.aggregates import month_key, last_months, next_month, month_series
+from datetime import datetime
 from typing import List, Dict
 
-router = APIRouter(tags=["dashboard"])
+router = APIRouter(tags=["dashboard"], dependencies=[Depends(conditional_get(
+    Pond, FishSale, FishSaleItem, FishSaleDaily, PondFeedPurchase, Unit
+))])
+
+def _window_totals_query(amount_col, date_col, owner_clause, filter_start, filter_end, month_start):
+    """SUM over the filter window plus SUM since month_start, as one row"""
+    window = []
+    if filter_start:
+        window.append(date_col >= filter_start)
+    if filter_end:
+        window.append(date_col <= filter_end)
+    window_sum = func.sum(case((and_(*window), amount_col))) if window else func.sum(amount_col)
+
+    return select(
+        window_sum,
+        func.sum(case((date_col >= month_start, amount_col)))
+    ).where(owner_clause)
+
+def _monthly_totals_query(amount_col, date_col, owner_clause, start, end):
+    """(YYYY-MM, SUM) rows for [start, end)"""
+    bucket = month_key(date_col)
+    return (
+        select(bucket, func.sum(amount_col))
+        .where(owner_clause)
+        .where(date_col >= start)
+        .where(date_col < end)
+        .group_by(bucket)
+    )
 
 @router.get("/gher/dashboard/stats")
-def get_dashboard_stats(
+@cached_response("gher_dashboard")
+async def get_dashboard_stats(
     start_date: str = None,
     end_date: str = None,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    current_user: User = Depends(get_current_user)
 ):
     """Get comprehensive dashboard statistics for gher management"""
     
@@ -36,146 +67,102 @@ def get_dashboard_stats(
     
     # Get date range for trends (last 6 months or filtered range)
     end_date_calc = filter_end if filter_end else datetime.now()
-    start_date_calc = filter_start if filter_start else end_date_calc - timedelta(days=180)
-    
-    # Total ponds
-    total_ponds = session.exec(
-        select(func.count(Pond.id)).where(Pond.user_id == current_user.id)
-    ).one()
-    
-    # Total sales revenue (filtered or all time)
-    revenue_query = select(func.sum(FishSale.total_amount)).where(FishSale.user_id == current_user.id)
-    if filter_start:
-        revenue_query = revenue_query.where(FishSale.date >= filter_start)
-    if filter_end:
-        revenue_query = revenue_query.where(FishSale.date <= filter_end)
-    total_revenue = session.exec(revenue_query).one() or 0
-    
-    # Total feed expenses (filtered or all time)
-    expenses_query = select(func.sum(PondFeedPurchase.total_amount)).where(PondFeedPurchase.user_id == current_user.id)
-    if filter_start:
-        expenses_query = expenses_query.where(PondFeedPurchase.date >= filter_start)
-    if filter_end:
-        expenses_query = expenses_query.where(PondFeedPurchase.date <= filter_end)
-    total_expenses = session.exec(expenses_query).one() or 0
-    
-    # This month's sales
     month_start = datetime(end_date_calc.year, end_date_calc.month, 1)
-    month_sales = session.exec(
-        select(func.sum(FishSale.total_amount))
-        .where(FishSale.user_id == current_user.id)
-        .where(FishSale.date >= month_start)
-    ).one() or 0
+    trend_months = last_months(end_date_calc, 6)
+    trend_end = next_month(trend_months[-1])
     
-    # This month's expenses
-    month_expenses = session.exec(
-        select(func.sum(PondFeedPurchase.total_amount))
-        .where(PondFeedPurchase.user_id == current_user.id)
-        .where(PondFeedPurchase.date >= month_start)
-    ).one() or 0
+    # Item-level sales facts: daily rollup for whole-day windows, raw items otherwise
+    facts = rollups.sales_facts(current_user.id, filter_start, filter_end)
     
-    # Monthly sales trend (last 6 months)
-    monthly_sales = []
-    for i in range(6):
-        month_date = end_date_calc - timedelta(days=30 * i)
-        month_start = datetime(month_date.year, month_date.month, 1)
-        if month_date.month == 12:
-            month_end = datetime(month_date.year + 1, 1, 1)
-        else:
-            month_end = datetime(month_date.year, month_date.month + 1, 1)
+    # The aggregates are independent of each other, so they are built up front
+    # and run together (concurrently when the async engine is enabled)
+    statements = {
+        # Total ponds
+        "ponds": select(func.count(Pond.id)).where(Pond.user_id == current_user.id),
         
-        sales = session.exec(
-            select(func.sum(FishSale.total_amount))
-            .where(FishSale.user_id == current_user.id)
-            .where(FishSale.date >= month_start)
-            .where(FishSale.date < month_end)
-        ).one() or 0
+        # Sales revenue (filtered or all time) and this month's sales in one pass
+        "sales": _window_totals_query(FishSale.total_amount, FishSale.date, FishSale.user_id == current_user.id,
+                                      filter_start, filter_end, month_start),
         
-        monthly_sales.insert(0, {
-            "month": month_start.strftime("%b %Y"),
-            "amount": float(sales)
-        })
-    
-    # Monthly expenses trend (last 6 months)
-    monthly_expenses = []
-    for i in range(6):
-        month_date = end_date_calc - timedelta(days=30 * i)
-        month_start = datetime(month_date.year, month_date.month, 1)
-        if month_date.month == 12:
-            month_end = datetime(month_date.year + 1, 1, 1)
-        else:
-            month_end = datetime(month_date.year, month_date.month + 1, 1)
+        # Feed expenses (filtered or all time) and this month's expenses in one pass
+        "expenses": _window_totals_query(PondFeedPurchase.total_amount, PondFeedPurchase.date,
+                                         PondFeedPurchase.user_id == current_user.id,
+                                         filter_start, filter_end, month_start),
+        
+        # Monthly sales and expenses trend (last 6 months), one grouped query each
+        "sales_by_month": _monthly_totals_query(FishSale.total_amount, FishSale.date,
+                                                FishSale.user_id == current_user.id,
+                                                trend_months[0], trend_end),
+        "expenses_by_month": _monthly_totals_query(PondFeedPurchase.total_amount, PondFeedPurchase.date,
+                                                   PondFeedPurchase.user_id == current_user.id,
+                                                   trend_months[0], trend_end),
         
-        expenses = session.exec(
-            select(func.sum(PondFeedPurchase.total_amount))
-            .where(PondFeedPurchase.user_id == current_user.id)
-            .where(PondFeedPurchase.date >= month_start)
-            .where(PondFeedPurchase.date < month_end)
-        ).one() or 0
+        # Top performing ponds by sales
+        "top_ponds": (
+            select(
+                Pond.name,
+                func.sum(facts.c.amount).label('total_sales')
+            )
+            .join(facts, facts.c.pond_id == Pond.id)
+            .where(Pond.user_id == current_user.id)
+            .group_by(Pond.id, Pond.name)
+            .order_by(func.sum(facts.c.amount).desc())
+            .limit(5)
+        ),
         
-        monthly_expenses.insert(0, {
-            "month": month_start.strftime("%b %Y"),
-            "amount": float(expenses)
-        })
+        # Pond-wise breakdown with unit details
+        "pond_units": (
+            select(
+                Pond.name.label('pond_name'),
+                Unit.name.label('unit_name'),
+                func.sum(facts.c.quantity).label('total_quantity'),
+                func.sum(facts.c.amount).label('total_amount')
+            )
+            .join(facts, facts.c.pond_id == Pond.id)
+            .join(Unit, Unit.id == facts.c.unit_id)
+            .where(Pond.user_id == current_user.id)
+            .group_by(Pond.id, Pond.name, Unit.id, Unit.name)
+        ),
+        
+        # Recent sales (last 5)
+        "recent_sales": (
+            select(FishSale.id, FishSale.buyer_name, FishSale.total_amount, FishSale.date)
+            .where(FishSale.user_id == current_user.id)
+            .order_by(FishSale.date.desc())
+            .limit(5)
+        ),
+        
+        # Unit-wise sales breakdown
+        "unit_sales": (
+            select(
+                Unit.name,
+                func.sum(facts.c.quantity).label('total_quantity'),
+                func.sum(facts.c.amount).label('total_amount')
+            )
+            .join(facts, facts.c.unit_id == Unit.id)
+            .group_by(Unit.id, Unit.name)
+        ),
+    }
+    results = await run_queries(statements)
     
-    # Top performing ponds by sales
-    from sqlalchemy.orm import selectinload
-    from app.models.fish_farming import FishSaleItem
+    total_ponds = results["ponds"][0][0]
     
-    pond_sales_query = (
-        select(
-            Pond.name,
-            func.sum(FishSaleItem.amount).label('total_sales')
-        )
-        .join(FishSaleItem, FishSaleItem.pond_id == Pond.id)
-        .join(FishSale, FishSale.id == FishSaleItem.sale_id)
-        .where(Pond.user_id == current_user.id)
-    )
+    total_revenue, month_sales = results["sales"][0]
+    total_revenue = total_revenue or 0
+    month_sales = month_sales or 0
     
-    if filter_start:
-        pond_sales_query = pond_sales_query.where(FishSale.date >= filter_start)
-    if filter_end:
-        pond_sales_query = pond_sales_query.where(FishSale.date <= filter_end)
-    
-    pond_sales_query = (
-        pond_sales_query
-        .group_by(Pond.id, Pond.name)
-        .order_by(func.sum(FishSaleItem.amount).desc())
-        .limit(5)
-    )
+    total_expenses, month_expenses = results["expenses"][0]
+    total_expenses = total_expenses or 0
+    month_expenses = month_expenses or 0
     
-    pond_sales = session.exec(pond_sales_query).all()
+    monthly_sales = month_series(dict(results["sales_by_month"]), trend_months)
+    monthly_expenses = month_series(dict(results["expenses_by_month"]), trend_months)
     
     top_ponds = [
         {"name": name, "sales": float(sales)}
-        for name, sales in pond_sales
+        for name, sales in results["top_ponds"]
     ]
     
-    # Pond-wise breakdown with unit details
-    from app.models.fish_farming import Unit
-    
-    pond_unit_query = (
-        select(
-            Pond.name.label('pond_name'),
-            Unit.name.label('unit_name'),
-            func.sum(FishSaleItem.quantity).label('total_quantity'),
-            func.sum(FishSaleItem.amount).label('total_amount')
-        )
-        .join(FishSaleItem, FishSaleItem.pond_id == Pond.id)
-        .join(Unit, Unit.id == FishSaleItem.unit_id)
-        .join(FishSale, FishSale.id == FishSaleItem.sale_id)
-        .where(Pond.user_id == current_user.id)
-    )
-    
-    if filter_start:
-        pond_unit_query = pond_unit_query.where(FishSale.date >= filter_start)
-    if filter_end:
-        pond_unit_query = pond_unit_query.where(FishSale.date <= filter_end)
-    
-    pond_unit_query = pond_unit_query.group_by(Pond.id, Pond.name, Unit.id, Unit.name)
-    
-    pond_unit_data = session.exec(pond_unit_query).all()
-    
     pond_unit_breakdown = [
         {
             "pond_name": pond_name,
@@ -183,58 +170,27 @@ def get_dashboard_stats(
             "quantity": float(quantity),
             "amount": float(amount)
         }
-        for pond_name, unit_name, quantity, amount in pond_unit_data
+        for pond_name, unit_name, quantity, amount in results["pond_units"]
     ]
     
-    # Recent sales (last 5)
-    recent_sales = session.exec(
-        select(FishSale)
-        .where(FishSale.user_id == current_user.id)
-        .order_by(FishSale.date.desc())
-        .limit(5)
-    ).all()
-    
     recent_activities = [
         {
-            "id": sale.id,
+            "id": sale_id,
             "type": "sale",
-            "description": f"Sale to {sale.buyer_name or 'Customer'}",
-            "amount": float(sale.total_amount),
-            "date": sale.date.isoformat()
+            "description": f"Sale to {buyer_name or 'Customer'}",
+            "amount": float(amount),
+            "date": sale_date.isoformat()
         }
-        for sale in recent_sales
+        for sale_id, buyer_name, amount, sale_date in results["recent_sales"]
     ]
     
-    # Unit-wise sales breakdown
-    from app.models.fish_farming import Unit
-    
-    unit_sales_query = (
-        select(
-            Unit.name,
-            func.sum(FishSaleItem.quantity).label('total_quantity'),
-            func.sum(FishSaleItem.amount).label('total_amount')
-        )
-        .join(FishSaleItem, FishSaleItem.unit_id == Unit.id)
-        .join(FishSale, FishSale.id == FishSaleItem.sale_id)
-        .where(FishSale.user_id == current_user.id)
-    )
-    
-    if filter_start:
-        unit_sales_query = unit_sales_query.where(FishSale.date >= filter_start)
-    if filter_end:
-        unit_sales_query = unit_sales_query.where(FishSale.date <= filter_end)
-    
-    unit_sales_query = unit_sales_query.group_by(Unit.id, Unit.name)
-    
-    unit_sales_data = session.exec(unit_sales_query).all()
-    
     unit_wise_sales = [
         {
             "unit_name": name,
             "quantity": float(quantity),
             "amount": float(amount)
         }
-        for name, quantity, amount in unit_sales_data
+        for name, quantity, amount in results["unit_sales"]
     ]
     
     return {
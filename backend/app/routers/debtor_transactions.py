@@ -1,9 +1,11 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel import Session, select
 from app.database import get_session
 from app.models import DebtorTransaction, Debtor, User
 from app.auth import get_current_user
+from app import balances
+from app.pagination import PageParams, paginate
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -47,6 +49,7 @@ def create_debtor_transaction(
     )
     
     session.add(transaction)
+    balances.apply_entry(session, "debtor", transaction.debtor_id, transaction.type, transaction.amount)
     session.commit()
     session.refresh(transaction)
     return transaction
@@ -67,6 +70,10 @@ def update_debtor_transaction(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
+    # Swap the old entry for the new one on the running balance
+    balances.apply_entry(session, "debtor", transaction.debtor_id, transaction.type, transaction.amount, sign=-1)
+    balances.apply_entry(session, "debtor", transaction.debtor_id, transaction_data.type, transaction_data.amount)
+    
     transaction.amount = transaction_data.amount
     transaction.type = transaction_data.type
     transaction.note = transaction_data.note
@@ -94,16 +101,29 @@ def delete_debtor_transaction(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
+    balances.apply_entry(session, "debtor", transaction.debtor_id, transaction.type, transaction.amount, sign=-1)
     session.delete(transaction)
     session.commit()
     return {"ok": True}
 
 @router.get("/debtor-transactions", response_model=List[DebtorTransaction])
 def read_debtor_transactions(
+    response: Response,
+    debtor_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    page: PageParams = Depends(),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     # Join with Debtor to ensure we only get transactions for the current user's debtors
     statement = select(DebtorTransaction).join(Debtor).where(Debtor.user_id == current_user.id)
-    transactions = session.exec(statement).all()
-    return transactions
+    
+    if debtor_id:
+        statement = statement.where(DebtorTransaction.debtor_id == debtor_id)
+    if start_date:
+        statement = statement.where(DebtorTransaction.date >= start_date)
+    if end_date:
+        statement = statement.where(DebtorTransaction.date <= end_date)
+    
+    return paginate(session, statement, DebtorTransaction, page, response)
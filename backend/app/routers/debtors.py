@@ -4,6 +4,7 @@ from sqlmodel import Session, select
 from app.database import get_session
 from app.models import Debtor, User
 from app.auth import get_current_user
+from app import balances
 
 router = APIRouter(tags=["debtors"])
 
@@ -14,6 +15,7 @@ def create_debtor(
     current_user: User = Depends(get_current_user)
 ):
     debtor.user_id = current_user.id
+    balances.reset_totals(debtor)
     session.add(debtor)
     session.commit()
     session.refresh(debtor)
@@ -1,13 +1,17 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel import Session, select, func, and_
 from datetime import datetime
 from pydantic import BaseModel
 
 from app.database import get_session
 from app.auth import get_current_user
+from app.response_cache import cached_response
 from app.models.user import User
 from app.models.expense import Expense, ExpenseType
+from app.pagination import PageParams, paginate, MAX_PAGE_SIZE
+from app.aggregates import month_key, month_starts
+from app.timezone_config import to_naive_utc
 
 router = APIRouter(tags=["expenses"])
 
@@ -92,8 +96,10 @@ def create_expense(
 
 @router.get("/expenses", response_model=List[Expense])
 def read_expenses(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Use cursor instead"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     current_user: User = Depends(get_current_user),
@@ -105,9 +111,10 @@ def read_expenses(
         query = query.where(Expense.date >= start_date)
     if end_date:
         query = query.where(Expense.date <= end_date)
+    if skip:
+        query = query.offset(skip)
         
-    query = query.offset(skip).limit(limit).order_by(Expense.date.desc())
-    return session.exec(query).all()
+    return paginate(session, query, Expense, PageParams(limit=limit, cursor=cursor), response)
 
 @router.put("/expenses/{expense_id}", response_model=Expense)
 def update_expense(
@@ -149,64 +156,78 @@ def delete_expense(
     return {"ok": True}
 
 @router.get("/expenses/stats/overview")
+@cached_response("expense_overview")
 def get_expense_stats(
     year: Optional[int] = Query(None),
+    start_date: Optional[datetime] = Query(None, description="Window start; overrides year"),
+    end_date: Optional[datetime] = Query(None, description="Window end; overrides year"),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     now = datetime.utcnow()
-    target_year = year if year else now.year
     
-    # Fetch all user expenses for the target year
-    # Note: In a real app, we should filter in the DB query for efficiency.
-    # Here we filter in python for simplicity as we already have logic.
-    # Better: Filter by date range in SQL.
-    start_date = datetime(target_year, 1, 1)
-    end_date = datetime(target_year, 12, 31, 23, 59, 59)
+    if start_date or end_date:
+        # Arbitrary window, possibly spanning several years; dates are stored as naive UTC
+        window_end = to_naive_utc(end_date or now)
+        window_start = to_naive_utc(start_date or datetime(window_end.year, 1, 1))
+        months = month_starts(window_start, window_end) if window_start <= window_end else []
+        elapsed = [m for m in months if m <= now]
+        months_count = len(elapsed) or 1
+        label_format = "%b" if window_start.year == window_end.year else "%b %Y"
+    else:
+        target_year = year if year else now.year
+        window_start = datetime(target_year, 1, 1)
+        window_end = datetime(target_year, 12, 31, 23, 59, 59)
+        months = month_starts(window_start, window_end)
+        label_format = "%b"
+        
+        # Avg Monthly Spend
+        if target_year < now.year:
+            months_count = 12
+        elif target_year == now.year:
+            months_count = now.month or 1 # Avoid 0
+        else:
+            months_count = 1 # Future year
     
-    query = select(Expense).where(
+    in_window = (
         Expense.user_id == current_user.id,
-        Expense.date >= start_date,
-        Expense.date <= end_date
+        Expense.date >= window_start,
+        Expense.date <= window_end
     )
-    expenses = session.exec(query).all()
     
-    # Calculate Totals
-    total_spent_year = sum(e.amount for e in expenses)
+    # Monthly Trend (for Bar Chart)
+    bucket = month_key(Expense.date)
+    monthly_totals = dict(session.exec(
+        select(bucket, func.sum(Expense.amount)).where(*in_window).group_by(bucket)
+    ).all())
     
-    # Avg Monthly Spend
-    if target_year < now.year:
-        months_count = 12
-    elif target_year == now.year:
-        months_count = now.month or 1 # Avoid 0
-    else:
-        months_count = 1 # Future year
-        
-    avg_monthly_spend = total_spent_year / months_count if months_count > 0 else 0
+    bar_chart_data = [
+        {"name": m.strftime(label_format), "amount": float(monthly_totals.get(m.strftime("%Y-%m"), 0) or 0)}
+        for m in months
+    ]
     
     # Category Breakdown (for Pie Chart)
-    types_query = select(ExpenseType).where(ExpenseType.user_id == current_user.id)
-    expense_types = {t.id: t.name for t in session.exec(types_query).all()}
+    # Types the user does not own count as uncategorized, same as a missing type
+    type_name = func.coalesce(ExpenseType.name, "Uncategorized")
+    category_totals = session.exec(
+        select(type_name, func.sum(Expense.amount))
+        .outerjoin(ExpenseType, and_(
+            ExpenseType.id == Expense.expense_type_id,
+            ExpenseType.user_id == current_user.id
+        ))
+        .where(*in_window)
+        .group_by(type_name)
+        .order_by(func.sum(Expense.amount).desc())
+    ).all()
     
-    category_stats = {}
-    for e in expenses:
-        type_name = expense_types.get(e.expense_type_id, "Uncategorized")
-        category_stats[type_name] = category_stats.get(type_name, 0) + e.amount
-        
-    pie_chart_data = [{"name": k, "value": v} for k, v in category_stats.items()]
+    pie_chart_data = [{"name": name, "value": float(value or 0)} for name, value in category_totals]
     
-    # Monthly Trend (for Bar Chart)
-    monthly_trend = {i: 0 for i in range(1, 13)}
-    for e in expenses:
-        monthly_trend[e.date.month] += e.amount
-            
-    bar_chart_data = [
-        {"name": datetime(2000, m, 1).strftime("%b"), "amount": amount} # Year 2000 is arbitrary for month name
-        for m, amount in monthly_trend.items()
-    ]
+    # Calculate Totals
+    total_spent_year = sum(item["amount"] for item in bar_chart_data)
+    avg_monthly_spend = total_spent_year / months_count if months_count > 0 else 0
     
     # Max Monthly Spend
-    max_monthly_spend = max(monthly_trend.values()) if monthly_trend else 0
+    max_monthly_spend = max((item["amount"] for item in bar_chart_data), default=0)
     
     return {
         "total_spent_year": total_spent_year,
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.auth import get_current_user
+from app.models.user import User
+from app import exports
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+@router.get("/{ledger}")
+def export_ledger(
+    ledger: str,
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream a whole ledger as CSV or NDJSON, oldest first. Gzip-compressed
+    when the client sends Accept-Encoding: gzip.
+    """
+    if ledger not in exports.LEDGERS:
+        raise HTTPException(status_code=404, detail=f"Unknown ledger; one of: {', '.join(exports.LEDGERS)}")
+
+    query = exports.ledger_query(ledger, current_user.id, start_date, end_date)
+    body = exports.ENCODERS[format](exports.iter_batches(query))
+    headers = {
+        "Content-Disposition": f'attachment; filename="{ledger}.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body = exports.gzipped(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=exports.FORMATS[format], headers=headers)
@@ -1,10 +1,11 @@
 from typing import List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 from app.database import get_session
 from app.auth import get_current_user
 from app.models.user import User
 from app.models.fish_farming import PondFeedUsage, Pond, FishFeed, Unit
+from app.pagination import PageParams, paginate
 
 router = APIRouter(tags=["feed_usage"], prefix="/feed-usage")
 
@@ -44,15 +45,24 @@ def create_feed_usage(
 
 @router.get("", response_model=List[Any])
 def read_feed_usages(
+    response: Response,
     pond_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     from datetime import datetime
     
-    query = select(PondFeedUsage).where(PondFeedUsage.user_id == current_user.id)
+    # Related names come from the same joined select instead of per-row lazy loads
+    query = (
+        select(PondFeedUsage, FishFeed.name, FishFeed.brand, Pond.name, Unit.name)
+        .outerjoin(FishFeed, FishFeed.id == PondFeedUsage.feed_id)
+        .outerjoin(Pond, Pond.id == PondFeedUsage.pond_id)
+        .outerjoin(Unit, Unit.id == PondFeedUsage.unit_id)
+        .where(PondFeedUsage.user_id == current_user.id)
+    )
     
     if pond_id:
         query = query.where(PondFeedUsage.pond_id == pond_id)
@@ -71,22 +81,20 @@ def read_feed_usages(
         except ValueError:
             pass
     
-    # Sort by date descending
-    query = query.order_by(PondFeedUsage.date.desc())
-    
-    usages = session.exec(query).all()
+    # Newest first, one page at a time when a limit is given
+    usages = paginate(session, query, PondFeedUsage, page, response)
     
     # Return enriched data
     result = []
-    for u in usages:
+    for u, feed_name, feed_brand, pond_name, unit_name in usages:
         u_dict = u.model_dump()
-        if u.feed:
-             u_dict['feed_name'] = u.feed.name
-             u_dict['feed_brand'] = u.feed.brand
-        if u.pond:
-             u_dict['pond_name'] = u.pond.name
-        if u.unit:
-             u_dict['unit_name'] = u.unit.name
+        if feed_name is not None:
+             u_dict['feed_name'] = feed_name
+             u_dict['feed_brand'] = feed_brand
+        if pond_name is not None:
+             u_dict['pond_name'] = pond_name
+        if unit_name is not None:
+             u_dict['unit_name'] = unit_name
         result.append(u_dict)
         
     return result
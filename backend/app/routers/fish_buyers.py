@@ -6,6 +6,7 @@ from datetime import datetime
 from ..database import get_session
 from ..auth import get_current_user
 from ..models import FishBuyer, FishSale, FishBuyerTransaction, User
+from .. import balances
 
 router = APIRouter(
     prefix="/fish-buyers",
@@ -20,6 +21,7 @@ def create_fish_buyer(
     session: Session = Depends(get_session)
 ):
     buyer.user_id = current_user.id
+    balances.reset_totals(buyer)
     session.add(buyer)
     session.commit()
     session.refresh(buyer)
@@ -27,36 +29,24 @@ def create_fish_buyer(
 
 @router.get("", response_model=List[Dict[str, Any]])
 def read_fish_buyers(
+    min_balance: Optional[float] = Query(None, description="Only buyers owing at least this much"),
+    sort_by: Optional[str] = Query(None, pattern="^balance$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    buyers = session.exec(select(FishBuyer).where(FishBuyer.user_id == current_user.id)).all()
+    # Totals are materialized on the buyer row (see app.balances)
+    query = select(FishBuyer).where(FishBuyer.user_id == current_user.id)
     
-    result = []
-    for buyer in buyers:
-        # Calculate stats
-        sales = session.exec(select(FishSale).where(FishSale.buyer_id == buyer.id)).all()
-        transactions = session.exec(select(FishBuyerTransaction).where(FishBuyerTransaction.buyer_id == buyer.id)).all()
-        
-        # From Sales
-        total_bought_amount = sum(s.total_amount for s in sales)
-        initial_paid_on_sales = sum(s.paid_amount for s in sales)
-        
-        # From Transactions
-        total_paid_via_transactions = sum(t.amount for t in transactions if t.transaction_type == 'payment')
-        
-        total_paid = initial_paid_on_sales + total_paid_via_transactions
-        balance_due = total_bought_amount - total_paid
-        
-        buyer_dict = buyer.model_dump()
-        buyer_dict.update({
-            "total_bought": total_bought_amount,
-            "total_paid": total_paid,
-            "balance": balance_due
-        })
-        result.append(buyer_dict)
-        
-    return result
+    if min_balance is not None:
+        query = query.where(FishBuyer.balance >= min_balance)
+    
+    if sort_by == "balance":
+        query = query.order_by(FishBuyer.balance.desc() if order == "desc" else FishBuyer.balance.asc(), FishBuyer.id)
+    else:
+        query = query.order_by(FishBuyer.id)
+    
+    return [buyer.model_dump() for buyer in session.exec(query).all()]
 
 @router.get("/{buyer_id}", response_model=Dict[str, Any])
 def read_fish_buyer_details(
@@ -88,23 +78,13 @@ def read_fish_buyer_details(
         
     transactions = session.exec(trans_query).all()
     
-    # Calculate totals (Lifetime)
-    all_sales = session.exec(select(FishSale).where(FishSale.buyer_id == buyer_id)).all()
-    all_trans = session.exec(select(FishBuyerTransaction).where(FishBuyerTransaction.buyer_id == buyer_id)).all()
-    
-    total_bought = sum(s.total_amount for s in all_sales)
-    sales_paid = sum(s.paid_amount for s in all_sales)
-    trans_paid = sum(t.amount for t in all_trans if t.transaction_type == 'payment')
-    
-    total_paid = sales_paid + trans_paid
-    balance = total_bought - total_paid
-    
+    # Lifetime totals are materialized on the buyer row
     return {
         "buyer": buyer,
         "stats": {
-            "total_bought": total_bought,
-            "total_paid": total_paid,
-            "balance": balance
+            "total_bought": buyer.total_bought,
+            "total_paid": buyer.total_paid,
+            "balance": buyer.balance
         },
         "sales": sales,
         "transactions": transactions
@@ -131,6 +111,8 @@ def create_buyer_transaction(
         pass # Let validation handle it if it fails
     
     session.add(transaction)
+    if transaction.transaction_type == 'payment':
+        balances.apply_buyer_payment(session, buyer_id, transaction.amount)
     session.commit()
     session.refresh(transaction)
 
@@ -160,6 +142,7 @@ def create_buyer_transaction(
                 sale.paid_amount += amount_to_pay
                 sale.due_amount = sale.total_amount - sale.paid_amount
                 remaining_payment -= amount_to_pay
+                balances.apply_buyer_payment(session, buyer_id, amount_to_pay)
                 
                 # Update status
                 if sale.due_amount <= 0:
@@ -185,7 +168,7 @@ def update_fish_buyer(
     if not db_buyer or db_buyer.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Buyer not found")
         
-    buyer_data = buyer_update.model_dump(exclude_unset=True)
+    buyer_data = buyer_update.model_dump(exclude_unset=True, exclude=set(balances.balance_fields(FishBuyer)))
     for key, value in buyer_data.items():
         setattr(db_buyer, key, value)
         
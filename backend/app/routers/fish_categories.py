@@ -1,8 +1,9 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import Session, select, func
 from app.database import get_session
 from app.auth import get_current_user
+from app.response_cache import cached_response
 from app.models.user import User
 from app.models.fish_farming import FishCategory
 
@@ -60,6 +61,7 @@ def delete_fish_category(
     return {"ok": True}
 
 @router.get("/fish-categories/{category_id}/stats")
+@cached_response("category_stats")
 def get_category_stats(
     category_id: int,
     start_date: Optional[str] = None,
@@ -68,6 +70,7 @@ def get_category_stats(
     session: Session = Depends(get_session)
 ):
     from app.models.fish_farming import Fish, FishSaleItem, FishSale
+    from app.aggregates import day_key
     from datetime import datetime
     
     # Verify category ownership
@@ -89,52 +92,59 @@ def get_category_stats(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid end_date format")
     
-    # Get all fish in this category
-    fish_query = select(Fish).where(Fish.category_id == category_id)
-    fish_in_category = session.exec(fish_query).all()
-    fish_ids = [f.id for f in fish_in_category]
+    fish_count = session.exec(
+        select(func.count(Fish.id)).where(Fish.category_id == category_id)
+    ).one()
     
-    # Get all sale items for fish in this category
-    sale_items_query = select(FishSaleItem).where(FishSaleItem.fish_id.in_(fish_ids))
-    sale_items = session.exec(sale_items_query).all()
-    
-    # Filter by date range if specified
-    filtered_items = []
-    for item in sale_items:
-        sale = session.get(FishSale, item.sale_id)
-        if sale:
-            include = True
-            if start_dt and sale.date < start_dt:
-                include = False
-            if end_dt and sale.date > end_dt:
-                include = False
-            if include:
-                filtered_items.append((item, sale))
+    # Aggregate sale items of fish in this category in SQL, with the date range on the joined sale
+    def sale_items_query(*columns):
+        query = (
+            select(*columns)
+            .select_from(FishSaleItem)
+            .join(Fish, Fish.id == FishSaleItem.fish_id)
+            .join(FishSale, FishSale.id == FishSaleItem.sale_id)
+            .where(Fish.category_id == category_id)
+            .where(FishSale.user_id == current_user.id)
+        )
+        if start_dt:
+            query = query.where(FishSale.date >= start_dt)
+        if end_dt:
+            query = query.where(FishSale.date <= end_dt)
+        return query
     
     # Calculate totals
-    total_sales = sum(item.amount for item, _ in filtered_items)
-    total_quantity_sold = sum(item.quantity for item, _ in filtered_items)
-    sales_count = len(set(item.sale_id for item, _ in filtered_items))
+    total_sales, total_quantity_sold, sales_count = session.exec(sale_items_query(
+        func.coalesce(func.sum(FishSaleItem.amount), 0),
+        func.coalesce(func.sum(FishSaleItem.quantity), 0),
+        func.count(func.distinct(FishSaleItem.sale_id))
+    )).one()
     
     # Get sales by date
-    sales_by_date = {}
-    for item, sale in filtered_items:
-        date_key = sale.date.strftime("%Y-%m-%d")
-        if date_key not in sales_by_date:
-            sales_by_date[date_key] = {"amount": 0, "quantity": 0}
-        sales_by_date[date_key]["amount"] += item.amount
-        sales_by_date[date_key]["quantity"] += item.quantity
+    sale_day = day_key(FishSale.date)
+    date_rows = session.exec(
+        sale_items_query(sale_day, func.sum(FishSaleItem.amount), func.sum(FishSaleItem.quantity))
+        .group_by(sale_day)
+        .order_by(sale_day)
+    ).all()
+    sales_by_date = {
+        date_key: {"amount": amount, "quantity": quantity}
+        for date_key, amount, quantity in date_rows
+    }
     
-    # Get sales by fish
-    sales_by_fish = {}
-    for item, sale in filtered_items:
-        fish = session.get(Fish, item.fish_id)
-        if fish:
-            if fish.name not in sales_by_fish:
-                sales_by_fish[fish.name] = {"amount": 0, "quantity": 0, "sales_count": 0}
-            sales_by_fish[fish.name]["amount"] += item.amount
-            sales_by_fish[fish.name]["quantity"] += item.quantity
-            sales_by_fish[fish.name]["sales_count"] += 1
+    # Get sales by fish (sales_count counts sale items, as before)
+    fish_rows = session.exec(
+        sale_items_query(
+            Fish.name,
+            func.sum(FishSaleItem.amount),
+            func.sum(FishSaleItem.quantity),
+            func.count(FishSaleItem.id)
+        )
+        .group_by(Fish.name)
+    ).all()
+    sales_by_fish = {
+        name: {"amount": amount, "quantity": quantity, "sales_count": count}
+        for name, amount, quantity, count in fish_rows
+    }
     
     return {
         "category": {
@@ -144,7 +154,7 @@ def get_category_stats(
         "total_sales": total_sales,
         "total_quantity_sold": total_quantity_sold,
         "sales_count": sales_count,
-        "fish_count": len(fish_in_category),
+        "fish_count": fish_count,
         "sales_by_date": sales_by_date,
         "sales_by_fish": sales_by_fish,
         "start_date": start_date,
@@ -1,15 +1,23 @@
+import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlmodel import Session, select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel import Session, select, func, update, delete
+from sqlalchemy import insert
 from pydantic import BaseModel
 from app.database import get_session
 from app.auth import get_current_user
+from app.conditional import conditional_get
 from app.models.user import User
-from app.models.fish_farming import FishSale, FishSaleItem
+from app.models.fish_farming import FishSale, FishSaleItem, FishBuyer
+from app import rollups, balances
+from app.pagination import PageParams, paginate
+from app.timezone_config import to_naive_utc
 
-router = APIRouter(tags=["fish_sales"])
+router = APIRouter(tags=["fish_sales"], dependencies=[Depends(conditional_get(FishSale, FishSaleItem, FishBuyer))])
+logger = logging.getLogger(__name__)
 
 class FishSaleItemCreate(BaseModel):
+    id: Optional[int] = None  # Existing item being edited; omitted for new items
     pond_id: Optional[int] = None
     quantity: float
     unit_id: int
@@ -58,6 +66,71 @@ class FishSaleResponse(BaseModel):
     class Config:
         from_attributes = True
 
+ITEM_FIELDS = ("pond_id", "quantity", "unit_id", "fish_id", "rate_per_unit", "amount")
+
+def _diff_sale_items(sale_id: int, existing_items, submitted_items):
+    """
+    Diff submitted items against a sale's stored items.
+    Items are matched by id; items without an id (older clients) reuse an
+    identical stored row that is still unmatched. Returns (inserts, updates,
+    delete_ids) ready for bulk statements, so unchanged rows keep their ids
+    and are not rewritten.
+    """
+    unmatched = {item.id: item for item in existing_items}
+    inserts, updates, without_id = [], [], []
+    
+    for item_data in submitted_items:
+        values = item_data.model_dump(include=set(ITEM_FIELDS))
+        if item_data.id is None:
+            without_id.append(values)
+            continue
+        current = unmatched.pop(item_data.id, None)
+        if current is None:
+            raise ValueError(f"Item {item_data.id} is not part of this sale (or was submitted twice)")
+        if any(getattr(current, field) != values[field] for field in ITEM_FIELDS):
+            updates.append({"id": current.id, **values})
+    
+    for values in without_id:
+        twin = next(
+            (item for item in unmatched.values() if all(getattr(item, field) == values[field] for field in ITEM_FIELDS)),
+            None
+        )
+        if twin is not None:
+            del unmatched[twin.id]
+        else:
+            inserts.append({"sale_id": sale_id, **values})
+    
+    return inserts, updates, list(unmatched)
+
+def _sale_to_response(sale: FishSale, items) -> FishSaleResponse:
+    # Resolve buyer name
+    buyer_name_resolved = sale.buyer.name if sale.buyer else sale.buyer_name
+    
+    return FishSaleResponse(
+        id=sale.id,
+        date=sale.date.isoformat(),
+        buyer_name=buyer_name_resolved,
+        buyer_id=sale.buyer_id,
+        sale_type=sale.sale_type,
+        payment_status=sale.payment_status,
+        total_amount=sale.total_amount,
+        paid_amount=sale.paid_amount,
+        due_amount=sale.due_amount,
+        total_weight=sale.total_weight,
+        items=[
+            FishSaleItemResponse(
+                id=item.id,
+                sale_id=item.sale_id,
+                pond_id=item.pond_id,
+                quantity=item.quantity,
+                unit_id=item.unit_id,
+                fish_id=item.fish_id, # Added fish_id
+                rate_per_unit=item.rate_per_unit,
+                amount=item.amount
+            ) for item in items
+        ]
+    )
+
 @router.post("/fish-sales", response_model=FishSale)
 def create_fish_sale(
     sale_data: FishSaleCreate,
@@ -120,10 +193,10 @@ def create_fish_sale(
         user_id=current_user.id
     )
     session.add(sale)
-    session.commit()
-    session.refresh(sale)
+    session.flush()
     
     # Create sale items
+    items = []
     for item_data in sale_data.items:
         item = FishSaleItem(
             sale_id=sale.id,
@@ -135,6 +208,11 @@ def create_fish_sale(
             amount=item_data.amount
         )
         session.add(item)
+        items.append(item)
+    
+    # Keep the daily rollup and the buyer's balance in the same transaction
+    rollups.apply_sale(session, current_user.id, sale.date, items)
+    balances.apply_buyer_sale(session, sale.buyer_id, sale.total_amount, sale.paid_amount)
     
     session.commit()
     session.refresh(sale)
@@ -142,8 +220,11 @@ def create_fish_sale(
 
 @router.get("/fish-sales", response_model=List[FishSaleResponse])
 def read_fish_sales(
+    response: Response,
     start_date: str = None,
     end_date: str = None,
+    buyer_id: Optional[int] = None,
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -174,8 +255,10 @@ def read_fish_sales(
         except ValueError:
             pass
     
-    query = query.order_by(FishSale.date.desc())
-    sales = session.exec(query).all()
+    if buyer_id:
+        query = query.where(FishSale.buyer_id == buyer_id)
+    
+    sales = paginate(session, query, FishSale, page, response)
     
     print(f"Found {len(sales)} sales")
     
@@ -185,35 +268,7 @@ def read_fish_sales(
         try:
             # Ensure items is not None
             items_list = sale.items if sale.items is not None else []
-            # print(f"Sale {sale.id} has {len(items_list)} items")
-            
-            # Resolve buyer name
-            buyer_name_resolved = sale.buyer.name if sale.buyer else sale.buyer_name
-            
-            result.append(FishSaleResponse(
-                id=sale.id,
-                date=sale.date.isoformat(),
-                buyer_name=buyer_name_resolved,
-                buyer_id=sale.buyer_id,
-                sale_type=sale.sale_type,
-                payment_status=sale.payment_status,
-                total_amount=sale.total_amount,
-                paid_amount=sale.paid_amount,
-                due_amount=sale.due_amount,
-                total_weight=sale.total_weight,
-                items=[
-                    FishSaleItemResponse(
-                        id=item.id,
-                        sale_id=item.sale_id,
-                        pond_id=item.pond_id,
-                        quantity=item.quantity,
-                        unit_id=item.unit_id,
-                        fish_id=item.fish_id, # Added fish_id
-                        rate_per_unit=item.rate_per_unit,
-                        amount=item.amount
-                    ) for item in items_list
-                ]
-            ))
+            result.append(_sale_to_response(sale, items_list))
         except Exception as e:
             print(f"Error processing sale {sale.id}: {str(e)}")
             # Continue processing other sales
@@ -221,20 +276,17 @@ def read_fish_sales(
     
     return result
 
+# Plain def: FastAPI runs it in the threadpool, so the blocking session
+# calls below never stall the event loop for other requests
 @router.put("/fish-sales/{sale_id}", response_model=FishSaleResponse)
-async def update_fish_sale(
+def update_fish_sale(
     sale_id: int,
-    request: Request,
     sale_data: FishSaleCreate,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     from datetime import datetime
     
-    # Log raw body
-    body = await request.body()
-    print(f"RAW UPDATE BODY: {body.decode()}")
-    
     print(f"Updating sale {sale_id} with data: {sale_data}")
     print(f"Items count: {len(sale_data.items)}")
     
@@ -272,6 +324,9 @@ async def update_fish_sale(
     
     # Use a single transaction for atomicity
     try:
+        previous_date = db_sale.date
+        balances.apply_buyer_sale(session, db_sale.buyer_id, db_sale.total_amount, db_sale.paid_amount, sign=-1)
+        
         # 1. Update sale details
         db_sale.date = sale_date
         db_sale.buyer_name = sale_data.buyer_name
@@ -283,8 +338,9 @@ async def update_fish_sale(
         db_sale.due_amount = due
         db_sale.total_weight = sale_data.total_weight
         session.add(db_sale)
+        balances.apply_buyer_sale(session, db_sale.buyer_id, total, paid)
 
-        # 2. Delete existing items
+        # 2. Diff items against the stored ones
         # Safety check: If detailed sale but no items provided, ABORT to prevent data loss
         if sale_data.sale_type == 'detailed' and not sale_data.items:
             raise ValueError("Detailed sale update must include items. Operation aborted to prevent data loss.")
@@ -292,26 +348,26 @@ async def update_fish_sale(
         existing_items = session.exec(
             select(FishSaleItem).where(FishSaleItem.sale_id == sale_id)
         ).all()
-        print(f"Deleting {len(existing_items)} existing items")
-        for item in existing_items:
-            session.delete(item)
-        
-        # 3. Create new items
-        if not sale_data.items:
+        if not sale_data.items and existing_items:
             print("WARNING: No items provided in update request! Detailed entry will be lost.")
         
-        for item_data in sale_data.items:
-            print(f"Adding item: {item_data}")
-            item = FishSaleItem(
-                sale_id=sale_id,
-                pond_id=item_data.pond_id,
-                quantity=item_data.quantity,
-                unit_id=item_data.unit_id,
-                fish_id=item_data.fish_id, # Added fish_id
-                rate_per_unit=item_data.rate_per_unit,
-                amount=item_data.amount
-            )
-            session.add(item)
+        inserts, updates, delete_ids = _diff_sale_items(sale_id, existing_items, sale_data.items)
+        logger.debug("Sale %s item changes: %d added, %d updated, %d removed",
+                     sale_id, len(inserts), len(updates), len(delete_ids))
+        
+        # Rollup buckets depend on the date and the items only; the stored
+        # date is naive UTC while the parsed one may carry an offset
+        if inserts or updates or delete_ids or to_naive_utc(previous_date) != to_naive_utc(sale_date):
+            rollups.apply_sale(session, current_user.id, previous_date, existing_items, sign=-1)
+            rollups.apply_sale(session, current_user.id, sale_date, sale_data.items)
+        
+        # 3. Apply the diff as one bulk statement per kind
+        if delete_ids:
+            session.exec(delete(FishSaleItem).where(FishSaleItem.id.in_(delete_ids)))
+        if updates:
+            session.execute(update(FishSaleItem), updates)
+        if inserts:
+            session.execute(insert(FishSaleItem), inserts)
         
         session.commit()
         session.refresh(db_sale)
@@ -325,26 +381,7 @@ async def update_fish_sale(
         raise HTTPException(status_code=500, detail=str(e))
     
     # Return response model
-    return FishSaleResponse(
-        id=db_sale.id,
-        date=db_sale.date.isoformat(),
-        buyer_name=db_sale.buyer_name,
-        sale_type=db_sale.sale_type,
-        total_amount=db_sale.total_amount,
-        total_weight=db_sale.total_weight,
-        items=[
-            FishSaleItemResponse(
-                id=item.id,
-                sale_id=item.sale_id,
-                pond_id=item.pond_id,
-                quantity=item.quantity,
-                unit_id=item.unit_id,
-                fish_id=item.fish_id, # Added fish_id
-                rate_per_unit=item.rate_per_unit,
-                amount=item.amount
-            ) for item in db_sale.items
-        ]
-    )
+    return _sale_to_response(db_sale, db_sale.items)
 
 @router.get("/fish-sales/{sale_id}", response_model=FishSale)
 def read_fish_sale(
@@ -370,6 +407,8 @@ def delete_fish_sale(
     # Delete associated items
     items_query = select(FishSaleItem).where(FishSaleItem.sale_id == sale_id)
     items = session.exec(items_query).all()
+    rollups.apply_sale(session, current_user.id, sale.date, items, sign=-1)
+    balances.apply_buyer_sale(session, sale.buyer_id, sale.total_amount, sale.paid_amount, sign=-1)
     for item in items:
         session.delete(item)
     
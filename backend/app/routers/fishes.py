@@ -3,10 +3,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session, select
 from app.database import get_session
 from app.auth import get_current_user
+from app.conditional import conditional_get
+from app.response_cache import cached_response
 from app.models.user import User
-from app.models.fish_farming import Fish, FishCategory
+from app.models.fish_farming import Fish, FishCategory, FishSale, FishSaleItem
+from app import rollups
 
-router = APIRouter(tags=["fishes"])
+router = APIRouter(tags=["fishes"], dependencies=[Depends(conditional_get(Fish, FishSale, FishSaleItem))])
 
 @router.post("/fishes", response_model=Fish)
 def create_fish(
@@ -69,11 +72,14 @@ def delete_fish(
     if not fish or fish.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Fish not found")
     
+    # Its sale items are kept without a fish, so their rollup rows are too
+    rollups.remove_fish(session, current_user.id, fish_id)
     session.delete(fish)
     session.commit()
     return {"ok": True}
 
 @router.get("/fishes/{fish_id}/stats")
+@cached_response("fish_stats")
 def get_fish_stats(
     fish_id: int,
     start_date: Optional[str] = None,
@@ -82,6 +88,7 @@ def get_fish_stats(
     session: Session = Depends(get_session)
 ):
     from app.models.fish_farming import FishSaleItem, FishSale
+    from app.aggregates import day_key
     from sqlmodel import func
     from datetime import datetime
     
@@ -104,36 +111,39 @@ def get_fish_stats(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid end_date format")
     
-    # Get all sale items for this fish
-    sale_items_query = select(FishSaleItem).where(FishSaleItem.fish_id == fish_id)
-    sale_items = session.exec(sale_items_query).all()
-    
-    # Filter by date range if specified
-    filtered_items = []
-    for item in sale_items:
-        sale = session.get(FishSale, item.sale_id)
-        if sale:
-            include = True
-            if start_dt and sale.date < start_dt:
-                include = False
-            if end_dt and sale.date > end_dt:
-                include = False
-            if include:
-                filtered_items.append((item, sale))
+    # Aggregate this fish's sale items in SQL, with the date range on the joined sale
+    def sale_items_query(*columns):
+        query = (
+            select(*columns)
+            .select_from(FishSaleItem)
+            .join(FishSale, FishSale.id == FishSaleItem.sale_id)
+            .where(FishSaleItem.fish_id == fish_id)
+            .where(FishSale.user_id == current_user.id)
+        )
+        if start_dt:
+            query = query.where(FishSale.date >= start_dt)
+        if end_dt:
+            query = query.where(FishSale.date <= end_dt)
+        return query
     
     # Calculate totals
-    total_sales = sum(item.amount for item, _ in filtered_items)
-    total_quantity_sold = sum(item.quantity for item, _ in filtered_items)
-    sales_count = len(set(item.sale_id for item, _ in filtered_items))
+    total_sales, total_quantity_sold, sales_count = session.exec(sale_items_query(
+        func.coalesce(func.sum(FishSaleItem.amount), 0),
+        func.coalesce(func.sum(FishSaleItem.quantity), 0),
+        func.count(func.distinct(FishSaleItem.sale_id))
+    )).one()
     
     # Get sales by date (for trend analysis)
-    sales_by_date = {}
-    for item, sale in filtered_items:
-        date_key = sale.date.strftime("%Y-%m-%d")
-        if date_key not in sales_by_date:
-            sales_by_date[date_key] = {"amount": 0, "quantity": 0}
-        sales_by_date[date_key]["amount"] += item.amount
-        sales_by_date[date_key]["quantity"] += item.quantity
+    sale_day = day_key(FishSale.date)
+    date_rows = session.exec(
+        sale_items_query(sale_day, func.sum(FishSaleItem.amount), func.sum(FishSaleItem.quantity))
+        .group_by(sale_day)
+        .order_by(sale_day)
+    ).all()
+    sales_by_date = {
+        date_key: {"amount": amount, "quantity": quantity}
+        for date_key, amount, quantity in date_rows
+    }
     
     return {
         "fish": {
@@ -0,0 +1,36 @@
+import io
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlmodel import Session
+from app.database import get_session
+from app.auth import get_current_user
+from app.models.user import User
+from app import imports
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+# Plain def: parsing and the bulk insert are blocking, so FastAPI runs this
+# in the threadpool
+@router.post("/{ledger}")
+def import_ledger(
+    ledger: str,
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Import a CSV of historical rows (the layout GET /exports/{ledger} writes).
+    Invalid rows are listed in `errors` and skipped; the rest are committed
+    together. With dry_run=true nothing is written.
+    """
+    if ledger not in imports.LEDGER_NAMES:
+        raise HTTPException(status_code=404, detail=f"Unknown ledger; one of: {', '.join(imports.LEDGER_NAMES)}")
+
+    # utf-8-sig: spreadsheet programs often start their CSV files with a BOM
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return imports.import_csv(session, ledger, current_user.id, stream, dry_run=dry_run)
+    except imports.ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="The file is not UTF-8 encoded CSV")
@@ -2,14 +2,19 @@ from fastapi import APIRouter, Depends, Query
 from sqlmodel import Session, select, func
 from app.database import get_session
 from app.auth import get_current_user
+from app.conditional import conditional_get
+from app.response_cache import cached_response
 from app.models import User
 from app.models.income import Income, Organization, Person
+from app.aggregates import month_key, month_starts, next_month, month_series
+from app.timezone_config import to_naive_utc
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 
-router = APIRouter(prefix="/income-dashboard", tags=["income-dashboard"])
+router = APIRouter(prefix="/income-dashboard", tags=["income-dashboard"], dependencies=[Depends(conditional_get(Income, Organization, Person))])
 
 @router.get("/stats")
+@cached_response("income_dashboard")
 def get_income_dashboard_stats(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
@@ -20,19 +25,19 @@ def get_income_dashboard_stats(
     
     now = datetime.now()
     
-    # Parse dates
+    # Parse dates (as naive UTC, the form they are stored in)
     filter_start = None
     filter_end = None
     
     if start_date:
         try:
-            filter_start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+            filter_start = to_naive_utc(datetime.fromisoformat(start_date.replace('Z', '+00:00')))
         except ValueError:
             pass
             
     if end_date:
         try:
-            filter_end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            filter_end = to_naive_utc(datetime.fromisoformat(end_date.replace('Z', '+00:00')))
         except ValueError:
             pass
             
@@ -74,67 +79,35 @@ def get_income_dashboard_stats(
     ).one() or 0
 
     # 2. Trends
-    # If filter is applied, show trend within that range (monthly aggregation)
-    # If no filter, show last 12 months
-    
-    monthly_trend = []
+    # One month-bucketed GROUP BY, gap-filled afterwards.
+    # If filter is applied, show every month the filter touches (whole months)
+    # If no filter, show every month from the first to the last income
+    bucket = month_key(Income.date)
+    trend_query = (
+        select(bucket, func.sum(Income.amount))
+        .where(Income.user_id == current_user.id)
+        .group_by(bucket)
+    )
     
     if filter_start and filter_end:
-        # Strip timezone info to avoid comparison issues with naive datetimes
-        filter_start_naive = filter_start.replace(tzinfo=None)
-        filter_end_naive = filter_end.replace(tzinfo=None)
-        
-        # Generate months between start and end
-        curr = filter_start_naive
-        while curr <= filter_end_naive:
-            # Start of this month
-            m_start = datetime(curr.year, curr.month, 1)
-            # Start of next month
-            if curr.month == 12:
-                m_end = datetime(curr.year + 1, 1, 1)
-            else:
-                m_end = datetime(curr.year, curr.month + 1, 1)
-            
-            # Query for this month
-            amount = session.exec(
-                select(func.sum(Income.amount))
-                .where(Income.user_id == current_user.id)
-                .where(Income.date >= m_start)
-                .where(Income.date < m_end)
-            ).one() or 0
-            
-            monthly_trend.append({
-                "month": m_start.strftime("%b %Y"),
-                "amount": float(amount)
-            })
-            
-            # Move to next month
-            curr = m_end
-            
+        months = month_starts(filter_start, filter_end) if filter_start <= filter_end else []
+        monthly_totals = {}
+        if months:
+            monthly_totals = dict(session.exec(
+                trend_query
+                .where(Income.date >= months[0])
+                .where(Income.date < next_month(months[-1]))
+            ).all())
     else:
-        # No filter: Show all income data grouped by month
-        # Get all income records for this user
-        all_incomes = session.exec(
-            select(Income)
-            .where(Income.user_id == current_user.id)
-            .order_by(Income.date)
-        ).all()
-        
-        if all_incomes:
-            # Group by month
-            monthly_data = {}
-            for income in all_incomes:
-                month_key = income.date.strftime("%Y-%m")
-                month_label = income.date.strftime("%b %Y")
-                if month_key not in monthly_data:
-                    monthly_data[month_key] = {"month": month_label, "amount": 0}
-                monthly_data[month_key]["amount"] += income.amount
-            
-            # Convert to list and sort by month
-            monthly_trend = sorted(
-                [{"month": v["month"], "amount": float(v["amount"])} for v in monthly_data.values()],
-                key=lambda x: datetime.strptime(x["month"], "%b %Y")
+        monthly_totals = dict(session.exec(trend_query).all())
+        months = []
+        if monthly_totals:
+            months = month_starts(
+                datetime.strptime(min(monthly_totals), "%Y-%m"),
+                datetime.strptime(max(monthly_totals), "%Y-%m")
             )
+    
+    monthly_trend = month_series(monthly_totals, months)
 
     # 3. Breakdown by Income Type
     type_breakdown_query = select(Income.income_type, func.sum(Income.amount))
@@ -1,11 +1,12 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlmodel import Session, select
 from datetime import datetime
 from app.database import get_session
 from app.auth import get_current_user
 from app.models.user import User
 from app.models.income import Income
+from app.pagination import PageParams, paginate
 
 router = APIRouter(prefix="/incomes", tags=["incomes"])
 
@@ -31,11 +32,13 @@ def create_income(
 
 @router.get("", response_model=List[Income])
 def get_incomes(
+    response: Response,
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     person_id: Optional[int] = Query(None),
     organization_id: Optional[int] = Query(None),
     income_type: Optional[str] = Query(None),
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -66,9 +69,7 @@ def get_incomes(
     if income_type:
         query = query.where(Income.income_type == income_type)
     
-    query = query.order_by(Income.date.desc())
-    incomes = session.exec(query).all()
-    return incomes
+    return paginate(session, query, Income, page, response)
 
 @router.get("/{income_id}", response_model=Income)
 def get_income(
@@ -1,10 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 from app.database import get_session
 from app.auth import get_current_user
 from app.models.user import User
 from app.models.fish_farming import LaborCost
+from app.pagination import PageParams, paginate
 
 router = APIRouter(tags=["labor"])
 
@@ -31,11 +33,24 @@ def create_labor_cost(
 
 @router.get("/labor-costs", response_model=List[LaborCost])
 def read_labor_costs(
+    response: Response,
+    pond_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    query = select(LaborCost).where(LaborCost.user_id == current_user.id).order_by(LaborCost.date.desc())
-    return session.exec(query).all()
+    query = select(LaborCost).where(LaborCost.user_id == current_user.id)
+    
+    if pond_id:
+        query = query.where(LaborCost.pond_id == pond_id)
+    if start_date:
+        query = query.where(LaborCost.date >= start_date)
+    if end_date:
+        query = query.where(LaborCost.date <= end_date)
+    
+    return paginate(session, query, LaborCost, page, response)
 
 @router.put("/labor-costs/{labor_id}", response_model=LaborCost)
 def update_labor_cost(
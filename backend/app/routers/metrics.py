@@ -0,0 +1,22 @@
+import os
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, Response
+
+from app import metrics
+
+router = APIRouter(tags=["metrics"])
+
+# Bearer token for /metrics; the endpoint does not exist until one is configured
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN") or None
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics(authorization: str = Header(None)):
+    """Prometheus scrape target for this worker's metrics"""
+    if METRICS_TOKEN is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    # Rendered on the event loop, where the threadpool limiter can be read
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,10 +1,11 @@
 from typing import List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 from app.database import get_session
 from app.auth import get_current_user
 from app.models.user import User
 from app.models.fish_farming import PondFeedPurchase, Pond, Supplier, FishFeed, Unit
+from app.pagination import PageParams, paginate
 
 router = APIRouter(tags=["pond_feeds"])
 
@@ -48,15 +49,25 @@ def create_pond_feed_purchase(
 
 @router.get("/pond-feeds", response_model=List[Any])
 def read_pond_feed_purchases(
+    response: Response,
     pond_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     from datetime import datetime
     
-    query = select(PondFeedPurchase).where(PondFeedPurchase.user_id == current_user.id)
+    # Related names come from the same joined select instead of per-row lazy loads
+    query = (
+        select(PondFeedPurchase, FishFeed.name, FishFeed.brand, Pond.name, Supplier.name, Unit.name)
+        .outerjoin(FishFeed, FishFeed.id == PondFeedPurchase.feed_id)
+        .outerjoin(Pond, Pond.id == PondFeedPurchase.pond_id)
+        .outerjoin(Supplier, Supplier.id == PondFeedPurchase.supplier_id)
+        .outerjoin(Unit, Unit.id == PondFeedPurchase.unit_id)
+        .where(PondFeedPurchase.user_id == current_user.id)
+    )
     
     if pond_id:
         query = query.where(PondFeedPurchase.pond_id == pond_id)
@@ -75,25 +86,21 @@ def read_pond_feed_purchases(
         except ValueError:
             pass
     
-    # Sort by date descending
-    query = query.order_by(PondFeedPurchase.date.desc())
+    # Newest first, one page at a time when a limit is given
+    purchases = paginate(session, query, PondFeedPurchase, page, response)
     
-    purchases = session.exec(query).all()
-    
-    # Manually load relationships for response (since we have mixed objects potentially or want to be safe)
-    # Ideally use response_model with relationship but for now list dicts
     result = []
-    for p in purchases:
+    for p, feed_name, feed_brand, pond_name, supplier_name, unit_name in purchases:
         p_dict = p.model_dump()
-        if p.feed:
-             p_dict['feed_name'] = p.feed.name
-             p_dict['feed_brand'] = p.feed.brand
-        if p.pond:
-             p_dict['pond_name'] = p.pond.name
-        if p.supplier:
-             p_dict['supplier_name'] = p.supplier.name
-        if p.unit:
-             p_dict['unit_name'] = p.unit.name
+        if feed_name is not None:
+             p_dict['feed_name'] = feed_name
+             p_dict['feed_brand'] = feed_brand
+        if pond_name is not None:
+             p_dict['pond_name'] = pond_name
+        if supplier_name is not None:
+             p_dict['supplier_name'] = supplier_name
+        if unit_name is not None:
+             p_dict['unit_name'] = unit_name
         result.append(p_dict)
         
     return result
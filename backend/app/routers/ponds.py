@@ -1,12 +1,20 @@
+from collections import defaultdict
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from sqlmodel import Session, select, func
 from app.database import get_session
 from app.auth import get_current_user
+from app.conditional import conditional_get
+from app.response_cache import cached_response
 from app.models.user import User
-from app.models.fish_farming import Pond
+from app.models.fish_farming import Pond, PondFeedPurchase, LaborCost, Supplier, Unit, FishSale, FishSaleItem, FishSaleDaily
+from app import rollups
+from app.timezone_config import to_naive_utc
 
-router = APIRouter(tags=["ponds"])
+router = APIRouter(tags=["ponds"], dependencies=[Depends(conditional_get(
+    Pond, FishSale, FishSaleItem, FishSaleDaily, PondFeedPurchase, LaborCost, Supplier, Unit
+))])
 
 @router.post("/ponds", response_model=Pond)
 def create_pond(
@@ -58,81 +66,159 @@ def delete_pond(
     if not pond or pond.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Pond not found")
     
+    # Sale items go with the pond (delete-orphan), so their rollup rows must too
+    rollups.remove_pond(session, pond_id)
     session.delete(pond)
     session.commit()
     return {"ok": True}
 
+def _pond_stats(
+    session: Session,
+    user_id: int,
+    ponds: List[Pond],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[dict]:
+    """
+    Sales, feed and labor figures for each of the given ponds, computed with
+    one grouped query per source no matter how many ponds are asked for
+    """
+    pond_ids = [pond.id for pond in ponds]
+    if not pond_ids:
+        return []
+    # Dates are stored as naive UTC; the rollup reads naive bounds as UTC too
+    start = to_naive_utc(start) if start else None
+    end = to_naive_utc(end) if end else None
+    
+    def in_window(date_col):
+        clauses = []
+        if start:
+            clauses.append(date_col >= start)
+        if end:
+            clauses.append(date_col <= end)
+        return clauses
+    
+    # Sales (daily rollup for whole-day windows, raw items otherwise)
+    facts = rollups.sales_facts(user_id, start, end)
+    sales = {
+        pond_id: (amount, quantity, item_count)
+        for pond_id, amount, quantity, item_count in session.exec(
+            select(
+                facts.c.pond_id,
+                func.coalesce(func.sum(facts.c.amount), 0),
+                func.coalesce(func.sum(facts.c.quantity), 0),
+                func.coalesce(func.sum(facts.c.item_count), 0)
+            )
+            .where(facts.c.pond_id.in_(pond_ids))
+            .group_by(facts.c.pond_id)
+        ).all()
+    }
+    
+    # Feed purchases by supplier
+    feed_by_supplier = defaultdict(list)
+    feed_totals = defaultdict(lambda: [0, 0])  # [total_amount, purchase_count]
+    for pond_id, supplier_id, supplier_name, total_amount, total_quantity, purchases in session.exec(
+        select(
+            PondFeedPurchase.pond_id,
+            PondFeedPurchase.supplier_id,
+            Supplier.name,
+            func.coalesce(func.sum(PondFeedPurchase.total_amount), 0),
+            func.coalesce(func.sum(PondFeedPurchase.quantity), 0),
+            func.count(PondFeedPurchase.id)
+        )
+        .outerjoin(Supplier, Supplier.id == PondFeedPurchase.supplier_id)
+        .where(PondFeedPurchase.pond_id.in_(pond_ids), *in_window(PondFeedPurchase.date))
+        .group_by(PondFeedPurchase.pond_id, PondFeedPurchase.supplier_id, Supplier.name)
+    ).all():
+        feed_by_supplier[pond_id].append({
+            "supplier_id": supplier_id,
+            "supplier_name": supplier_name or "Unknown",
+            "total_amount": total_amount,
+            "total_quantity": total_quantity
+        })
+        feed_totals[pond_id][0] += total_amount
+        feed_totals[pond_id][1] += purchases
+    
+    # Feed quantity by unit
+    unit_name = func.coalesce(Unit.name, "Unknown")
+    feed_quantity_by_unit = defaultdict(dict)
+    for pond_id, name, quantity in session.exec(
+        select(PondFeedPurchase.pond_id, unit_name, func.coalesce(func.sum(PondFeedPurchase.quantity), 0))
+        .outerjoin(Unit, Unit.id == PondFeedPurchase.unit_id)
+        .where(PondFeedPurchase.pond_id.in_(pond_ids), *in_window(PondFeedPurchase.date))
+        .group_by(PondFeedPurchase.pond_id, unit_name)
+    ).all():
+        feed_quantity_by_unit[pond_id][name] = quantity
+    
+    # Labor costs
+    labor = {
+        pond_id: (amount, entries)
+        for pond_id, amount, entries in session.exec(
+            select(
+                LaborCost.pond_id,
+                func.coalesce(func.sum(LaborCost.amount), 0),
+                func.count(LaborCost.id)
+            )
+            .where(LaborCost.pond_id.in_(pond_ids), *in_window(LaborCost.date))
+            .group_by(LaborCost.pond_id)
+        ).all()
+    }
+    
+    results = []
+    for pond in ponds:
+        total_sales, total_quantity_sold, sale_items_count = sales.get(pond.id, (0, 0, 0))
+        total_feed_expense, feed_purchases_count = feed_totals.get(pond.id, (0, 0))
+        total_labor, labor_entries_count = labor.get(pond.id, (0, 0))
+        
+        # Calculate profit/loss
+        total_expenses = total_feed_expense + total_labor
+        profit_loss = total_sales - total_expenses
+        
+        results.append({
+            "pond": {
+                "id": pond.id,
+                "name": pond.name,
+                "location": pond.location,
+                "size": pond.size
+            },
+            "total_sales": total_sales,
+            "total_quantity_sold": total_quantity_sold,
+            "total_feed_expense": total_feed_expense,
+            "total_labor": total_labor,
+            "total_expenses": total_expenses,
+            "profit_loss": profit_loss,
+            "feed_by_supplier": feed_by_supplier.get(pond.id, []),
+            "feed_quantity_by_unit": feed_quantity_by_unit.get(pond.id, {}),
+            "sales_count": sale_items_count,
+            "feed_purchases_count": feed_purchases_count,
+            "labor_entries_count": labor_entries_count
+        })
+    return results
+
+@router.get("/ponds/stats")
+@cached_response("all_pond_stats")
+def get_all_pond_stats(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """Profitability figures for every pond of the user, for side-by-side comparison"""
+    ponds = session.exec(select(Pond).where(Pond.user_id == current_user.id).order_by(Pond.id)).all()
+    return _pond_stats(session, current_user.id, ponds, start_date, end_date)
+
 @router.get("/ponds/{pond_id}/stats")
+@cached_response("pond_stats")
 def get_pond_stats(
     pond_id: int,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    from app.models.fish_farming import FishSaleItem, PondFeedPurchase, LaborCost, Supplier, Unit
-    
     # Verify pond belongs to user
     pond = session.get(Pond, pond_id)
     if not pond or pond.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Pond not found")
     
-    # Calculate total sales from this pond
-    sales_query = select(FishSaleItem).where(FishSaleItem.pond_id == pond_id)
-    sale_items = session.exec(sales_query).all()
-    total_sales = sum((item.amount or 0) for item in sale_items)
-    total_quantity_sold = sum((item.quantity or 0) for item in sale_items)
-    
-    # Calculate total feed expenses for this pond
-    feeds_query = select(PondFeedPurchase).where(PondFeedPurchase.pond_id == pond_id)
-    feeds = session.exec(feeds_query).all()
-    total_feed_expense = sum((feed.total_amount or 0) for feed in feeds)
-    
-    # Group feed by supplier
-    feed_by_supplier = {}
-    feed_quantity_by_unit = {}
-    for feed in feeds:
-        # By supplier
-        if feed.supplier_id not in feed_by_supplier:
-            supplier = session.get(Supplier, feed.supplier_id)
-            feed_by_supplier[feed.supplier_id] = {
-                "supplier_id": feed.supplier_id,
-                "supplier_name": supplier.name if supplier else "Unknown",
-                "total_amount": 0,
-                "total_quantity": 0
-            }
-        feed_by_supplier[feed.supplier_id]["total_amount"] += (feed.total_amount or 0)
-        feed_by_supplier[feed.supplier_id]["total_quantity"] += (feed.quantity or 0)
-        
-        # By unit
-        unit_name = feed.unit.name if feed.unit else "Unknown"
-        if unit_name not in feed_quantity_by_unit:
-            feed_quantity_by_unit[unit_name] = 0
-        feed_quantity_by_unit[unit_name] += (feed.quantity or 0)
-    
-    # Calculate labor costs for this pond
-    labor_query = select(LaborCost).where(LaborCost.pond_id == pond_id)
-    labor_costs = session.exec(labor_query).all()
-    total_labor = sum((labor.amount or 0) for labor in labor_costs)
-    
-    # Calculate profit/loss
-    total_expenses = total_feed_expense + total_labor
-    profit_loss = total_sales - total_expenses
-    
-    return {
-        "pond": {
-            "id": pond.id,
-            "name": pond.name,
-            "location": pond.location,
-            "size": pond.size
-        },
-        "total_sales": total_sales,
-        "total_quantity_sold": total_quantity_sold,
-        "total_feed_expense": total_feed_expense,
-        "total_labor": total_labor,
-        "total_expenses": total_expenses,
-        "profit_loss": profit_loss,
-        "feed_by_supplier": list(feed_by_supplier.values()),
-        "feed_quantity_by_unit": feed_quantity_by_unit,
-        "sales_count": len(sale_items),
-        "feed_purchases_count": len(feeds),
-        "labor_entries_count": len(labor_costs)
-    }
+    return _pond_stats(session, current_user.id, [pond], start_date, end_date)[0]
@@ -1,10 +1,13 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlmodel import Session, select
 from app.database import get_session
 from app.auth import get_current_user
 from app.models.user import User
 from app.models.fish_farming import Supplier, SupplierTransaction
+from app import balances
+from app.pagination import PageParams, paginate
 
 router = APIRouter(tags=["suppliers"])
 
@@ -16,6 +19,7 @@ def create_supplier(
     session: Session = Depends(get_session)
 ):
     supplier.user_id = current_user.id
+    balances.reset_totals(supplier)
     session.add(supplier)
     session.commit()
     session.refresh(supplier)
@@ -51,7 +55,7 @@ def update_supplier(
     if not db_supplier or db_supplier.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Supplier not found")
     
-    supplier_data = supplier_update.dict(exclude_unset=True)
+    supplier_data = supplier_update.dict(exclude_unset=True, exclude=set(balances.balance_fields(Supplier)))
     for key, value in supplier_data.items():
         setattr(db_supplier, key, value)
         
@@ -96,6 +100,7 @@ def create_supplier_transaction(
             transaction.date = datetime.utcnow()
     
     session.add(transaction)
+    balances.apply_entry(session, "supplier", transaction.supplier_id, transaction.transaction_type, transaction.amount)
     session.commit()
     session.refresh(transaction)
     return transaction
@@ -103,6 +108,10 @@ def create_supplier_transaction(
 @router.get("/supplier-transactions/{supplier_id}", response_model=List[SupplierTransaction])
 def read_supplier_transactions(
     supplier_id: int,
+    response: Response,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -112,7 +121,12 @@ def read_supplier_transactions(
         raise HTTPException(status_code=404, detail="Supplier not found")
     
     query = select(SupplierTransaction).where(SupplierTransaction.supplier_id == supplier_id)
-    return session.exec(query).all()
+    if start_date:
+        query = query.where(SupplierTransaction.date >= start_date)
+    if end_date:
+        query = query.where(SupplierTransaction.date <= end_date)
+    
+    return paginate(session, query, SupplierTransaction, page, response)
 
 @router.delete("/supplier-transactions/{transaction_id}")
 def delete_supplier_transaction(
@@ -129,6 +143,7 @@ def delete_supplier_transaction(
     if not supplier or supplier.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Unauthorized")
     
+    balances.apply_entry(session, "supplier", transaction.supplier_id, transaction.transaction_type, transaction.amount, sign=-1)
     session.delete(transaction)
     session.commit()
     return {"ok": True}
@@ -3,10 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import Session, select
 from app.database import get_session
 from app.auth import get_current_user
+from app.conditional import conditional_get
 from app.models.user import User
 from app.models.fish_farming import Unit
 
-router = APIRouter(tags=["units"])
+router = APIRouter(tags=["units"], dependencies=[Depends(conditional_get(Unit))])
 
 @router.post("/units", response_model=Unit)
 def create_unit(
@@ -28,3 +28,9 @@ def utc_to_dhaka(dt: datetime):
     if dt.tzinfo is None:
         dt = pytz.utc.localize(dt)
     return dt.astimezone(TIMEZONE)
+
+def to_naive_utc(dt: datetime):
+    """Convert a datetime to naive UTC, the form dates are stored in (naive values are already UTC)"""
+    if dt.tzinfo is not None:
+        return dt.astimezone(pytz.utc).replace(tzinfo=None)
+    return dt
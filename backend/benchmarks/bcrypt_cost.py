@@ -0,0 +1,58 @@
+"""
+Login throughput per bcrypt cost factor
+
+Verifies one password repeatedly on a pool the size of the API's bcrypt
+executor and reports logins/sec and per-login latency for each cost.
+Use it to pick BCRYPT_ROUNDS for the production hardware.
+
+    python -m benchmarks.bcrypt_cost [--rounds 10 11 12 13] [--workers N] [--seconds 3]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+
+def measure(rounds: int, workers: int, seconds: float) -> dict:
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed = context.hash("correct horse battery staple")
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        done, busy = 0, 0.0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            context.verify("correct horse battery staple", hashed)
+            busy += time.perf_counter() - start
+            done += 1
+        return done, busy
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda _: worker(), range(workers)))
+    elapsed = time.perf_counter() - started
+
+    logins = sum(done for done, _ in results)
+    busy = sum(b for _, b in results)
+    return {
+        "rounds": rounds,
+        "logins": logins,
+        "logins_per_sec": logins / elapsed,
+        "ms_per_login": 1000 * busy / logins if logins else float("nan"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure bcrypt login throughput per cost factor")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Threads verifying in parallel (match BCRYPT_WORKERS)")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration per cost factor")
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6}  {'logins/sec':>10}  {'ms/login':>9}  ({args.workers} workers, {args.seconds:g}s each)")
+    for rounds in args.rounds:
+        result = measure(rounds, args.workers, args.seconds)
+        print(f"{result['rounds']:>6}  {result['logins_per_sec']:>10.1f}  {result['ms_per_login']:>9.1f}")
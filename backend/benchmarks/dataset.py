@@ -0,0 +1,309 @@
+"""
+Synthetic multi-tenant farm dataset
+
+Fills the database behind DATABASE_URL with N users, each with ponds, fish,
+buyers, suppliers, feeds and counterparties plus years of sales, feed
+purchases and usage, labor, expenses, incomes, buyer and supplier payments
+and creditor/debtor/contributor ledgers. Rows go in through bulk Core
+inserts; the daily sales rollup and the materialized balances are rebuilt
+afterwards so the API serves the data exactly as if it had been entered
+by hand.
+
+The same --seed, --scale, --years and --end produce the same rows; each
+user draws from its own seeded generator, so --users only adds tenants.
+Every user logs in with --password.
+
+    python -m benchmarks.dataset [--users 10] [--years 3] [--scale 1.0] [--seed 42] [--end 2026-06-30]
+
+At --scale 1 a user gets roughly 2,100 sales with 4,200 items and 4,800
+other ledger rows per year; 100 users over 5 years is about 5.5M rows.
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, inspect
+from sqlmodel import Session, select
+
+from app import balances, rollups
+from app.auth import pwd_context
+from app.database import engine, create_db_and_tables
+from app.db_utils import apply_migrations, stamp_head
+from app.models import (
+    User, Pond, Fish, FishCategory, FishBuyer, FishBuyerTransaction, Supplier, SupplierTransaction,
+    FishFeed, Unit, FishSale, FishSaleItem, PondFeedPurchase, PondFeedUsage, LaborCost,
+    Expense, ExpenseType, Person, Organization, Income,
+    Creditor, Transaction, Debtor, DebtorTransaction, Contributor, ContributorTransaction
+)
+from app.seed_units import seed_units
+
+BATCH_SIZE = 5000
+
+# Rows per user per year at --scale 1
+PER_YEAR = {
+    "sales": 2100,
+    "feed_purchases": 500,
+    "feed_usages": 1100,
+    "labor": 400,
+    "expenses": 900,
+    "incomes": 60,
+    "buyer_payments": 900,
+    "supplier_transactions": 300,
+    "ledger_transactions": 200,   # per ledger (creditors, debtors, contributors)
+}
+
+FISH = ["Rui", "Katla", "Mrigal", "Pangas", "Tilapia", "Shing", "Koi", "Silver Carp", "Grass Carp", "Prawn"]
+EXPENSE_TYPES = ["Electricity", "Fuel", "Medicine", "Lime", "Fertilizer", "Repairs", "Transport", "Rent"]
+INCOME_TYPES = ["SALARY", "BONUS", "COMMISSION", "ALLOWANCE", "OTHER"]
+
+
+def random_datetime(rng: random.Random, start: datetime, end: datetime) -> datetime:
+    return start + timedelta(seconds=rng.randrange(int((end - start).total_seconds())))
+
+
+def insert_rows(session: Session, model, rows: List[dict], returning: bool = False) -> List[int]:
+    """Bulk insert in batches; with returning=True, return the new ids in row order"""
+    table = model.__table__
+    ids = []
+    for i in range(0, len(rows), BATCH_SIZE):
+        batch = rows[i:i + BATCH_SIZE]
+        if returning:
+            statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+            ids.extend(session.execute(statement, batch).scalars().all())
+        else:
+            session.execute(insert(table), batch)
+    return ids
+
+
+def generate_user(session: Session, rng: random.Random, user_id: int, units: Dict[str, int],
+                  start: datetime, end: datetime, scale: float) -> Counter:
+    """Insert one tenant's reference data and history; returns rows written per table"""
+    years = (end - start).days / 365.25
+    count = {kind: max(1, round(rate * years * scale)) for kind, rate in PER_YEAR.items()}
+    written = Counter()
+
+    def add(model, rows, returning=False):
+        written[model.__tablename__] += len(rows)
+        return insert_rows(session, model, rows, returning)
+
+    def when():
+        return random_datetime(rng, start, end)
+
+    # --- Reference data ---
+    ponds = add(Pond, [
+        {"name": f"Pond {i + 1}", "location": f"Block {rng.choice('ABCD')}", "size": f"{rng.randint(20, 200)} decimal", "user_id": user_id}
+        for i in range(rng.randint(4, 10))
+    ], returning=True)
+    categories = add(FishCategory, [{"name": name, "user_id": user_id} for name in ("Carp", "Catfish", "Other")], returning=True)
+    fish = add(Fish, [
+        {"name": name, "category_id": rng.choice(categories), "user_id": user_id}
+        for name in rng.sample(FISH, rng.randint(4, len(FISH)))
+    ], returning=True)
+    buyers = add(FishBuyer, [
+        {"name": f"Buyer {i + 1}", "phone": f"01{rng.randrange(10 ** 9):09d}", "address": None, "user_id": user_id}
+        for i in range(rng.randint(10, 40))
+    ], returning=True)
+    suppliers = add(Supplier, [
+        {"name": f"Supplier {i + 1}", "phone": f"01{rng.randrange(10 ** 9):09d}", "address": None, "user_id": user_id}
+        for i in range(rng.randint(3, 8))
+    ], returning=True)
+    feeds = add(FishFeed, [
+        {"name": f"Feed {i + 1}", "brand": rng.choice(["Mega", "Quality", "Nourish", "ACI"]), "description": None, "user_id": user_id}
+        for i in range(rng.randint(3, 6))
+    ], returning=True)
+    expense_types = add(ExpenseType, [{"name": name, "is_active": True, "user_id": user_id} for name in EXPENSE_TYPES], returning=True)
+    persons = add(Person, [
+        {"name": f"Person {i + 1}", "phone": None, "designation": None, "is_active": True, "user_id": user_id}
+        for i in range(rng.randint(2, 6))
+    ], returning=True)
+    organizations = add(Organization, [
+        {"name": f"Organization {i + 1}", "address": None, "contact_person": None, "phone": None, "is_active": True, "user_id": user_id}
+        for i in range(rng.randint(1, 4))
+    ], returning=True)
+    counterparties = {}
+    for model, type_field in ((Creditor, "creditor_type"), (Debtor, "debtor_type"), (Contributor, "contributor_type")):
+        counterparties[model] = add(model, [
+            {"name": f"{model.__name__} {i + 1}", "phone": None, type_field: None, "is_active": True, "user_id": user_id}
+            for i in range(rng.randint(3, 10))
+        ], returning=True)
+
+    # --- Sales ---
+    sales, sale_items = [], []
+    for _ in range(count["sales"]):
+        items = []
+        for _ in range(rng.choices((1, 2, 3, 4), weights=(4, 3, 2, 1))[0]):
+            quantity = round(rng.uniform(10, 400), 1)
+            rate = round(rng.uniform(120, 650))
+            items.append({
+                "pond_id": rng.choice(ponds),
+                "fish_id": rng.choice(fish),
+                "quantity": quantity,
+                "unit_id": units["kg"],
+                "rate_per_unit": rate,
+                "amount": round(quantity * rate, 2)
+            })
+        total = round(sum(item["amount"] for item in items), 2)
+        status = rng.choices(("paid", "partial", "due"), weights=(6, 3, 1))[0]
+        paid = total if status == "paid" else round(total * rng.uniform(0.2, 0.9), 2) if status == "partial" else 0.0
+        buyer_id = rng.choice(buyers) if rng.random() < 0.85 else None
+        sales.append({
+            "date": when(),
+            "buyer_name": None if buyer_id else f"Walk-in {rng.randint(1, 500)}",
+            "buyer_id": buyer_id,
+            "sale_type": "detailed",
+            "payment_status": status,
+            "total_amount": total,
+            "paid_amount": paid,
+            "due_amount": round(total - paid, 2),
+            "total_weight": round(sum(item["quantity"] for item in items), 1),
+            "user_id": user_id
+        })
+        sale_items.append(items)
+    for sale_id, items in zip(add(FishSale, sales, returning=True), sale_items):
+        for item in items:
+            item["sale_id"] = sale_id
+    add(FishSaleItem, [item for items in sale_items for item in items])
+
+    add(FishBuyerTransaction, [
+        {"buyer_id": rng.choice(buyers), "date": when(), "amount": round(rng.uniform(1000, 50000), 2),
+         "transaction_type": "payment", "note": None, "user_id": user_id}
+        for _ in range(count["buyer_payments"])
+    ])
+
+    # --- Feed, labor and suppliers ---
+    feed_purchases = []
+    for _ in range(count["feed_purchases"]):
+        quantity, price = rng.randint(1, 60), round(rng.uniform(900, 1600))
+        feed_purchases.append({
+            "pond_id": rng.choice(ponds) if rng.random() < 0.9 else None,
+            "supplier_id": rng.choice(suppliers),
+            "feed_id": rng.choice(feeds),
+            "date": when(),
+            "quantity": quantity,
+            "unit_id": units["pcs"],
+            "price_per_unit": price,
+            "total_amount": quantity * price,
+            "description": None,
+            "user_id": user_id
+        })
+    add(PondFeedPurchase, feed_purchases)
+
+    feed_usages = []
+    for _ in range(count["feed_usages"]):
+        quantity, price = round(rng.uniform(5, 150), 1), round(rng.uniform(35, 65), 2)
+        feed_usages.append({
+            "pond_id": rng.choice(ponds),
+            "feed_id": rng.choice(feeds),
+            "date": when(),
+            "quantity": quantity,
+            "unit_id": units["kg"],
+            "price_per_unit": price,
+            "total_cost": round(quantity * price, 2),
+            "user_id": user_id
+        })
+    add(PondFeedUsage, feed_usages)
+
+    add(LaborCost, [
+        {"date": when(), "amount": round(rng.uniform(300, 6000)), "worker_count": rng.randint(1, 8),
+         "description": None, "pond_id": rng.choice(ponds) if rng.random() < 0.8 else None, "user_id": user_id}
+        for _ in range(count["labor"])
+    ])
+
+    add(SupplierTransaction, [
+        {"supplier_id": rng.choice(suppliers), "date": when(),
+         "transaction_type": rng.choices(("purchase_credit", "payment", "purchase_cash"), weights=(4, 4, 2))[0],
+         "amount": round(rng.uniform(2000, 80000), 2), "description": None}
+        for _ in range(count["supplier_transactions"])
+    ])
+
+    # --- Household books ---
+    add(Expense, [
+        {"amount": round(rng.lognormvariate(6.5, 1.0), 2), "description": None, "date": when(),
+         "expense_type_id": rng.choice(expense_types) if rng.random() < 0.9 else None, "user_id": user_id}
+        for _ in range(count["expenses"])
+    ])
+    add(Income, [
+        {"person_id": rng.choice(persons), "organization_id": rng.choice(organizations),
+         "amount": round(rng.uniform(5000, 90000), 2), "date": when(),
+         "income_type": rng.choices(INCOME_TYPES, weights=(8, 1, 1, 1, 1))[0], "note": None, "user_id": user_id}
+        for _ in range(count["incomes"])
+    ])
+
+    for model, entry, fk, types in (
+        (Creditor, Transaction, "creditor_id", ("BORROW", "REPAY")),
+        (Debtor, DebtorTransaction, "debtor_id", ("LEND", "RECEIVE")),
+        (Contributor, ContributorTransaction, "contributor_id", ("CONTRIBUTE", "RETURN")),
+    ):
+        add(entry, [
+            {fk: rng.choice(counterparties[model]), "amount": round(rng.uniform(1000, 100000), 2),
+             "type": rng.choices(types, weights=(3, 2))[0], "date": when(), "note": None}
+            for _ in range(count["ledger_transactions"])
+        ])
+
+    return written
+
+
+def prepare_schema():
+    """Migrate an existing database; give an empty one the current schema directly"""
+    if inspect(engine).get_table_names():
+        apply_migrations()
+        create_db_and_tables()
+    else:
+        create_db_and_tables()
+        stamp_head()
+    seed_units()
+
+
+def generate(users: int, years: float, scale: float, seed: int, end: date, prefix: str, password: str) -> Counter:
+    prepare_schema()
+
+    end_dt = datetime.combine(end, datetime.max.time()).replace(microsecond=0)
+    start_dt = end_dt - timedelta(days=round(365.25 * years))
+    emails = [f"{prefix}{index:05d}@example.com" for index in range(users)]
+    password_hash = pwd_context.hash(password)
+    written = Counter()
+
+    with Session(engine) as session:
+        taken = session.exec(select(User.email).where(User.email.in_(emails))).all()
+        if taken:
+            raise SystemExit(f"{len(taken)} users with prefix '{prefix}' already exist; use another --prefix or a fresh database")
+        units = {unit.name: unit.id for unit in session.exec(select(Unit).where(Unit.is_default == True)).all()}
+
+        for index, email in enumerate(emails):
+            started = time.perf_counter()
+            user_id = insert_rows(session, User, [{"email": email, "password_hash": password_hash}], returning=True)[0]
+            rows = generate_user(session, random.Random(f"{seed}:{index}"), user_id, units, start_dt, end_dt, scale)
+            session.commit()
+
+            # Derived tables, exactly as the routers would have maintained them
+            rows["fishsaledaily"] += rollups.rebuild(session, user_id)
+            balances.reconcile(session, repair=True, user_id=user_id)
+
+            written += rows
+            print(f"  {email}: {sum(rows.values()):,} rows in {time.perf_counter() - started:.1f}s")
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the database with a synthetic, reproducible farm dataset")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--years", type=float, default=3, help="History length ending at --end")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the per-year row volumes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="Last day of history (YYYY-MM-DD)")
+    parser.add_argument("--prefix", default="load", help="Email prefix of the generated users")
+    parser.add_argument("--password", default="loadtest", help="Password of every generated user")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = generate(args.users, args.years, args.scale, args.seed, args.end, args.prefix, args.password)
+    elapsed = time.perf_counter() - started
+
+    for table, rows in sorted(written.items(), key=lambda item: -item[1]):
+        print(f"{table:<24}{rows:>12,}")
+    total = sum(written.values())
+    print(f"✅ Wrote {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
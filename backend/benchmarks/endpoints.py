@@ -0,0 +1,213 @@
+"""
+Endpoint latency and query-count benchmarks
+
+Boots the API in-process against a synthetic dataset (benchmarks.dataset)
+and drives the heavy read endpoints concurrently through an ASGI client,
+rotating between the generated users. For every endpoint it reports
+p50/p95/p99 latency, throughput and SQL statements per request (from the
+X-Query-Count header). The response cache is off unless --cache is given,
+so the numbers reflect the work behind each endpoint.
+
+    python -m benchmarks.endpoints [--requests 200] [--concurrency 8] [--update-baseline]
+
+Without --database the dataset goes to a SQLite file in the temp directory,
+generated on first use and reused afterwards. Results are compared with
+the JSON baseline: the run fails when an endpoint's p95 grows by more than
+--threshold or it issues more statements than before. Latency baselines are
+machine specific; record one with --update-baseline before comparing.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Dict, List
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# name -> path; {pond_id}, {fish_id} and {category_id} are filled per user
+ENDPOINTS = {
+    "gher_dashboard": "/gher/dashboard/stats",
+    "income_dashboard": "/income-dashboard/stats",
+    "expense_overview": "/expenses/stats/overview",
+    "fish_buyers": "/fish-buyers",
+    "fish_sales": "/fish-sales",
+    "fish_sales_page": "/fish-sales?limit=100",
+    "pond_stats": "/ponds/{pond_id}/stats",
+    "all_pond_stats": "/ponds/stats",
+    "fish_stats": "/fishes/{fish_id}/stats",
+    "category_stats": "/fish-categories/{category_id}/stats",
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], queries: List[int], elapsed: float) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+        "max_queries": max(queries),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Regressions of results against baseline, as human-readable lines"""
+    failures = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        if current["queries_per_request"] > previous["queries_per_request"]:
+            failures.append(f"{name}: {current['queries_per_request']} queries/request (baseline {previous['queries_per_request']})")
+        if current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            failures.append(f"{name}: p95 {current['p95_ms']} ms (baseline {previous['p95_ms']} ms, +{threshold:.0%} allowed)")
+    return failures
+
+
+async def run(args) -> dict:
+    import httpx
+    from sqlmodel import Session, select
+
+    from app.main import app
+    from app.auth import create_access_token
+    from app.database import engine
+    from app.instrumentation import QUERY_COUNT_HEADER
+    from app.models import User, Pond, Fish, FishCategory
+
+    # Per-user path parameters, so every request hits real rows
+    with Session(engine) as session:
+        users = session.exec(
+            select(User).where(User.email.like(f"{args.prefix}%")).order_by(User.id).limit(args.users)
+        ).all()
+        if not users:
+            raise SystemExit(f"No '{args.prefix}*' users in the database; generate them with python -m benchmarks.dataset")
+
+        def first_id(model, user):
+            return session.exec(select(model.id).where(model.user_id == user.id).order_by(model.id)).first()
+
+        tenants = [
+            {
+                "headers": {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"},
+                "params": {
+                    "pond_id": first_id(Pond, user),
+                    "fish_id": first_id(Fish, user),
+                    "category_id": first_id(FishCategory, user)
+                },
+            }
+            for user in users
+        ]
+
+    selected = {name: path for name, path in ENDPOINTS.items() if not args.only or name in args.only}
+    results = {"endpoints": {}, "requests": args.requests, "concurrency": args.concurrency, "users": len(tenants)}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, path in selected.items():
+            async def call(index):
+                tenant = tenants[index % len(tenants)]
+                url = path.format(**tenant["params"])
+                started = time.perf_counter()
+                response = await client.get(url, headers=tenant["headers"])
+                latency = time.perf_counter() - started
+                if response.status_code != 200:
+                    raise SystemExit(f"{name}: GET {url} returned {response.status_code}: {response.text[:200]}")
+                return latency, int(response.headers[QUERY_COUNT_HEADER])
+
+            for index in range(len(tenants) * 2):  # warm caches and connections
+                await call(index)
+
+            latencies, queries = [], []
+            next_index = iter(range(args.requests))
+
+            async def worker():
+                for index in next_index:
+                    latency, count = await call(index)
+                    latencies.append(latency)
+                    queries.append(count)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            results["endpoints"][name] = summarize(latencies, queries, time.perf_counter() - started)
+            stats = results["endpoints"][name]
+            print(f"{name:<20}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+                  f"{stats['throughput_rps']:>10.1f}{stats['queries_per_request']:>9.1f}")
+
+    return results
+
+
+def prepare_database(args):
+    """Point DATABASE_URL at the benchmark database, generating the dataset if needed"""
+    if not args.cache:
+        os.environ["RESPONSE_CACHE_TTL"] = "0"
+    if args.database:
+        os.environ["DATABASE_URL"] = args.database
+        return
+    name = f"payment-tracker-bench-{args.users}u-{args.years}y-{args.scale}x-{args.seed}-{args.end}.db"
+    path = os.path.join(tempfile.gettempdir(), name)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    if not os.path.exists(path):
+        from benchmarks.dataset import generate
+        print(f"Generating benchmark dataset at {path}")
+        generate(args.users, args.years, args.scale, args.seed, args.end, args.prefix, "loadtest")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the heavy read endpoints against a synthetic dataset")
+    parser.add_argument("--database", help="Existing database URL with a generated dataset (default: cached SQLite file)")
+    parser.add_argument("--users", type=int, default=3, help="Tenants to generate and rotate requests across")
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="Last day of generated history")
+    parser.add_argument("--prefix", default="load", help="Email prefix of the generated users")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache on (measures cache hits)")
+    parser.add_argument("--only", nargs="+", choices=sorted(ENDPOINTS), help="Benchmark only these endpoints")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare with or update")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative p95 growth before failing")
+    parser.add_argument("--output", help="Also write this run's results to this JSON file")
+    args = parser.parse_args()
+
+    prepare_database(args)
+    print(f"{'endpoint':<20}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'queries':>9}")
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {"endpoints": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update({key: value for key, value in results.items() if key != "endpoints"})
+        baseline["endpoints"].update(results["endpoints"])
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"✅ Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.threshold)
+        for failure in failures:
+            print(f"❌ {failure}")
+        if failures:
+            sys.exit(1)
+        print("✅ No regressions against the baseline")
+    else:
+        print(f"No baseline at {args.baseline}; record one with --update-baseline")
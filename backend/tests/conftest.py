@@ -0,0 +1,78 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before anything imports it
+_db_dir = tempfile.mkdtemp(prefix="payment-tracker-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+import pytest
+from sqlmodel import SQLModel, Session
+
+from app.database import engine
+import app.models  # noqa: F401  (registers every table on the metadata)
+
+engine.echo = False
+
+
+@pytest.fixture(scope="session", autouse=True)
+def create_tables():
+    SQLModel.metadata.create_all(engine)
+    yield
+    SQLModel.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def session():
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager: startup would run the Alembic migrations
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+def user(session):
+    """A fresh user per test, so tests never see each other's rows"""
+    from uuid import uuid4
+    from app.models import User
+    user = User(email=f"{uuid4().hex}@example.com", password_hash="unused")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    from app.auth import create_access_token
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+
+class FakeStore:
+    """Local stand-in for a shared key-value store such as Redis"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """Response cache (and ETags) on a store shared by all workers"""
+    from app import response_cache
+    backend = response_cache.KeyValueBackend(FakeStore(), ttl=60)
+    monkeypatch.setattr(response_cache, "backend", backend)
+    return backend
@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import database, response_cache
+from app.models import FishSale, FishSaleItem, Pond, PondFeedPurchase, Supplier, Unit
+from app.rollups import apply_sale
+
+
+def test_async_database_url():
+    assert database.async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert database.async_database_url("postgres://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert database.async_database_url("sqlite:///./database.db") == "sqlite+aiosqlite:///./database.db"
+
+
+def test_dashboard_matches_between_sync_and_async_engines(client, session, user, auth_headers, monkeypatch):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+    monkeypatch.setattr(response_cache, "backend", None)
+
+    unit = Unit(name="kg", user_id=user.id)
+    pond = Pond(name="North", location="x", user_id=user.id)
+    supplier = Supplier(name="Feeds Ltd", user_id=user.id)
+    session.add_all([unit, pond, supplier])
+    session.commit()
+    for i in range(8):
+        day = datetime.now() - timedelta(days=20 * i)
+        sale = FishSale(date=day, total_amount=100 + i, paid_amount=100 + i, user_id=user.id)
+        session.add(sale)
+        session.flush()
+        item = FishSaleItem(sale_id=sale.id, pond_id=pond.id, quantity=5, unit_id=unit.id, rate_per_unit=20, amount=100 + i)
+        session.add(item)
+        apply_sale(session, user.id, day, [item])
+        session.add(PondFeedPurchase(pond_id=pond.id, supplier_id=supplier.id, date=day, quantity=1, unit_id=unit.id,
+                                     price_per_unit=10, total_amount=10, user_id=user.id))
+    session.commit()
+
+    client.get("/ponds", headers=auth_headers)  # cache the user so both requests issue the same statements
+    sync_response = client.get("/gher/dashboard/stats", headers=auth_headers)
+    sync_stats = sync_response.json()
+
+    async_engine = create_async_engine(database.async_database_url(str(database.engine.url)))
+    monkeypatch.setattr(database, "async_engine", async_engine)
+    try:
+        async_response = client.get("/gher/dashboard/stats", headers=auth_headers)
+        async_stats = async_response.json()
+    finally:
+        asyncio.run(async_engine.dispose())
+
+    assert async_stats == sync_stats
+    # Gathered statements are still counted against the request
+    assert async_response.headers["X-Query-Count"] == sync_response.headers["X-Query-Count"]
+    assert sync_stats["summary"]["total_revenue"] == sum(100 + i for i in range(8))
@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.auth import create_access_token, get_password_hash, user_cache
+from app.database import engine
+from app.models import User
+
+
+@contextmanager
+def user_lookups():
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and 'FROM "user"' in statement.replace("FROM user", 'FROM "user"'):
+            seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_repeat_requests_reuse_the_cached_user(client, user, auth_headers):
+    hits = user_cache.hits
+    with user_lookups() as lookups:
+        for _ in range(3):
+            assert client.get("/ponds", headers=auth_headers).status_code == 200
+    assert len(lookups) == 1
+    assert user_cache.hits == hits + 2
+
+
+def test_password_reset_invalidates_the_cached_user(client, session, user, auth_headers):
+    client.get("/ponds", headers=auth_headers)
+    response = client.post("/forgot-password", json={
+        "username": user.email, "new_password": "s3cret!", "confirm_password": "s3cret!"
+    })
+    assert response.status_code == 200
+    with user_lookups() as lookups:
+        client.get("/ponds", headers=auth_headers)
+    assert len(lookups) == 1
+
+
+def test_email_change_retires_the_old_subject(client, session):
+    user = User(email="old@example.com", password_hash=get_password_hash("pw"))
+    session.add(user)
+    session.commit()
+    old_token = {"Authorization": f"Bearer {create_access_token({'sub': 'old@example.com'})}"}
+    assert client.get("/ponds", headers=old_token).status_code == 200
+
+    user.email = "new@example.com"
+    session.add(user)
+    session.commit()
+
+    assert client.get("/ponds", headers=old_token).status_code == 401
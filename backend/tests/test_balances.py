@@ -0,0 +1,126 @@
+import pytest
+
+from app import balances
+from app.models import Creditor, Debtor, Contributor, FishBuyer, Supplier, Unit
+
+# (counterparty model, create path, entry path, foreign key, increase type, decrease type, total fields)
+TYPED_LEDGERS = {
+    "creditor": (Creditor, "/creditors", "/transactions", "creditor_id", "BORROW", "REPAY",
+                 ("total_borrowed", "total_repaid")),
+    "debtor": (Debtor, "/debtors", "/debtor-transactions", "debtor_id", "LEND", "RECEIVE",
+               ("total_lent", "total_received")),
+    "contributor": (Contributor, "/contributors", "/contributor-transactions", "contributor_id", "CONTRIBUTE", "RETURN",
+                    ("total_contributed", "total_returned")),
+}
+
+
+def totals(session, model, obj_id, fields):
+    session.expire_all()
+    obj = session.get(model, obj_id)
+    return tuple(getattr(obj, field) for field in fields)
+
+
+@pytest.mark.parametrize("ledger", TYPED_LEDGERS)
+def test_transactions_move_the_balance(ledger, client, session, user, auth_headers):
+    model, create_path, entry_path, fk, increase, decrease, (increase_total, decrease_total) = TYPED_LEDGERS[ledger]
+    fields = (increase_total, decrease_total, "balance")
+    # Totals sent by the client are ignored
+    counterparty = client.post(create_path, json={"name": "Karim", "balance": 999}, headers=auth_headers).json()
+    assert totals(session, model, counterparty["id"], fields) == (0, 0, 0)
+
+    entry = {fk: counterparty["id"], "amount": 1000, "type": increase, "date": "2026-03-01T08:00:00Z"}
+    first = client.post(entry_path, json=entry, headers=auth_headers).json()
+    second = client.post(entry_path, json={**entry, "amount": 300, "type": decrease}, headers=auth_headers).json()
+    assert totals(session, model, counterparty["id"], fields) == (1000, 300, 700)
+
+    # Changing the amount and the type swaps the old entry for the new one
+    response = client.put(f"{entry_path}/{first['id']}", json={**entry, "amount": 1200}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert totals(session, model, counterparty["id"], fields) == (1200, 300, 900)
+    response = client.put(f"{entry_path}/{second['id']}", json={**entry, "amount": 100}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert totals(session, model, counterparty["id"], fields) == (1300, 0, 1300)
+
+    assert client.delete(f"{entry_path}/{first['id']}", headers=auth_headers).status_code == 200
+    assert totals(session, model, counterparty["id"], fields) == (100, 0, 100)
+    assert client.delete(f"{entry_path}/{second['id']}", headers=auth_headers).status_code == 200
+    assert totals(session, model, counterparty["id"], fields) == (0, 0, 0)
+    assert balances.reconcile(session, user_id=user.id) == []
+
+
+def test_supplier_transactions_move_the_balance(client, session, user, auth_headers):
+    fields = ("total_credit", "total_paid", "balance")
+    supplier = client.post("/suppliers", json={"name": "Feed Co"}, headers=auth_headers).json()
+
+    def transaction(transaction_type, amount):
+        body = {"supplier_id": supplier["id"], "date": "2026-03-01T08:00:00", "transaction_type": transaction_type,
+                "amount": amount}
+        return client.post("/supplier-transactions", json=body, headers=auth_headers).json()
+
+    credit = transaction("purchase_credit", 1000)
+    payment = transaction("payment", 400)
+    cash = transaction("purchase_cash", 250)  # Paid on the spot, so it owes nothing
+    assert totals(session, Supplier, supplier["id"], fields) == (1000, 400, 600)
+
+    assert client.delete(f"/supplier-transactions/{cash['id']}", headers=auth_headers).status_code == 200
+    assert client.delete(f"/supplier-transactions/{payment['id']}", headers=auth_headers).status_code == 200
+    assert totals(session, Supplier, supplier["id"], fields) == (1000, 0, 1000)
+    assert client.delete(f"/supplier-transactions/{credit['id']}", headers=auth_headers).status_code == 200
+    assert totals(session, Supplier, supplier["id"], fields) == (0, 0, 0)
+    assert balances.reconcile(session, user_id=user.id) == []
+
+
+def test_sales_and_payments_move_the_buyer_balance(client, session, user, auth_headers):
+    fields = ("total_bought", "total_paid", "balance")
+    unit = Unit(name="kg", user_id=user.id)
+    session.add(unit)
+    session.commit()
+    buyer = client.post("/fish-buyers", json={"name": "Karim"}, headers=auth_headers).json()
+
+    # An advance, with no open sale to settle it onto
+    response = client.post(f"/fish-buyers/{buyer['id']}/transactions", headers=auth_headers, json={
+        "date": "2026-03-01T08:00:00", "amount": 100, "transaction_type": "payment", "buyer_id": buyer["id"]
+    })
+    assert response.status_code == 200, response.text
+    assert totals(session, FishBuyer, buyer["id"], fields) == (0, 100, -100)
+
+    def sale(total, paid):
+        item = {"quantity": 10, "unit_id": unit.id, "rate_per_unit": total / 10, "amount": total}
+        return {"date": "2026-03-02T08:00:00", "buyer_id": buyer["id"], "payment_status": "credit",
+                "total_amount": total, "paid_amount": paid, "items": [item]}
+
+    created = client.post("/fish-sales", json=sale(1000, 200), headers=auth_headers).json()
+    assert totals(session, FishBuyer, buyer["id"], fields) == (1000, 300, 700)
+    response = client.put(f"/fish-sales/{created['id']}", json=sale(1500, 500), headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert totals(session, FishBuyer, buyer["id"], fields) == (1500, 600, 900)
+    assert client.delete(f"/fish-sales/{created['id']}", headers=auth_headers).status_code == 200
+    assert totals(session, FishBuyer, buyer["id"], fields) == (0, 100, -100)
+    assert balances.reconcile(session, user_id=user.id) == []
+
+
+def test_reconcile_reports_and_repairs_drift(client, session, user, auth_headers):
+    creditor = client.post("/creditors", json={"name": "Bank"}, headers=auth_headers).json()
+    client.post("/transactions", json={"creditor_id": creditor["id"], "amount": 500, "type": "BORROW"},
+                headers=auth_headers)
+    buyer = client.post("/fish-buyers", json={"name": "Karim"}, headers=auth_headers).json()
+    assert balances.reconcile(session, user_id=user.id) == []
+
+    # Corrupt the stored totals behind the routers' back
+    session.get(Creditor, creditor["id"]).balance = 10
+    session.get(FishBuyer, buyer["id"]).total_paid = 75
+    session.commit()
+
+    drift = balances.reconcile(session, user_id=user.id)
+    assert sorted((entry["kind"], entry["id"]) for entry in drift) == [("creditor", creditor["id"]), ("fish_buyer", buyer["id"])]
+    by_kind = {entry["kind"]: entry for entry in drift}
+    assert by_kind["creditor"]["stored"]["balance"] == 10
+    assert by_kind["creditor"]["expected"] == {"total_borrowed": 500, "total_repaid": 0, "balance": 500}
+    assert by_kind["fish_buyer"]["expected"]["total_paid"] == 0
+
+    # Checking alone changes nothing; repair writes the expected values
+    assert len(balances.reconcile(session, user_id=user.id)) == 2
+    assert len(balances.reconcile(session, repair=True, user_id=user.id)) == 2
+    assert balances.reconcile(session, user_id=user.id) == []
+    assert totals(session, Creditor, creditor["id"], ("total_borrowed", "total_repaid", "balance")) == (500, 0, 500)
+    assert totals(session, FishBuyer, buyer["id"], ("total_bought", "total_paid", "balance")) == (0, 0, 0)
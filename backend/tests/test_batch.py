@@ -0,0 +1,107 @@
+from sqlmodel import select
+
+from app import balances
+from app.models import FishBuyer, FishSale, LaborCost, Pond, Unit
+
+
+def setup_farm(session, user):
+    pond = Pond(name="North", location="x", user_id=user.id)
+    unit = Unit(name="kg", user_id=user.id)
+    buyer = FishBuyer(name="Karim", user_id=user.id)
+    session.add_all([pond, unit, buyer])
+    session.commit()
+    return pond, unit, buyer
+
+
+def field_visit(pond, unit, buyer):
+    """A sale on credit, the buyer's payment and the day's labor"""
+    return [
+        {"method": "POST", "path": "/fish-sales", "body": {
+            "date": "2026-03-01T08:00:00", "buyer_id": buyer.id, "payment_status": "credit",
+            "total_amount": 2000, "paid_amount": 0,
+            "items": [{"pond_id": pond.id, "quantity": 10, "unit_id": unit.id, "rate_per_unit": 200, "amount": 2000}]
+        }},
+        {"method": "POST", "path": f"/fish-buyers/{buyer.id}/transactions", "body": {
+            "date": "2026-03-01T09:00:00", "amount": 500, "transaction_type": "payment", "buyer_id": buyer.id
+        }},
+        {"method": "POST", "path": "/labor-costs", "body": {
+            "date": "2026-03-01T10:00:00", "amount": 300, "worker_count": 3, "pond_id": pond.id
+        }},
+    ]
+
+
+def test_operations_commit_together(client, session, user, auth_headers):
+    pond, unit, buyer = setup_farm(session, user)
+
+    response = client.post("/batch", json={"operations": field_visit(pond, unit, buyer)}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["committed"] is True
+    assert [result["status"] for result in body["results"]] == [200, 200, 200]
+    assert body["results"][2]["body"]["amount"] == 300
+
+    session.refresh(buyer)
+    assert buyer.total_bought == 2000
+    assert balances.reconcile(session, user_id=user.id) == []
+    sale = session.exec(select(FishSale).where(FishSale.user_id == user.id)).one()
+    session.refresh(sale)
+    assert (sale.paid_amount, sale.payment_status) == (500, "partial")  # the payment settled onto the sale
+    assert session.exec(select(LaborCost).where(LaborCost.user_id == user.id)).one().worker_count == 3
+
+
+def test_a_failing_operation_rolls_back_the_batch(client, session, user, auth_headers):
+    pond, unit, buyer = setup_farm(session, user)
+    operations = field_visit(pond, unit, buyer)
+    operations[2]["path"] = "/labor-costs/999999"
+    operations[2]["method"] = "PUT"
+
+    response = client.post("/batch", json={"operations": operations}, headers=auth_headers)
+    assert response.status_code == 404
+    body = response.json()
+    assert (body["committed"], body["failed_operation"]) == (False, 2)
+    assert [result["status"] for result in body["results"]] == [200, 200, 404]
+
+    assert session.exec(select(FishSale).where(FishSale.user_id == user.id)).all() == []
+    session.refresh(buyer)
+    assert (buyer.total_bought, buyer.total_paid, buyer.balance) == (0, 0, 0)
+
+
+def test_validation_errors_are_reported_per_operation(client, session, user, auth_headers):
+    response = client.post("/batch", json={"operations": [
+        {"method": "POST", "path": "/ponds", "body": {"name": "South", "location": "y"}},
+        {"method": "POST", "path": "/fish-sales", "body": {"date": "2026-03-01"}},
+    ]}, headers=auth_headers)
+    assert response.status_code == 422
+    assert response.json()["failed_operation"] == 1
+    assert session.exec(select(Pond).where(Pond.user_id == user.id)).all() == []
+
+
+def test_batches_are_authenticated_once_and_not_nested(monkeypatch, client, session, user, auth_headers):
+    from app import auth
+
+    pond, unit, buyer = setup_farm(session, user)
+    verified = []
+    verify_token = auth.verify_token
+    monkeypatch.setattr(auth, "verify_token", lambda *args, **kwargs: verified.append(1) or verify_token(*args, **kwargs))
+    client.post("/batch", json={"operations": field_visit(pond, unit, buyer)}, headers=auth_headers)
+    assert len(verified) == 1
+
+    assert client.post("/batch", json={"operations": [
+        {"method": "POST", "path": "/ponds", "body": {"name": "South", "location": "y"}}
+    ]}).status_code == 401
+    response = client.post("/batch", json={"operations": [{"method": "POST", "path": "/batch", "body": {}}]},
+                           headers=auth_headers)
+    assert response.status_code == 422
+    assert client.post("/batch", json={"operations": []}, headers=auth_headers).status_code == 422
+
+
+def test_cached_responses_see_the_committed_batch(shared_cache, client, session, user, auth_headers):
+    pond, unit, buyer = setup_farm(session, user)
+    before = client.get("/ponds/stats", headers=auth_headers)
+    assert before.json()[0]["total_labor"] == 0
+
+    client.post("/batch", json={"operations": field_visit(pond, unit, buyer)}, headers=auth_headers)
+
+    after = client.get("/ponds/stats", headers={**auth_headers, "If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.json()[0]["total_labor"] == 300
@@ -0,0 +1,25 @@
+from benchmarks.endpoints import compare, percentile, summarize
+
+
+def test_summary_percentiles():
+    latencies = [i / 1000 for i in range(1, 101)]
+    stats = summarize(latencies, [3] * 99 + [4], elapsed=2.0)
+    assert (stats["p50_ms"], stats["p95_ms"], stats["p99_ms"]) == (50.0, 95.0, 99.0)
+    assert stats["throughput_rps"] == 50.0
+    assert stats["queries_per_request"] == 3.01 and stats["max_queries"] == 4
+    assert percentile([0.5], 99) == 0.5
+
+
+def test_compare_flags_latency_and_query_regressions():
+    baseline = {"endpoints": {
+        "a": {"p95_ms": 100.0, "queries_per_request": 3.0},
+        "b": {"p95_ms": 100.0, "queries_per_request": 3.0},
+    }}
+    results = {"endpoints": {
+        "a": {"p95_ms": 120.0, "queries_per_request": 3.0},   # within 25%
+        "b": {"p95_ms": 130.0, "queries_per_request": 4.0},
+        "new": {"p95_ms": 1000.0, "queries_per_request": 50.0},  # no baseline yet
+    }}
+    failures = compare(results, baseline, threshold=0.25)
+    assert len(failures) == 2
+    assert all(failure.startswith("b:") for failure in failures)
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+
+from app import response_cache
+from app.conditional import _matches
+from app.models import Pond
+
+
+@pytest.fixture(autouse=True)
+def cache_backend(shared_cache):
+    return shared_cache
+
+
+def revalidate(client, path, response, headers):
+    return client.get(path, headers={**headers, "If-None-Match": response.headers["ETag"]})
+
+
+def test_unchanged_data_answers_304_without_queries(client, session, user, auth_headers):
+    session.add(Pond(name="P", location="x", user_id=user.id))
+    session.commit()
+
+    first = client.get("/ponds", headers=auth_headers)
+    assert first.headers["ETag"].startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    again = revalidate(client, "/ponds", first, auth_headers)
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert again.headers["X-Query-Count"] == "0"
+
+    # Other parameters are another representation
+    other = client.get("/ponds/stats", headers={**auth_headers, "If-None-Match": first.headers["ETag"]})
+    assert other.status_code == 200
+
+
+def test_writes_change_the_etag_of_tables_they_touch(client, session, user, auth_headers):
+    pond = Pond(name="P", location="x", user_id=user.id)
+    session.add(pond)
+    session.commit()
+    ponds = client.get("/ponds", headers=auth_headers)
+    units = client.get("/units", headers=auth_headers)
+
+    response = client.post("/labor-costs", json={
+        "date": datetime(2026, 3, 1).isoformat(), "amount": 250, "worker_count": 2, "pond_id": pond.id
+    }, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    # The ponds router reads labor costs for its stats; units do not
+    refreshed = revalidate(client, "/ponds", ponds, auth_headers)
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != ponds.headers["ETag"]
+    assert revalidate(client, "/units", units, auth_headers).status_code == 304
+
+
+def test_tags_are_per_user(client, session, user, auth_headers):
+    from app.auth import create_access_token
+    from app.models import User
+
+    other = User(email=f"other-{user.email}", password_hash="unused")
+    session.add(other)
+    session.commit()
+    other_headers = {"Authorization": f"Bearer {create_access_token({'sub': other.email})}"}
+
+    mine = client.get("/units", headers=auth_headers)
+    assert revalidate(client, "/units", mine, other_headers).status_code == 200
+
+
+def test_writes_are_never_conditional(client, auth_headers):
+    response = client.post("/ponds", json={"name": "New", "location": "y"}, headers={**auth_headers, "If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_disabled_with_the_response_cache(monkeypatch, client, auth_headers):
+    monkeypatch.setattr(response_cache, "backend", None)
+    assert "ETag" not in client.get("/units", headers=auth_headers).headers
+
+
+def test_disabled_with_per_worker_versions(monkeypatch, client, auth_headers):
+    # Another worker's writes would not change the tag
+    monkeypatch.setattr(response_cache, "backend", response_cache.MemoryBackend(maxsize=64, ttl=60))
+    response = client.get("/units", headers={**auth_headers, "If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_if_none_match_lists_use_weak_comparison():
+    assert _matches('"abc"', 'W/"abc"')
+    assert _matches('W/"x", W/"abc"', 'W/"abc"')
+    assert _matches("*", 'W/"abc"')
+    assert not _matches('W/"abd"', 'W/"abc"')
+    assert not _matches(None, 'W/"abc"')
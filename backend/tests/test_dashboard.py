@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from app.models import FishSale, Pond, PondFeedPurchase, Supplier, Unit
+
+
+def add_history(session, user):
+    pond = Pond(name="North", location="x", user_id=user.id)
+    supplier = Supplier(name="Feed Co", user_id=user.id)
+    unit = Unit(name="kg", user_id=user.id)
+    session.add_all([pond, supplier, unit])
+    session.commit()
+    for date, amount in (
+        (datetime(2025, 11, 5), 70.0),     # Before the window and the trend
+        (datetime(2026, 1, 10), 100.0),
+        (datetime(2026, 3, 5), 200.0),
+        (datetime(2026, 5, 20), 300.0),
+        (datetime(2026, 6, 3), 400.0),
+        (datetime(2026, 6, 20), 500.0),    # After end_date, still in June
+        (datetime(2026, 7, 1), 50.0),      # After June altogether
+    ):
+        session.add(FishSale(date=date, total_amount=amount, user_id=user.id))
+    for date, amount in ((datetime(2026, 1, 2), 40.0), (datetime(2026, 6, 1), 60.0)):
+        session.add(PondFeedPurchase(pond_id=pond.id, supplier_id=supplier.id, unit_id=unit.id, date=date,
+                                     quantity=1, price_per_unit=amount, total_amount=amount, user_id=user.id))
+    session.commit()
+
+
+def test_dashboard_totals_and_gap_filled_trends(client, session, user, auth_headers):
+    add_history(session, user)
+
+    body = client.get(
+        "/gher/dashboard/stats",
+        params={"start_date": "2026-01-01T00:00:00", "end_date": "2026-06-15T00:00:00"},
+        headers=auth_headers
+    ).json()
+
+    # Window totals respect both bounds; the month figures count everything
+    # from the first of end_date's month on, as the per-month queries did
+    assert body["summary"]["total_revenue"] == 1000.0
+    assert body["summary"]["total_expenses"] == 100.0
+    assert body["summary"]["month_sales"] == 950.0
+    assert body["summary"]["month_expenses"] == 60.0
+    assert body["summary"]["month_profit"] == 890.0
+
+    assert body["trends"]["monthly_sales"] == [
+        {"month": "Jan 2026", "amount": 100.0},
+        {"month": "Feb 2026", "amount": 0.0},
+        {"month": "Mar 2026", "amount": 200.0},
+        {"month": "Apr 2026", "amount": 0.0},
+        {"month": "May 2026", "amount": 300.0},
+        {"month": "Jun 2026", "amount": 900.0},
+    ]
+    assert [m["amount"] for m in body["trends"]["monthly_expenses"]] == [40.0, 0.0, 0.0, 0.0, 0.0, 60.0]
+
+
+def test_dashboard_without_a_window(client, session, user, auth_headers):
+    add_history(session, user)
+
+    body = client.get("/gher/dashboard/stats", params={"end_date": "2026-03-31T23:59:59"}, headers=auth_headers).json()
+
+    assert body["summary"]["total_revenue"] == 370.0
+    assert body["summary"]["month_sales"] == 1450.0
+    assert [m["month"] for m in body["trends"]["monthly_sales"]] == [
+        "Oct 2025", "Nov 2025", "Dec 2025", "Jan 2026", "Feb 2026", "Mar 2026"
+    ]
+    assert [m["amount"] for m in body["trends"]["monthly_sales"]] == [0.0, 70.0, 0.0, 100.0, 0.0, 200.0]
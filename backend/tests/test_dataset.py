@@ -0,0 +1,38 @@
+import random
+from datetime import datetime
+
+from sqlmodel import select, func
+
+from app import balances, rollups
+from app.models import FishSale, FishSaleItem, Unit
+from benchmarks.dataset import generate_user
+
+
+def test_generated_tenant_is_consistent(client, session, user, auth_headers):
+    units = {}
+    for name in ("kg", "pcs"):
+        unit = Unit(name=name, user_id=user.id)
+        session.add(unit)
+        session.commit()
+        units[name] = unit.id
+
+    written = generate_user(session, random.Random("test"), user.id, units,
+                            datetime(2025, 1, 1), datetime(2026, 1, 1), scale=0.02)
+    session.commit()
+    rollups.rebuild(session, user.id)
+    balances.reconcile(session, repair=True, user_id=user.id)
+
+    assert written["fishsale"] == 42
+    assert written["fishsaleitem"] == session.exec(
+        select(func.count(FishSaleItem.id)).join(FishSale).where(FishSale.user_id == user.id)
+    ).one()
+    assert balances.reconcile(session, user_id=user.id) == []
+
+    # Sale totals add up to their items, as the API would have stored them
+    item_total = session.exec(
+        select(func.sum(FishSaleItem.amount)).join(FishSale).where(FishSale.user_id == user.id)
+    ).one()
+    pond_stats = client.get("/ponds/stats", headers=auth_headers).json()
+    assert round(sum(stats["total_sales"] for stats in pond_stats), 2) == round(item_total, 2)
+    sale_total = session.exec(select(func.sum(FishSale.total_amount)).where(FishSale.user_id == user.id)).one()
+    assert round(sale_total, 2) == round(item_total, 2)
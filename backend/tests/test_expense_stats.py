@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from app.models import Expense, ExpenseType
+
+
+def add_expenses(session, user):
+    feed = ExpenseType(name="Feed", user_id=user.id)
+    session.add(feed)
+    session.commit()
+    for date, amount, type_id in (
+        (datetime(2025, 11, 5), 100.0, feed.id),
+        (datetime(2025, 12, 20), 50.0, None),
+        (datetime(2026, 2, 1), 30.0, feed.id),
+        (datetime(2026, 2, 14), 20.0, feed.id),
+    ):
+        session.add(Expense(amount=amount, date=date, expense_type_id=type_id, user_id=user.id))
+    session.commit()
+
+
+def test_year_overview(client, session, user, auth_headers):
+    add_expenses(session, user)
+
+    body = client.get("/expenses/stats/overview", params={"year": 2026}, headers=auth_headers).json()
+
+    assert body["total_spent_year"] == 50.0
+    assert body["max_monthly_spend"] == 50.0
+    assert [m["name"] for m in body["bar_chart_data"]][:3] == ["Jan", "Feb", "Mar"]
+    assert len(body["bar_chart_data"]) == 12
+    assert body["bar_chart_data"][1]["amount"] == 50.0
+    assert body["pie_chart_data"] == [{"name": "Feed", "value": 50.0}]
+
+
+def test_window_spanning_years(client, session, user, auth_headers):
+    add_expenses(session, user)
+
+    body = client.get(
+        "/expenses/stats/overview",
+        params={"start_date": "2025-11-01T00:00:00", "end_date": "2026-02-28T23:59:59"},
+        headers=auth_headers
+    ).json()
+
+    assert body["bar_chart_data"] == [
+        {"name": "Nov 2025", "amount": 100.0},
+        {"name": "Dec 2025", "amount": 50.0},
+        {"name": "Jan 2026", "amount": 0.0},
+        {"name": "Feb 2026", "amount": 50.0},
+    ]
+    assert body["total_spent_year"] == 200.0
+    assert body["avg_monthly_spend"] == 50.0
+    assert body["pie_chart_data"] == [
+        {"name": "Feed", "value": 150.0},
+        {"name": "Uncategorized", "value": 50.0},
+    ]
+
+
+def test_window_bounds_with_an_offset_are_converted_to_utc(client, session, user, auth_headers):
+    add_expenses(session, user)
+
+    # Local (UTC+6) Feb 1 05:00 to Feb 14 05:59:59 is UTC Jan 31 23:00 to Feb 13 23:59:59
+    body = client.get(
+        "/expenses/stats/overview",
+        params={"start_date": "2026-02-01T05:00:00+06:00", "end_date": "2026-02-14T05:59:59+06:00"},
+        headers=auth_headers
+    ).json()
+
+    assert body["total_spent_year"] == 30.0
+    assert [m["name"] for m in body["bar_chart_data"]] == ["Jan", "Feb"]
@@ -0,0 +1,100 @@
+import csv
+import gzip
+import io
+import json
+import random
+from datetime import datetime
+
+import pytest
+from sqlmodel import select, func
+
+from app import exports
+from app.models import Unit
+from benchmarks.dataset import generate_user
+
+
+@pytest.fixture
+def tenant(session, user):
+    units = {}
+    for name in ("kg", "pcs"):
+        unit = Unit(name=name, user_id=user.id)
+        session.add(unit)
+        session.commit()
+        units[name] = unit.id
+    generate_user(session, random.Random("exports"), user.id, units,
+                  datetime(2025, 1, 1), datetime(2026, 1, 1), scale=0.01)
+    session.commit()
+    return user
+
+
+def expected_rows(session, ledger, user_id, **window):
+    query = exports.ledger_query(ledger, user_id, **window)
+    return session.exec(select(func.count()).select_from(query.subquery())).one()
+
+
+@pytest.mark.parametrize("ledger", sorted(exports.LEDGERS))
+def test_every_ledger_exports_as_csv_and_ndjson(ledger, client, session, tenant, auth_headers):
+    count = expected_rows(session, ledger, tenant.id)
+    assert count > 0
+
+    response = client.get(f"/exports/{ledger}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    assert f'filename="{ledger}.csv"' in response.headers["content-disposition"]
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert len(rows) == count + 1
+
+    response = client.get(f"/exports/{ledger}", params={"format": "ndjson"}, headers=auth_headers)
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == count
+    assert list(records[0]) == rows[0]
+    dates = [record["date"] for record in records]
+    assert dates == sorted(dates)
+
+
+def test_date_window_and_gzip(client, session, tenant, auth_headers):
+    window = {"start_date": datetime(2025, 3, 1), "end_date": datetime(2025, 6, 30, 23, 59)}
+    response = client.get(
+        "/exports/fish-sales",
+        params={"format": "ndjson", **{key: value.isoformat() for key, value in window.items()}},
+        headers={**auth_headers, "Accept-Encoding": "gzip"}
+    )
+    # httpx decodes the body transparently and would fail on a corrupt stream
+    assert response.headers["content-encoding"] == "gzip"
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == expected_rows(session, "fish-sales", tenant.id, start=window["start_date"], end=window["end_date"])
+    assert all("2025-03-01" <= record["date"] <= "2025-06-30T23:59" for record in records)
+
+
+def test_other_users_rows_are_not_exported(client, session, tenant, auth_headers):
+    from app.auth import create_access_token
+    from app.models import User
+
+    other = User(email=f"other-{tenant.email}", password_hash="unused")
+    session.add(other)
+    session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': other.email})}"}
+    response = client.get("/exports/creditor-transactions", headers=headers)
+    assert response.text.strip() == "id,date,creditor,type,amount,note"
+
+
+def test_rows_are_streamed_in_batches(session, tenant):
+    query = exports.ledger_query("expenses", tenant.id)
+    batches = exports.iter_batches(query, batch_size=2)
+    assert next(batches) == ["id", "date", "expense_type", "amount", "description"]
+    sizes = [len(rows) for rows in batches]
+    assert max(sizes) == 2
+    assert sum(sizes) == expected_rows(session, "expenses", tenant.id)
+
+    chunks = list(exports.encode_ndjson(exports.iter_batches(query, batch_size=2)))
+    assert len(chunks) == len(sizes)
+
+
+def test_gzip_stream_is_one_member():
+    chunks = [b"a,b\n", b"", b"1,2\n" * 1000]
+    assert gzip.decompress(b"".join(exports.gzipped(iter(chunks)))) == b"".join(chunks)
+
+
+def test_unknown_ledger(client, auth_headers):
+    assert client.get("/exports/passwords", headers=auth_headers).status_code == 404
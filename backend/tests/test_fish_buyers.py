@@ -0,0 +1,47 @@
+from app import balances
+from app.models import Unit
+
+
+def test_buyer_totals_including_buyers_without_sales_or_payments(client, session, user, auth_headers):
+    unit = Unit(name="kg", user_id=user.id)
+    session.add(unit)
+    session.commit()
+    ids = {
+        name: client.post("/fish-buyers", json={"name": name}, headers=auth_headers).json()["id"]
+        for name in ("Karim", "Advance only", "Nothing yet", "Cash only")
+    }
+
+    def pay(name, amount):
+        body = {"date": "2026-03-01T08:00:00", "amount": amount, "transaction_type": "payment", "buyer_id": ids[name]}
+        assert client.post(f"/fish-buyers/{ids[name]}/transactions", json=body, headers=auth_headers).status_code == 200
+
+    def sell(name, total, paid):
+        item = {"quantity": 1, "unit_id": unit.id, "rate_per_unit": total, "amount": total}
+        body = {"date": "2026-03-02T08:00:00", "buyer_id": ids[name], "payment_status": "credit",
+                "total_amount": total, "paid_amount": paid, "items": [item]}
+        assert client.post("/fish-sales", json=body, headers=auth_headers).status_code == 200
+
+    # Payments first, so none of them is settled onto an open sale
+    pay("Karim", 100)
+    pay("Advance only", 50)
+    sell("Karim", 1000, 200)
+    sell("Karim", 500, 0)
+    sell("Cash only", 300, 300)
+
+    expected = {
+        "Karim": (1500, 300, 1200),
+        "Advance only": (0, 50, -50),
+        "Nothing yet": (0, 0, 0),
+        "Cash only": (300, 300, 0),
+    }
+    listed = client.get("/fish-buyers", headers=auth_headers).json()
+    assert {b["name"]: (b["total_bought"], b["total_paid"], b["balance"]) for b in listed} == expected
+
+    # The aggregated query that recomputes them from sales and payments agrees
+    recomputed = session.exec(balances.expected_buyer_totals_query(user.id)).all()
+    assert {buyer.name: (bought, paid, balance) for buyer, bought, paid, balance in recomputed} == expected
+
+    owing = client.get("/fish-buyers", params={"min_balance": 0, "sort_by": "balance"}, headers=auth_headers).json()
+    assert [b["name"] for b in owing] == ["Karim", "Nothing yet", "Cash only"]
+    ascending = client.get("/fish-buyers", params={"sort_by": "balance", "order": "asc"}, headers=auth_headers).json()
+    assert [b["name"] for b in ascending] == ["Advance only", "Nothing yet", "Cash only", "Karim"]
@@ -0,0 +1,64 @@
+"""
+A fish sale update must not hold the event loop while it talks to the
+database: other requests on the same worker keep being served.
+"""
+import asyncio
+import threading
+
+import httpx
+
+from app.main import app
+from app.models import Pond, Unit
+from app.routers import fish_sales
+
+
+def sale_payload(pond, unit, amount):
+    return {
+        "date": "2026-05-10T10:00:00",
+        "total_amount": amount,
+        "paid_amount": amount,
+        "payment_status": "cash",
+        "items": [{"pond_id": pond.id, "quantity": 1, "unit_id": unit.id, "rate_per_unit": amount, "amount": amount}]
+    }
+
+
+def test_other_requests_are_served_while_a_sale_update_is_in_flight(client, session, user, auth_headers, monkeypatch):
+    unit = Unit(name="kg", user_id=user.id)
+    pond = Pond(name="North", location="Khulna", user_id=user.id)
+    session.add_all([unit, pond])
+    session.commit()
+    sale = client.post("/fish-sales", json=sale_payload(pond, unit, 100), headers=auth_headers).json()
+
+    # Hold the update inside its database work until the test releases it
+    entered, release = threading.Event(), threading.Event()
+    apply_sale = fish_sales.rollups.apply_sale
+
+    def blocking_apply_sale(*args, **kwargs):
+        entered.set()
+        release.wait(timeout=5)
+        return apply_sale(*args, **kwargs)
+
+    monkeypatch.setattr(fish_sales.rollups, "apply_sale", blocking_apply_sale)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            update = asyncio.create_task(
+                ac.put(f"/fish-sales/{sale['id']}", json=sale_payload(pond, unit, 250), headers=auth_headers)
+            )
+            assert await asyncio.to_thread(entered.wait, 5)
+
+            # Served while the update is still blocked in the threadpool
+            other = await asyncio.wait_for(ac.get("/labor-costs", headers=auth_headers), timeout=2)
+            assert other.status_code == 200
+            assert not update.done()
+
+            release.set()
+            return await update
+
+    updated = asyncio.run(scenario())
+    assert updated.status_code == 200, updated.text
+    body = updated.json()
+    assert body["total_amount"] == 250
+    assert body["payment_status"] == "paid"
+    assert [item["amount"] for item in body["items"]] == [250]
@@ -0,0 +1,100 @@
+from sqlmodel import select
+
+from app import rollups
+from app.models import FishSaleDaily, FishSaleItem, Pond, Unit
+
+
+def rollup_rows(session, user):
+    session.expire_all()
+    rows = session.exec(select(FishSaleDaily).where(FishSaleDaily.user_id == user.id)).all()
+    return sorted((r.day, r.pond_id, r.fish_id, r.unit_id, r.quantity, r.amount, r.sale_count, r.item_count) for r in rows)
+
+
+def test_sale_edits_only_touch_changed_items(client, session, user, auth_headers):
+    unit = Unit(name="kg", user_id=user.id)
+    ponds = [Pond(name=f"P{i}", location="x", user_id=user.id) for i in range(3)]
+    session.add_all([unit, *ponds])
+    session.commit()
+
+    def payload(items, paid):
+        return {
+            "date": "2026-05-10T10:00:00",
+            "total_amount": sum(item["amount"] for item in items),
+            "paid_amount": paid,
+            "payment_status": "credit",
+            "items": items
+        }
+
+    items = [
+        {"pond_id": pond.id, "quantity": 10, "unit_id": unit.id, "rate_per_unit": 10, "amount": 100}
+        for pond in ponds
+    ]
+    sale = client.post("/fish-sales", json=payload(items, 0), headers=auth_headers).json()
+    stored = session.exec(select(FishSaleItem).where(FishSaleItem.sale_id == sale["id"]).order_by(FishSaleItem.id)).all()
+    ids = [item.id for item in stored]
+
+    # Only the payment changes; clients that do not send ids keep the rows too
+    response = client.put(f"/fish-sales/{sale['id']}", json=payload(items, 50), headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert sorted(item["id"] for item in response.json()["items"]) == ids
+
+    # Edit one item, drop one, add one
+    edited = [
+        {"id": ids[0], **items[0]},
+        {"id": ids[1], **items[1], "quantity": 12, "amount": 120},
+        {"pond_id": ponds[2].id, "quantity": 5, "unit_id": unit.id, "rate_per_unit": 10, "amount": 50}
+    ]
+    response = client.put(f"/fish-sales/{sale['id']}", json=payload(edited, 50), headers=auth_headers)
+    assert response.status_code == 200, response.text
+    by_id = {item["id"]: item for item in response.json()["items"]}
+    assert len(by_id) == 3
+    assert by_id.pop(ids[0])["amount"] == 100
+    assert by_id.pop(ids[1])["amount"] == 120
+    # (SQLite may hand the dropped row's id to the new one, so compare contents)
+    assert [item["amount"] for item in by_id.values()] == [50]
+
+    # The incrementally maintained rollup matches a rebuild from raw items
+    incremental = rollup_rows(session, user)
+    rollups.rebuild(session, user.id)
+    assert rollup_rows(session, user) == incremental
+
+
+def test_foreign_item_ids_are_rejected(client, session, user, auth_headers):
+    unit = Unit(name="kg", user_id=user.id)
+    session.add(unit)
+    session.commit()
+    item = {"quantity": 1, "unit_id": unit.id, "rate_per_unit": 10, "amount": 10}
+    body = {"date": "2026-05-10T10:00:00", "total_amount": 10, "payment_status": "cash", "items": [item]}
+    first = client.post("/fish-sales", json=body, headers=auth_headers).json()
+    second = client.post("/fish-sales", json=body, headers=auth_headers).json()
+    other_item_id = session.exec(select(FishSaleItem.id).where(FishSaleItem.sale_id == second["id"])).one()
+
+    response = client.put(
+        f"/fish-sales/{first['id']}",
+        json={**body, "items": [{"id": other_item_id, **item}]},
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+def test_unchanged_updates_leave_the_rollup_alone(monkeypatch, client, session, user, auth_headers):
+    unit = Unit(name="kg", user_id=user.id)
+    session.add(unit)
+    session.commit()
+    item = {"quantity": 1, "unit_id": unit.id, "rate_per_unit": 10, "amount": 10}
+    # Browsers send UTC dates with a Z suffix; the stored date is naive UTC
+    body = {"date": "2026-05-10T10:00:00.000Z", "total_amount": 10, "payment_status": "cash", "items": [item]}
+    sale = client.post("/fish-sales", json=body, headers=auth_headers).json()
+
+    calls = []
+    monkeypatch.setattr(rollups, "apply_sale", lambda *args, **kwargs: calls.append(args))
+    item_id = session.exec(select(FishSaleItem.id).where(FishSaleItem.sale_id == sale["id"])).one()
+    response = client.put(f"/fish-sales/{sale['id']}", json={**body, "items": [{"id": item_id, **item}]},
+                          headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert calls == []
+
+    response = client.put(f"/fish-sales/{sale['id']}", json={**body, "date": "2026-05-11T10:00:00Z"},
+                          headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert len(calls) == 2
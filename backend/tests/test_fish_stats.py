@@ -0,0 +1,81 @@
+import pytest
+
+from app.models import Fish, FishCategory, Unit
+
+
+@pytest.fixture
+def catalogue(client, session, user, auth_headers):
+    category = FishCategory(name="Carp", user_id=user.id)
+    kg, pcs = Unit(name="kg", user_id=user.id), Unit(name="pcs", user_id=user.id)
+    session.add_all([category, kg, pcs])
+    session.commit()
+    rui, katla, mrigel = (Fish(name=name, category_id=category.id, user_id=user.id)
+                          for name in ("Rui", "Katla", "Mrigel"))
+    session.add_all([rui, katla, mrigel])
+    session.commit()
+
+    def sell(date, *items):
+        items = [{"fish_id": fish.id, "unit_id": unit.id, "quantity": quantity, "rate_per_unit": 10,
+                  "amount": quantity * 10} for fish, unit, quantity in items]
+        body = {"date": date, "total_amount": sum(item["amount"] for item in items), "payment_status": "cash",
+                "items": items}
+        assert client.post("/fish-sales", json=body, headers=auth_headers).status_code == 200
+
+    sell("2026-04-01T08:00:00", (rui, kg, 10), (katla, kg, 5))
+    sell("2026-04-02T08:00:00", (rui, pcs, 3), (rui, kg, 2))   # Two Rui items in one sale
+    sell("2026-05-01T08:00:00", (katla, kg, 1))
+    # Mrigel is never sold
+    return category, rui, katla, mrigel
+
+
+def test_fish_stats(client, auth_headers, catalogue):
+    category, rui, katla, mrigel = catalogue
+
+    body = client.get(f"/fishes/{rui.id}/stats", headers=auth_headers).json()
+    assert (body["total_sales"], body["total_quantity_sold"], body["sales_count"]) == (150, 15, 2)
+    assert body["sales_by_date"] == {
+        "2026-04-01": {"amount": 100, "quantity": 10},
+        "2026-04-02": {"amount": 50, "quantity": 5},
+    }
+
+    windowed = client.get(f"/fishes/{rui.id}/stats", params={"start_date": "2026-04-02T00:00:00Z"},
+                          headers=auth_headers).json()
+    assert (windowed["total_sales"], windowed["sales_count"]) == (50, 1)
+    assert list(windowed["sales_by_date"]) == ["2026-04-02"]
+
+    unsold = client.get(f"/fishes/{mrigel.id}/stats", headers=auth_headers).json()
+    assert (unsold["total_sales"], unsold["total_quantity_sold"], unsold["sales_count"]) == (0, 0, 0)
+    assert unsold["sales_by_date"] == {}
+
+
+def test_category_stats(client, auth_headers, catalogue):
+    category, rui, katla, mrigel = catalogue
+
+    body = client.get(f"/fish-categories/{category.id}/stats", headers=auth_headers).json()
+    assert (body["total_sales"], body["total_quantity_sold"], body["sales_count"]) == (210, 21, 3)
+    assert body["fish_count"] == 3
+    # Per-fish counts are sale items; the unsold fish has no entry
+    assert body["sales_by_fish"] == {
+        "Rui": {"amount": 150, "quantity": 15, "sales_count": 3},
+        "Katla": {"amount": 60, "quantity": 6, "sales_count": 2},
+    }
+    assert body["sales_by_date"] == {
+        "2026-04-01": {"amount": 150, "quantity": 15},
+        "2026-04-02": {"amount": 50, "quantity": 5},
+        "2026-05-01": {"amount": 10, "quantity": 1},
+    }
+
+    windowed = client.get(f"/fish-categories/{category.id}/stats", params={"end_date": "2026-04-30T23:59:59Z"},
+                          headers=auth_headers).json()
+    assert (windowed["total_sales"], windowed["sales_count"]) == (200, 2)
+    assert windowed["sales_by_fish"]["Katla"] == {"amount": 50, "quantity": 5, "sales_count": 1}
+
+
+def test_stats_of_an_empty_category(client, session, user, auth_headers):
+    category = FishCategory(name="Catfish", user_id=user.id)
+    session.add(category)
+    session.commit()
+
+    body = client.get(f"/fish-categories/{category.id}/stats", headers=auth_headers).json()
+    assert (body["total_sales"], body["sales_count"], body["fish_count"]) == (0, 0, 0)
+    assert (body["sales_by_date"], body["sales_by_fish"]) == ({}, {})
@@ -0,0 +1,109 @@
+import random
+from datetime import datetime
+
+import pytest
+from sqlmodel import select, func
+
+from app import balances, exports, imports, rollups
+from app.models import FishBuyer, FishSale, FishSaleDaily, Pond, Unit
+from benchmarks.dataset import generate_user
+
+
+@pytest.fixture
+def tenant(session, user):
+    units = {}
+    for name in ("kg", "pcs"):
+        unit = Unit(name=name, user_id=user.id)
+        session.add(unit)
+        session.commit()
+        units[name] = unit.id
+    generate_user(session, random.Random("imports"), user.id, units,
+                  datetime(2025, 1, 1), datetime(2026, 1, 1), scale=0.01)
+    session.commit()
+    rollups.rebuild(session, user.id)
+    balances.reconcile(session, repair=True, user_id=user.id)
+    return user
+
+
+def upload(client, ledger, content, headers, **params):
+    return client.post(f"/imports/{ledger}", params=params, headers=headers,
+                       files={"file": (f"{ledger}.csv", content.encode(), "text/csv")})
+
+
+def row_count(session, ledger, user_id):
+    query = exports.ledger_query(ledger, user_id)
+    return session.exec(select(func.count()).select_from(query.subquery())).one()
+
+
+@pytest.mark.parametrize("ledger", imports.LEDGER_NAMES)
+def test_exports_import_back(ledger, client, session, tenant, auth_headers):
+    before = row_count(session, ledger, tenant.id)
+    exported = client.get(f"/exports/{ledger}", headers=auth_headers).text
+
+    response = upload(client, ledger, exported, auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["failed"] == 0, response.json()["errors"][:3]
+
+    # Every row is there twice, and balances and the rollup moved with them
+    assert row_count(session, ledger, tenant.id) == 2 * before
+    session.expire_all()
+    assert balances.reconcile(session, user_id=tenant.id) == []
+    rollup_total = session.exec(select(func.sum(FishSaleDaily.amount)).where(FishSaleDaily.user_id == tenant.id)).one()
+    sales_total = sum(stats["total_sales"] for stats in client.get("/ponds/stats", headers=auth_headers).json())
+    assert round(rollup_total, 2) == round(sales_total, 2)
+
+
+def test_invalid_rows_are_reported_and_skipped(client, session, user, auth_headers):
+    session.add_all([Pond(name="North", location="x", user_id=user.id), Unit(name="kg", user_id=user.id),
+                     FishBuyer(name="Karim", user_id=user.id)])
+    session.commit()
+    content = (
+        "sale_id,date,buyer,paid_amount,pond,fish,quantity,unit,rate_per_unit,total_amount\n"
+        "1,2025-02-01,karim,,North,,10,KG,200,\n"
+        "1,2025-02-01,karim,,north,,5,kg,100,\n"
+        "2,31/12/2025,Walk-in,1000,Nowhere,,5,kg,100,\n"
+        "3,yesterday,Karim,,North,,-5,kg,100,\n"
+        "4,2025-03-01,Rahim,500,North,,,kg,,\n"
+        "5,2025-03-02,Rahim,500,,,,,,800\n"
+    )
+    result = upload(client, "fish-sales", content, auth_headers).json()
+
+    assert (result["rows"], result["imported"], result["failed"]) == (6, 2, 3)
+    assert [(error["row"], error["errors"]) for error in result["errors"]] == [
+        (4, ["Unknown pond 'Nowhere'"]),
+        (5, ["quantity must not be negative", "date 'yesterday' is not a date (YYYY-MM-DD or DD/MM/YYYY)"]),
+        (6, ["quantity is required", "rate_per_unit is required"]),
+    ]
+    detailed, simple = session.exec(select(FishSale).where(FishSale.user_id == user.id).order_by(FishSale.date)).all()
+    assert len(detailed.items) == 2
+    assert (detailed.total_amount, detailed.payment_status, detailed.due_amount) == (2500, "due", 2500)
+    # Unknown buyers are kept by name, as the sale form allows
+    assert (simple.buyer_id, simple.buyer_name, simple.sale_type, simple.payment_status) == (None, "Rahim", "simple", "partial")
+    buyer = session.exec(select(FishBuyer).where(FishBuyer.user_id == user.id)).one()
+    session.refresh(buyer)
+    assert buyer.balance == 2500
+
+
+def test_file_level_errors(client, auth_headers):
+    response = upload(client, "expenses", "when,how much\n2025-01-01,5\n", auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Missing column(s): date, amount"
+    assert upload(client, "passwords", "date\n", auth_headers).status_code == 404
+
+
+def test_dry_run_writes_nothing(client, session, user, auth_headers):
+    response = upload(client, "expenses", "date,amount\n2025-01-01,5\n2025-01-02,x\n", auth_headers, dry_run="true")
+    assert (response.json()["imported"], response.json()["failed"]) == (1, 1)
+    assert row_count(session, "expenses", user.id) == 0
+
+
+def test_imports_invalidate_cached_responses(shared_cache, client, session, user, auth_headers):
+    session.add(Pond(name="North", location="x", user_id=user.id))
+    session.commit()
+    first = client.get("/ponds/stats", headers=auth_headers)
+
+    upload(client, "labor-costs", "date,pond,amount,worker_count\n2025-01-01,North,300,2\n", auth_headers)
+
+    again = client.get("/ponds/stats", headers={**auth_headers, "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 200
+    assert again.json()[0]["total_labor"] == 300
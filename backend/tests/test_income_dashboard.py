@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from app.models import Income, Organization, Person
+
+
+def add_incomes(session, user, incomes=(
+    (datetime(2025, 11, 5), 100.0, "SALARY"),
+    (datetime(2025, 12, 20), 50.0, "BONUS"),
+    (datetime(2026, 2, 1), 30.0, "SALARY"),
+    (datetime(2026, 2, 14), 20.0, "SALARY"),
+)):
+    person = Person(name="Rahim", user_id=user.id)
+    organization = Organization(name="Acme", user_id=user.id)
+    session.add_all([person, organization])
+    session.commit()
+    for date, amount, income_type in incomes:
+        session.add(Income(amount=amount, date=date, income_type=income_type, person_id=person.id,
+                           organization_id=organization.id, user_id=user.id))
+    session.commit()
+
+
+def test_trend_spans_first_to_last_income(client, session, user, auth_headers):
+    add_incomes(session, user)
+
+    body = client.get("/income-dashboard/stats", headers=auth_headers).json()
+
+    assert body["trends"] == [
+        {"month": "Nov 2025", "amount": 100.0},
+        {"month": "Dec 2025", "amount": 50.0},
+        {"month": "Jan 2026", "amount": 0.0},
+        {"month": "Feb 2026", "amount": 50.0},
+    ]
+    assert body["summary"]["total_income"] == 200.0
+    assert body["charts"]["by_organization"] == [{"name": "Acme", "value": 200.0}]
+
+
+def test_window_covers_whole_months(client, session, user, auth_headers):
+    add_incomes(session, user)
+
+    body = client.get(
+        "/income-dashboard/stats",
+        params={"start_date": "2025-12-01T00:00:00", "end_date": "2026-03-31T23:59:59"},
+        headers=auth_headers
+    ).json()
+
+    assert body["trends"] == [
+        {"month": "Dec 2025", "amount": 50.0},
+        {"month": "Jan 2026", "amount": 0.0},
+        {"month": "Feb 2026", "amount": 50.0},
+        {"month": "Mar 2026", "amount": 0.0},
+    ]
+    assert body["summary"]["total_income"] == 100.0
+    assert sorted((t["name"], t["value"]) for t in body["charts"]["by_type"]) == [("BONUS", 50.0), ("SALARY", 50.0)]
+
+
+def test_window_bounds_with_an_offset_are_converted_to_utc(client, session, user, auth_headers):
+    # Stored as naive UTC; Asia/Dhaka (UTC+6) is already in February from Jan 31 18:00 UTC
+    add_incomes(session, user, (
+        (datetime(2026, 1, 31, 17), 5.0, "BONUS"),      # Local Jan 31 23:00
+        (datetime(2026, 1, 31, 20), 40.0, "SALARY"),    # Local Feb 1 02:00
+        (datetime(2026, 2, 28, 19), 7.0, "BONUS"),      # Local Mar 1 01:00
+    ))
+
+    body = client.get(
+        "/income-dashboard/stats",
+        params={"start_date": "2026-02-01T00:00:00+06:00", "end_date": "2026-02-28T23:59:59+06:00"},
+        headers=auth_headers
+    ).json()
+
+    assert body["summary"]["total_income"] == 40.0
+    assert body["charts"]["by_type"] == [{"name": "SALARY", "value": 40.0}]
+    # Trend buckets are UTC months, whole months as for any window
+    assert body["trends"] == [
+        {"month": "Jan 2026", "amount": 45.0},
+        {"month": "Feb 2026", "amount": 7.0},
+    ]
+
+
+def test_no_incomes(client, auth_headers):
+    body = client.get("/income-dashboard/stats", headers=auth_headers).json()
+
+    assert body["trends"] == []
+    assert body["summary"]["total_income"] == 0.0
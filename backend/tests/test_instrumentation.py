@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+
+from app import database, instrumentation
+from app.models import Pond
+from app.routers import metrics
+
+
+@pytest.fixture
+def scrape(monkeypatch, client):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-secret")
+    return lambda: client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+
+def test_responses_report_query_count_and_db_time(client, session, user, auth_headers):
+    pond = Pond(name="P", location="x", user_id=user.id)
+    session.add(pond)
+    session.commit()
+
+    response = client.get(f"/ponds/{pond.id}/stats", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert int(response.headers["X-Query-Count"]) > 0
+    db, app_timing = response.headers["Server-Timing"].split(", ")
+    assert db.startswith("db;dur=") and db.endswith(f'desc="{response.headers["X-Query-Count"]} queries"')
+    assert app_timing.startswith("app;dur=")
+
+    # Unauthenticated 401s issue no statements at all
+    assert client.get("/ponds").headers["X-Query-Count"] == "0"
+
+
+def test_metrics_export_per_route_histograms(client, session, user, auth_headers, scrape):
+    pond = Pond(name="P", location="x", user_id=user.id)
+    session.add(pond)
+    session.commit()
+    client.get(f"/ponds/{pond.id}/stats", headers=auth_headers)
+
+    response = scrape()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE db_request_queries histogram" in body
+    # Labelled by route template, not by the concrete URL
+    assert 'db_request_seconds_count{method="GET",route="/ponds/{pond_id}/stats"}' in body
+    assert 'db_request_queries_bucket{method="GET",route="/ponds/{pond_id}/stats",le="+Inf"}' in body
+    assert f"/ponds/{pond.id}/stats" not in body
+
+
+def test_metrics_require_a_configured_token(monkeypatch, client, auth_headers):
+    # Off unless METRICS_TOKEN is set
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    # A user's access token is not a metrics token
+    assert client.get("/metrics", headers=auth_headers).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+def test_slow_queries_are_logged_with_parameters(client, user, auth_headers, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_MS", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        client.get("/ponds", headers=auth_headers)
+    messages = [record.getMessage() for record in caplog.records if record.name == "app.sql.slow"]
+    assert any("FROM pond" in message and f"({user.id}," in message for message in messages)
+
+
+def test_metrics_export_latency_pool_threadpool_and_cache_health(client, user, auth_headers, scrape):
+    client.get("/ponds", headers=auth_headers)
+    client.get("/ponds", headers=auth_headers)
+
+    body = scrape().text
+    assert 'http_request_duration_seconds_count{method="GET",route="/ponds",status="200"}' in body
+    assert "http_requests_in_flight 1" in body  # the scrape itself
+    assert 'db_pool_checked_out{engine="sync"}' in body
+    assert 'threadpool_tokens{state="total"}' in body
+    hits = next(line for line in body.splitlines() if line.startswith('cache_hits_total{cache="auth_users"}'))
+    assert int(hits.split()[-1]) >= 1
+
+
+def test_timed_pool_records_waits_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=database.TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    waits_before = database.pool_wait_seconds._series.get(("sync",), [None, 0, 0])[2]
+    timeouts_before = dict(database.pool_timeouts.samples()).get(("sync",), 0)
+
+    with engine.connect():
+        with pytest.raises(TimeoutError):
+            engine.connect()
+    engine.dispose()
+
+    assert database.pool_wait_seconds._series[("sync",)][2] == waits_before + 2
+    assert dict(database.pool_timeouts.samples())[("sync",)] == timeouts_before + 1
@@ -0,0 +1,87 @@
+"""
+Enriched listings must not lazy-load related rows one by one: the number of
+statements per request stays the same however many rows are listed.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.database import engine
+from app.models import FishFeed, Pond, PondFeedPurchase, PondFeedUsage, Supplier, Unit
+from app.pagination import NEXT_CURSOR_HEADER
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def add_feed_rows(session, user, count):
+    unit = Unit(name="kg", user_id=user.id)
+    supplier = Supplier(name="Feed Co", user_id=user.id)
+    feed = FishFeed(name="Grower", brand="Acme", user_id=user.id)
+    session.add_all([unit, supplier, feed])
+    session.commit()
+    start = datetime(2026, 1, 1)
+    for i in range(count):
+        # A fresh pond per row so every row has different related objects
+        pond = Pond(name=f"P{i}", location="x", user_id=user.id)
+        session.add(pond)
+        session.commit()
+        session.add(PondFeedPurchase(
+            pond_id=pond.id, supplier_id=supplier.id, feed_id=feed.id, date=start + timedelta(days=i),
+            quantity=1, unit_id=unit.id, price_per_unit=2, total_amount=2, user_id=user.id
+        ))
+        session.add(PondFeedUsage(
+            pond_id=pond.id, feed_id=feed.id, date=start + timedelta(days=i),
+            quantity=1, unit_id=unit.id, price_per_unit=2, total_cost=2, user_id=user.id
+        ))
+    session.commit()
+
+
+def listing_queries(client, path, headers, **params):
+    client.get(path, headers=headers)  # warm the auth cache
+    with count_queries() as statements:
+        response = client.get(path, params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response, len(statements)
+
+
+def test_feed_listings_use_a_constant_number_of_queries(client, session, user, auth_headers):
+    add_feed_rows(session, user, 2)
+    small = {path: listing_queries(client, path, auth_headers)[1] for path in ("/pond-feeds", "/feed-usage")}
+
+    add_feed_rows(session, user, 10)
+    for path in ("/pond-feeds", "/feed-usage"):
+        response, queries = listing_queries(client, path, auth_headers)
+        assert len(response.json()) == 12
+        assert queries == small[path]
+
+    rows = client.get("/pond-feeds", headers=auth_headers).json()
+    assert {(row["feed_name"], row["feed_brand"], row["supplier_name"], row["unit_name"]) for row in rows} == {
+        ("Grower", "Acme", "Feed Co", "kg")
+    }
+    assert sorted(row["pond_name"] for row in rows) == sorted(f"P{i}" for i in (*range(2), *range(10)))
+
+
+def test_joined_listing_pages(client, session, user, auth_headers):
+    add_feed_rows(session, user, 5)
+
+    first, _ = listing_queries(client, "/feed-usage", auth_headers, limit=3)
+    assert len(first.json()) == 3
+    rest = client.get(
+        "/feed-usage", params={"limit": 3, "cursor": first.headers[NEXT_CURSOR_HEADER]}, headers=auth_headers
+    )
+    assert len(rest.json()) == 2
+    assert NEXT_CURSOR_HEADER not in rest.headers
+    assert [row["pond_name"] for row in first.json() + rest.json()] == ["P4", "P3", "P2", "P1", "P0"]
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from app.models import Expense, LaborCost
+from app.pagination import NEXT_CURSOR_HEADER
+
+
+def add_labor_costs(session, user, count, same_date=None):
+    start = datetime(2026, 1, 1)
+    for i in range(count):
+        session.add(LaborCost(
+            date=same_date or start + timedelta(days=i),
+            amount=i,
+            worker_count=1,
+            user_id=user.id
+        ))
+    session.commit()
+
+
+def walk(client, path, headers, limit):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert len(body) <= limit
+        seen.extend(body)
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return seen, pages
+
+
+def test_pages_cover_the_full_list_once_newest_first(client, session, user, auth_headers):
+    add_labor_costs(session, user, 12)
+
+    full = client.get("/labor-costs", headers=auth_headers)
+    assert NEXT_CURSOR_HEADER not in full.headers
+    assert len(full.json()) == 12
+
+    paged, pages = walk(client, "/labor-costs", auth_headers, limit=5)
+    assert pages == 3
+    assert [row["id"] for row in paged] == [row["id"] for row in full.json()]
+    dates = [row["date"] for row in paged]
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_rows_sharing_a_date_are_split_by_id(client, session, user, auth_headers):
+    add_labor_costs(session, user, 7, same_date=datetime(2026, 3, 1))
+
+    paged, _ = walk(client, "/labor-costs", auth_headers, limit=3)
+    ids = [row["id"] for row in paged]
+    assert ids == sorted(ids, reverse=True)
+    assert len(set(ids)) == 7
+
+
+def test_expenses_keep_their_default_page_size(client, session, user, auth_headers):
+    for i in range(105):
+        session.add(Expense(amount=1, date=datetime(2026, 1, 1) + timedelta(hours=i), user_id=user.id))
+    session.commit()
+
+    response = client.get("/expenses", headers=auth_headers)
+    assert len(response.json()) == 100
+    rest = client.get("/expenses", params={"cursor": response.headers[NEXT_CURSOR_HEADER]}, headers=auth_headers)
+    assert len(rest.json()) == 5
+    assert NEXT_CURSOR_HEADER not in rest.headers
+
+
+def test_invalid_cursor_is_rejected(client, auth_headers):
+    response = client.get("/labor-costs", params={"limit": 5, "cursor": "not-a-cursor"}, headers=auth_headers)
+    assert response.status_code == 400
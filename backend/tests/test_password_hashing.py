@@ -0,0 +1,34 @@
+from passlib.context import CryptContext
+
+from app import auth
+from app.models import User
+
+
+def test_login_rehashes_when_the_configured_cost_changes(client, session, monkeypatch):
+    old_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    user = User(email="cost@example.com", password_hash=old_context.hash("hunter2"))
+    session.add(user)
+    session.commit()
+
+    monkeypatch.setattr(auth, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=5))
+
+    response = client.post("/token", data={"username": user.email, "password": "hunter2"})
+    assert response.status_code == 200, response.text
+    session.refresh(user)
+    assert user.password_hash.startswith("$2b$05$")
+
+    # Already at the configured cost: verified, not rewritten
+    stored = user.password_hash
+    assert client.post("/token", data={"username": user.email, "password": "hunter2"}).status_code == 200
+    session.refresh(user)
+    assert user.password_hash == stored
+
+
+def test_wrong_password_is_rejected(client, session, monkeypatch):
+    monkeypatch.setattr(auth, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+    response = client.post("/register", json={"email": "new@example.org", "password_hash": "right"})
+    assert response.status_code == 200, response.text
+
+    assert client.post("/token", data={"username": "new@example.org", "password": "wrong"}).status_code == 401
+    assert client.post("/token", data={"username": "nobody@example.org", "password": "x"}).status_code == 401
+    assert client.post("/token", data={"username": "new@example.org", "password": "right"}).status_code == 200
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from app.models import LaborCost, Pond, PondFeedPurchase, Supplier, Unit
+
+
+def test_all_pond_stats_match_per_pond_stats(client, session, user, auth_headers):
+    kg, bag = Unit(name="kg", user_id=user.id), Unit(name="bag", user_id=user.id)
+    supplier = Supplier(name="Feed Co", user_id=user.id)
+    busy, idle = Pond(name="Busy", location="x", user_id=user.id), Pond(name="Idle", location="y", user_id=user.id)
+    session.add_all([kg, bag, supplier, busy, idle])
+    session.commit()
+
+    for date, unit, quantity, total in (
+        (datetime(2026, 1, 1), kg, 10, 50.0),
+        (datetime(2026, 1, 2), bag, 2, 30.0),
+        (datetime(2026, 2, 9), kg, 4, 20.0),
+    ):
+        session.add(PondFeedPurchase(
+            pond_id=busy.id, supplier_id=supplier.id, date=date,
+            quantity=quantity, unit_id=unit.id, price_per_unit=total / quantity, total_amount=total, user_id=user.id
+        ))
+    session.add(LaborCost(date=datetime(2026, 1, 5), amount=15.0, worker_count=1, pond_id=busy.id, user_id=user.id))
+    session.commit()
+
+    response = client.get("/ponds/stats", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    all_stats = {stats["pond"]["id"]: stats for stats in response.json()}
+    assert set(all_stats) == {busy.id, idle.id}
+    for pond in (busy, idle):
+        assert client.get(f"/ponds/{pond.id}/stats", headers=auth_headers).json() == all_stats[pond.id]
+
+    stats = all_stats[busy.id]
+    assert stats["total_feed_expense"] == 100.0
+    assert stats["feed_quantity_by_unit"] == {"kg": 14.0, "bag": 2.0}
+    assert stats["feed_by_supplier"] == [
+        {"supplier_id": supplier.id, "supplier_name": "Feed Co", "total_amount": 100.0, "total_quantity": 16.0}
+    ]
+    assert stats["profit_loss"] == -115.0
+    assert all_stats[idle.id]["total_expenses"] == 0
+
+    january = client.get(
+        "/ponds/stats",
+        params={"start_date": "2026-01-01T00:00:00", "end_date": "2026-01-31T23:59:59"},
+        headers=auth_headers
+    ).json()
+    january = {stats["pond"]["id"]: stats for stats in january}
+    assert january[busy.id]["total_feed_expense"] == 80.0
+    assert january[busy.id]["feed_purchases_count"] == 2
+
+
+def test_local_windows_cover_the_same_days_for_every_source(client, session, user, auth_headers):
+    kg = Unit(name="kg", user_id=user.id)
+    supplier = Supplier(name="Feed Co", user_id=user.id)
+    pond = Pond(name="North", location="x", user_id=user.id)
+    session.add_all([kg, supplier, pond])
+    session.commit()
+
+    # Stored as naive UTC: 20:00 UTC is already the next day in Asia/Dhaka (UTC+6)
+    for date, total in ((datetime(2026, 1, 1, 20), 50.0), (datetime(2026, 1, 31, 20), 30.0)):
+        session.add(PondFeedPurchase(pond_id=pond.id, supplier_id=supplier.id, date=date, quantity=1,
+                                     unit_id=kg.id, price_per_unit=total, total_amount=total, user_id=user.id))
+        session.add(LaborCost(date=date, amount=total / 10, worker_count=1, pond_id=pond.id, user_id=user.id))
+    session.commit()
+    for date in ("2026-01-01T20:00:00Z", "2026-01-31T20:00:00Z"):
+        item = {"pond_id": pond.id, "unit_id": kg.id, "quantity": 1, "rate_per_unit": 100, "amount": 100}
+        body = {"date": date, "total_amount": 100, "payment_status": "cash", "items": [item]}
+        assert client.post("/fish-sales", json=body, headers=auth_headers).status_code == 200
+
+    # Local January 2-31
+    stats = client.get(
+        f"/ponds/{pond.id}/stats",
+        params={"start_date": "2026-01-02T00:00:00+06:00", "end_date": "2026-01-31T23:59:59+06:00"},
+        headers=auth_headers
+    ).json()
+    assert (stats["total_sales"], stats["sales_count"]) == (100, 1)
+    assert (stats["total_feed_expense"], stats["feed_purchases_count"]) == (50.0, 1)
+    assert (stats["total_labor"], stats["labor_entries_count"]) == (5.0, 1)
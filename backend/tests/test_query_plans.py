@@ -0,0 +1,57 @@
+"""
+EXPLAIN checks: the dashboard's hot queries must be answered from the
+(user_id, date) and foreign key indexes rather than full table scans.
+"""
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlmodel import select
+
+from app.aggregates import last_months, next_month
+from app.models.fish_farming import FishSale, FishSaleItem, PondFeedPurchase, Pond
+from app.routers.dashboard import _window_totals_query, _monthly_totals_query
+from app import rollups
+from app.timezone_config import TIMEZONE
+
+USER_ID = 1
+END = datetime(2026, 6, 30, 23, 59, 59)
+START = datetime(2026, 1, 1)
+
+
+def query_plan(session, statement) -> str:
+    sql = statement.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    rows = session.exec(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_window_totals_use_user_date_index(session):
+    for model, amount in ((FishSale, FishSale.total_amount), (PondFeedPurchase, PondFeedPurchase.total_amount)):
+        plan = query_plan(session, _window_totals_query(
+            amount, model.date, model.user_id == USER_ID, START, END, datetime(2026, 6, 1)
+        ))
+        assert f"ix_{model.__tablename__}_user_id_date" in plan, plan
+
+
+def test_monthly_trend_is_an_index_range_scan(session):
+    months = last_months(END, 6)
+    plan = query_plan(session, _monthly_totals_query(
+        FishSale.total_amount, FishSale.date, FishSale.user_id == USER_ID, months[0], next_month(months[-1])
+    ))
+    assert "ix_fishsale_user_id_date (user_id=? AND date>? AND date<?)" in plan, plan
+
+
+def test_raw_sales_facts_join_items_by_sale_id(session):
+    # A window ending mid-day cannot use the daily rollup
+    facts = rollups.sales_facts(USER_ID, START, datetime(2026, 6, 30, 12, 0))
+    plan = query_plan(session, select(Pond.name, facts.c.amount).join(facts, facts.c.pond_id == Pond.id))
+    assert "ix_fishsale_user_id_date" in plan, plan
+    assert "ix_fishsaleitem_sale_id" in plan, plan
+
+
+def test_rollup_sales_facts_use_user_day_index(session):
+    # Whole local days are served from the rollup
+    facts = rollups.sales_facts(
+        USER_ID, TIMEZONE.localize(datetime(2026, 1, 1)), TIMEZONE.localize(datetime(2026, 6, 30, 23, 59, 59))
+    )
+    plan = query_plan(session, select(Pond.name, facts.c.amount).join(facts, facts.c.pond_id == Pond.id))
+    assert "ux_fishsaledaily_bucket (user_id=? AND day>? AND day<?)" in plan, plan
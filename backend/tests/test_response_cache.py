@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pytest
+
+from app import response_cache
+from app.models import Pond
+
+
+@pytest.fixture(params=["memory", "shared"])
+def cache_backend(request, monkeypatch):
+    if request.param == "shared":
+        return request.getfixturevalue("shared_cache")
+    backend = response_cache.MemoryBackend(maxsize=64, ttl=60)
+    monkeypatch.setattr(response_cache, "backend", backend)
+    return backend
+
+
+def pond_with_stats(session, user):
+    pond = Pond(name="P", location="x", user_id=user.id)
+    session.add(pond)
+    session.commit()
+    return pond, f"/ponds/{pond.id}/stats"
+
+
+def test_repeat_visits_are_served_from_cache(cache_backend, client, session, user, auth_headers):
+    pond, path = pond_with_stats(session, user)
+
+    first = client.get(path, headers=auth_headers)
+    second = client.get(path, headers=auth_headers)
+    assert second.json() == first.json()
+    assert int(first.headers["X-Query-Count"]) > 0
+    assert second.headers["X-Query-Count"] == "0"
+
+    # Different parameters are different entries
+    windowed = client.get(path, params={"start_date": "2026-01-01T00:00:00"}, headers=auth_headers)
+    assert int(windowed.headers["X-Query-Count"]) > 0
+
+
+def test_writes_through_the_api_invalidate_exactly(cache_backend, client, session, user, auth_headers):
+    pond, path = pond_with_stats(session, user)
+    assert client.get(path, headers=auth_headers).json()["total_labor"] == 0
+
+    response = client.post("/labor-costs", json={
+        "date": datetime(2026, 3, 1).isoformat(), "amount": 250, "worker_count": 2, "pond_id": pond.id
+    }, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    assert client.get(path, headers=auth_headers).json()["total_labor"] == 250
+
+    # A read-only request does not invalidate anything
+    client.get("/ponds", headers=auth_headers)
+    assert client.get(path, headers=auth_headers).headers["X-Query-Count"] == "0"
+
+
+def test_other_users_keep_their_entries(cache_backend, client, session, user, auth_headers):
+    from app.auth import create_access_token
+    from app.models import User
+
+    other = User(email=f"other-{user.email}", password_hash="unused")
+    session.add(other)
+    session.commit()
+    other_headers = {"Authorization": f"Bearer {create_access_token({'sub': other.email})}"}
+    client.get("/ponds/stats", headers=other_headers)
+
+    # A write by `user` leaves `other`'s cached stats alone
+    client.post("/ponds", json={"name": "New", "location": "y"}, headers=auth_headers)
+    assert client.get("/ponds/stats", headers=other_headers).headers["X-Query-Count"] == "0"
+    assert [stats["pond"]["name"] for stats in client.get("/ponds/stats", headers=auth_headers).json()] == ["New"]
+
+
+def test_writes_without_a_user_invalidate_everyone(cache_backend, client, session, user, auth_headers):
+    pond, path = pond_with_stats(session, user)
+    client.get(path, headers=auth_headers)
+
+    # e.g. a maintenance script: no request user on the session
+    pond.name = "Renamed"
+    session.add(pond)
+    session.commit()
+
+    assert client.get(path, headers=auth_headers).json()["pond"]["name"] == "Renamed"
+
+
+def test_per_worker_caching_is_the_single_worker_default(monkeypatch):
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_URL", None)
+    assert isinstance(response_cache._default_backend(), response_cache.MemoryBackend)
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_URL", "memory://")
+    assert isinstance(response_cache._default_backend(), response_cache.MemoryBackend)
+
+    # Several workers need a shared store
+    monkeypatch.setattr(response_cache, "WEB_CONCURRENCY", 4)
+    with pytest.raises(RuntimeError, match="shared store"):
+        response_cache._default_backend()
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_URL", None)
+    assert response_cache._default_backend() is None
+
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_TTL", 0)
+    assert response_cache._default_backend() is None
@@ -0,0 +1,143 @@
+import random
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app import rollups
+from app.database import engine
+from app.models import Fish, FishSaleDaily, Pond, Unit
+from benchmarks.dataset import generate_user
+
+
+def rollup_rows(session, user):
+    session.expire_all()
+    rows = session.exec(select(FishSaleDaily).where(FishSaleDaily.user_id == user.id)).all()
+    return sorted((r.day, r.pond_id or 0, r.fish_id or 0, r.unit_id, round(r.quantity, 6), round(r.amount, 6),
+                   r.sale_count, r.item_count) for r in rows)
+
+
+def assert_matches_rebuild(session, user):
+    incremental = rollup_rows(session, user)
+    rollups.rebuild(session, user.id)
+    assert rollup_rows(session, user) == incremental
+    return incremental
+
+
+@pytest.fixture
+def foreign_keys():
+    """Enforce foreign keys on SQLite, as Postgres always does"""
+    def enable(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    event.listen(engine, "connect", enable)
+    engine.dispose()
+    yield
+    event.remove(engine, "connect", enable)
+    engine.dispose()
+
+
+def sale(date, *items, fish_id=None):
+    items = [{"quantity": quantity, "unit_id": unit_id, "rate_per_unit": 10, "amount": quantity * 10,
+              "pond_id": pond_id, "fish_id": fish_id} for pond_id, unit_id, quantity in items]
+    return {"date": date, "total_amount": sum(item["amount"] for item in items),
+            "payment_status": "cash", "items": items}
+
+
+def test_sale_writes_keep_the_rollup_equal_to_a_rebuild(client, session, user, auth_headers):
+    unit = Unit(name="kg", user_id=user.id)
+    pond = Pond(name="North", location="x", user_id=user.id)
+    session.add_all([unit, pond])
+    session.commit()
+
+    # Two sales in the same buckets, one of them without a pond
+    first = client.post("/fish-sales", json=sale("2026-05-10T04:00:00", (pond.id, unit.id, 3), (None, unit.id, 1)),
+                        headers=auth_headers).json()
+    second = client.post("/fish-sales", json=sale("2026-05-10T09:00:00", (pond.id, unit.id, 2), (None, unit.id, 4)),
+                         headers=auth_headers).json()
+    rows = assert_matches_rebuild(session, user)
+    assert [(row[1], row[4], row[6]) for row in rows] == [(0, 5, 2), (pond.id, 5, 2)]
+
+    # Move one sale to another day and change its items
+    response = client.put(f"/fish-sales/{second['id']}", json=sale("2026-05-11T09:00:00", (pond.id, unit.id, 7)),
+                          headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert len(assert_matches_rebuild(session, user)) == 3
+
+    # Deleting the last sale of a bucket removes the bucket
+    assert client.delete(f"/fish-sales/{first['id']}", headers=auth_headers).status_code == 200
+    rows = assert_matches_rebuild(session, user)
+    assert [(row[1], row[4], row[6]) for row in rows] == [(pond.id, 7, 1)]
+
+
+def test_deleting_a_fish_keeps_its_sales_in_the_rollup(foreign_keys, client, session, user, auth_headers):
+    unit = Unit(name="kg", user_id=user.id)
+    pond = Pond(name="North", location="x", user_id=user.id)
+    fish = Fish(name="Rui", user_id=user.id)
+    session.add_all([unit, pond, fish])
+    session.commit()
+    # The same sale holds items with and without the fish in one bucket
+    client.post("/fish-sales", json=sale("2026-05-10T04:00:00", (pond.id, unit.id, 3), fish_id=fish.id),
+                headers=auth_headers)
+    mixed = sale("2026-05-10T05:00:00", (pond.id, unit.id, 2), fish_id=fish.id)
+    mixed["items"].append({**mixed["items"][0], "fish_id": None})
+    mixed["total_amount"] *= 2
+    assert client.post("/fish-sales", json=mixed, headers=auth_headers).status_code == 200
+
+    window = {"start_date": "2026-05-01T00:00:00+06:00", "end_date": "2026-05-31T23:59:59+06:00"}
+    assert rollups.day_window(*(datetime.fromisoformat(v) for v in window.values())) is not None
+    before = client.get("/ponds/stats", params=window, headers=auth_headers).json()
+
+    response = client.delete(f"/fishes/{fish.id}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert client.get("/ponds/stats", params=window, headers=auth_headers).json() == before
+    rows = assert_matches_rebuild(session, user)
+    assert [(row[2], row[4], row[6], row[7]) for row in rows] == [(0, 7, 2, 3)]
+
+
+def test_a_bucket_is_a_single_row(session, user):
+    unit = Unit(name="kg", user_id=user.id)
+    session.add(unit)
+    session.commit()
+    bucket = dict(user_id=user.id, day=datetime(2026, 5, 10).date(), pond_id=None, fish_id=None, unit_id=unit.id)
+    session.add(FishSaleDaily(**bucket, quantity=1, amount=10, sale_count=1, item_count=1))
+    session.commit()
+
+    session.add(FishSaleDaily(**bucket, quantity=1, amount=10, sale_count=1, item_count=1))
+    with pytest.raises(IntegrityError):
+        session.commit()
+
+
+def test_whole_day_windows_match_the_raw_items(monkeypatch, session, user):
+    units = {}
+    for name in ("kg", "pcs"):
+        unit = Unit(name=name, user_id=user.id)
+        session.add(unit)
+        session.commit()
+        units[name] = unit.id
+    generate_user(session, random.Random("rollups"), user.id, units,
+                  datetime(2025, 1, 1), datetime(2026, 1, 1), scale=0.02)
+    session.commit()
+    rollups.rebuild(session, user.id)
+
+    def facts(start, end):
+        rows = session.execute(select(rollups.sales_facts(user.id, start, end))).all()
+        totals = {}
+        for pond_id, fish_id, unit_id, quantity, amount, sale_count, item_count in rows:
+            total = totals.setdefault((pond_id, fish_id, unit_id), [0.0, 0.0, 0, 0])
+            for i, value in enumerate((quantity, amount, sale_count, item_count)):
+                total[i] += value
+        return {key: [round(value, 6) for value in total] for key, total in totals.items()}
+
+    # Local (Asia/Dhaka, UTC+6) days 2025-03-01 to 2025-05-31 as naive UTC bounds
+    windows = [(None, None), (datetime(2025, 2, 28, 18), datetime(2025, 5, 31, 17, 59, 59)),
+               (datetime(2025, 6, 30, 18), None)]
+    from_rollup = [facts(start, end) for start, end in windows]
+    assert all(rollups.day_window(start, end) is not None for start, end in windows)
+
+    monkeypatch.setattr(rollups, "day_window", lambda start, end: None)
+    from_items = [facts(start, end) for start, end in windows]
+    assert from_rollup == from_items
+    assert all(from_rollup)
@@ -25,6 +25,7 @@ interface Unit {
 }
 
 interface SaleItem {
+    id?: number;  // Existing item; kept so edits update it in place
     pond_id: number;
     fish_id?: number | null;
     quantity: number;
@@ -45,6 +46,7 @@ interface FishSale {
     total_amount: number;
     total_weight?: number;
     items: Array<{
+        id: number;
         pond_id: number;
         fish_id?: number | null;
         quantity: number;
@@ -431,6 +433,7 @@ export default function SalesPage() {
             setEntryMode('detailed');
             if (sale.items && sale.items.length > 0) {
                 setSaleItems(sale.items.map(item => ({
+                    id: item.id,
                     pond_id: item.pond_id,
                     fish_id: item.fish_id || null,
                     quantity: item.quantity,